@@ -0,0 +1,280 @@
+# ==============================================================
+#  FILE: run.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Headless benchmark suite. Generates a synthetic dataset in a
+#     scratch data/ directory and times the real code paths: JSON
+#     load/save, saving shifts, the logs filter, the dashboard
+#     aggregation, CSV/PDF export and app startup. Results are
+#     written as JSON so runs of different versions can be compared:
+#
+#         python -m benchmarks --shifts 50000 --backend sqlite
+#         python -m benchmarks --compare exports/benchmarks/old.json
+# ==============================================================
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from benchmarks.synthetic import generate
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a child process from the scratch directory: times importing the
+# window module and, when a display is available, building the window.
+_STARTUP_SCRIPT = """
+import json, time
+t = time.perf_counter()
+import main_window
+result = {"import_seconds": time.perf_counter() - t, "window_seconds": None}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+except Exception as e:
+    result["skipped"] = f"no display ({type(e).__name__})"
+else:
+    root.withdraw()
+    app = main_window.JobProductionApp(root, welcome=False)
+    result["window_seconds"] = app.startup_seconds
+    result["target_seconds"] = main_window.STARTUP_TARGET_SECONDS
+    app.refresher.shutdown()
+    root.destroy()
+print(json.dumps(result))
+"""
+
+
+# ------------------- TIMING -------------------
+def timed(fn, repeat: int = 1) -> tuple:
+    """Run fn repeat times; return (timing dict, last result)."""
+    times, result = [], None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "runs": len(times),
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+    }, result
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ------------------- SUITE -------------------
+def run_suite(args) -> dict:
+    """Run every benchmark in the current (scratch) directory."""
+    from reports.csv_export import export_csv
+    from reports.dashboard import collect_dashboard
+    from reports.downtime import collect_downtime
+    from reports.logs import collect_log_report
+    from storage import config, write_queue
+    from storage.backends import get_backend
+    from storage.json_store import load_json, save_json
+    from storage.partitions import ShiftPartitions
+    from storage.repository import JOBS_FILE, STAFF_FILE, SHIFTS_FILE, SHIFTS_DIR
+
+    config.STORAGE_BACKEND = args.backend
+    results = {}
+
+    timing, (jobs, staff, shifts) = timed(lambda: generate(args.jobs, args.staff, args.shifts, args.seed))
+    results["generate"] = dict(timing, records=len(shifts))
+
+    # --- Raw JSON documents ---
+    raw = [s.to_dict() for s in shifts]
+    timing, _ = timed(lambda: save_json("bench/shifts.json", raw), args.repeat)
+    results["save_json"] = dict(timing, records=len(raw), bytes=os.path.getsize("bench/shifts.json"))
+    timing, _ = timed(lambda: load_json("bench/shifts.json", default=[]), args.repeat)
+    results["load_json"] = dict(timing, records=len(raw))
+    del raw
+
+    # --- Dataset on disk, then the first open (migration / rebuilds) ---
+    save_json(JOBS_FILE, [j.to_dict() for j in jobs])
+    save_json(STAFF_FILE, [s.to_dict() for s in staff])
+    save_json(SHIFTS_FILE, [])
+    timing, _ = timed(lambda: ShiftPartitions(SHIFTS_DIR).extend(shifts))
+    results["write_partitions"] = dict(timing, records=len(shifts))
+
+    def open_storage():
+        backend = get_backend()
+        backend.all_progress()
+        backend.rollup_cells()
+        write_queue.flush()
+        return backend
+    timing, backend = timed(open_storage)
+    results["storage_open"] = timing
+
+    # --- Shift save path ---
+    extra = generate(args.jobs, args.staff, args.saves, args.seed + 1,
+                     start=date.fromisoformat(shifts[-1].shift_date))[2] if shifts else []
+
+    def save_shifts():
+        for shift in extra:
+            backend.add_shift(shift)
+    timing, _ = timed(save_shifts)
+    results["add_shift"] = dict(timing, records=len(extra),
+                                per_shift_ms=round(timing["min_s"] / max(1, len(extra)) * 1000, 3))
+    timing, _ = timed(write_queue.flush)
+    results["add_shift_flush"] = timing
+
+    # --- Logs filter ---
+    sample = shifts[len(shifts) // 2] if shifts else None
+    job = sample.job_number if sample else ""
+    staff_name = sample.staff_name if sample else ""
+    month = sample.shift_date[:7] if sample else ""
+    for name, filters in (
+        ("logs_job_month", (job, "", month)),
+        ("logs_staff", ("", staff_name, "")),
+        ("logs_all", ("", "", "")),
+    ):
+        timing, report = timed(lambda: collect_log_report(*filters), args.repeat)
+        results[name] = dict(timing, records=len(report["rows"]))
+
+    # --- Dashboard (first call builds the columnar view) ---
+    timing, _ = timed(collect_dashboard)
+    results["dashboard_cold"] = timing
+    timing, _ = timed(collect_dashboard, args.repeat)
+    results["dashboard_warm"] = timing
+    timing, report = timed(collect_downtime, args.repeat)
+    results["downtime_pareto"] = dict(timing, records=len(report["pareto"]))
+
+    # --- Exports ---
+    targets = backend.job_targets()
+    timing, count = timed(lambda: export_csv("bench/logs.csv", backend.iter_shifts(with_hours=False), targets))
+    results["csv_export"] = dict(timing, records=count)
+    timing, count = timed(lambda: export_csv(
+        "bench/logs_detailed.csv.gz", backend.iter_shifts(with_hours=True), targets, detailed=True
+    ))
+    results["csv_export_detailed_gzip"] = dict(timing, records=count)
+
+    try:
+        from reports.pdf_report import write_log_report
+    except ImportError as e:
+        results["pdf_export"] = {"skipped": str(e)}
+    else:
+        timing, count = timed(lambda: write_log_report("bench/logs.pdf", job, "", month[:4]))
+        results["pdf_export"] = dict(timing, records=count)
+
+    write_queue.flush()
+    return results
+
+
+def run_startup() -> dict:
+    """Time app startup in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get("PYTHONPATH")))))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], env=env,
+                         capture_output=True, text=True, timeout=120)
+    elapsed = time.perf_counter() - start
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else out.returncode}
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_seconds"] = round(elapsed, 6)
+    for key in ("import_seconds", "window_seconds"):
+        if result.get(key) is not None:
+            result[key] = round(result[key], 6)
+    return result
+
+
+# ------------------- COMPARE -------------------
+def compare(old: dict, new: dict) -> list:
+    """Rows of (benchmark, old median, new median, ratio) for benchmarks in both runs."""
+    rows = []
+    for name, result in new["results"].items():
+        before = old.get("results", {}).get(name, {})
+        if "median_s" in result and before.get("median_s"):
+            rows.append((name, before["median_s"], result["median_s"],
+                         round(result["median_s"] / before["median_s"], 2)))
+    return rows
+
+
+# ------------------- COMMAND LINE -------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the tracker's hot paths on a synthetic dataset.",
+    )
+    parser.add_argument("--jobs", type=int, default=100, help="number of jobs (default: 100)")
+    parser.add_argument("--staff", type=int, default=30, help="number of staff (default: 30)")
+    parser.add_argument("--shifts", type=int, default=10000, help="number of shifts (default: 10000)")
+    parser.add_argument("--saves", type=int, default=200,
+                        help="shifts saved one by one through the backend (default: 200)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per read benchmark; the min and median are kept (default: 3)")
+    parser.add_argument("--out", help="results file (default: exports/benchmarks/<backend>_<time>.json)")
+    parser.add_argument("--compare", metavar="RESULTS", help="earlier results file to compare against")
+    parser.add_argument("--no-startup", action="store_true", help="skip the app startup benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch data directory")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    out = os.path.abspath(args.out or os.path.join("exports", "benchmarks", f"{args.backend}_{stamp}.json"))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    # Storage paths are relative to the working directory, so the whole
+    # suite runs inside a scratch directory with its own data/.
+    cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="jpt-bench-")
+    os.makedirs(os.path.join(scratch, "data"))
+    os.makedirs(os.path.join(scratch, "bench"))
+    os.chdir(scratch)
+    try:
+        results = run_suite(args)
+        if not args.no_startup:
+            results["startup"] = run_startup()
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Scratch data kept in {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    document = {
+        "generated": datetime.now().astimezone().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "dataset": {"jobs": args.jobs, "staff": args.staff, "shifts": args.shifts,
+                    "saves": args.saves, "seed": args.seed},
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+    for name, result in results.items():
+        if "median_s" in result:
+            extra = f"  ({result['records']:,} records)" if "records" in result else ""
+            print(f"{name:<28}{result['median_s'] * 1000:>12.1f} ms{extra}")
+        else:
+            print(f"{name:<28}{json.dumps(result)}")
+    if baseline:
+        print(f"\nCompared with {args.compare} (new / old median):")
+        for name, before, after, ratio in compare(baseline, document):
+            flag = "  slower" if ratio > 1.1 else "  faster" if ratio < 0.9 else ""
+            print(f"{name:<28}{before * 1000:>10.1f} ->{after * 1000:>10.1f} ms  x{ratio}{flag}")
+    print(f"\nResults written to {out}")
+    return 0
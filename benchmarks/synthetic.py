@@ -0,0 +1,93 @@
+# ==============================================================
+#  FILE: synthetic.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Synthetic production data for benchmarks: jobs with stock
+#     targets, staff on the three shift patterns, and shifts with
+#     eight hourly outputs each. Targets come from domain.hours and
+#     under-target hours carry a downtime reason, as entered on the
+#     Shift & Output tab. Output is deterministic for a given seed.
+# ==============================================================
+
+import random
+from datetime import date, timedelta
+
+from domain.hours import hour_label, hour_target
+from domain.models import HourlyOutput, Job, ShiftRecord, Staff, StockItem
+
+SHIFT_STARTS = {"Morning": 6, "Afternoon": 14, "Night": 22}
+HOURS_PER_SHIFT = 8
+
+REASONS = (
+    "Machine cleaning", "Coder issue", "Stock finished", "Waiting on engineer",
+    "Film changeover", "Power outage", "Maintenance", "Staff shortage",
+    "Quality issue", "Setup time", "Breakdown", "Material jam", "Material defect",
+)
+# Skewed weights so a few reasons dominate, as on a real line.
+REASON_WEIGHTS = (6, 4, 3, 3, 8, 1, 2, 2, 2, 5, 10, 7, 2)
+
+CUSTOMERS = ("Acme Foods", "Northwind", "Blue River Dairy", "Sunpack", "Greenfield", "Harbor Mills")
+PRODUCTS = ("Juice 1L", "Yoghurt 500g", "Crisps 150g", "Water 500ml", "Biscuits 200g", "Sauce 350ml")
+
+
+def shift_hours(shift_type: str, rng: random.Random) -> list:
+    """Eight hourly outputs for a shift, with the targets of domain.hours."""
+    start = SHIFT_STARTS[shift_type]
+    hours = []
+    for i in range(HOURS_PER_SHIFT):
+        begin = f"{(start + i) % 24:02d}:00"
+        label, target = hour_label(begin), hour_target(begin)
+        quantity = max(0, int(rng.gauss(target * 0.96, target * 0.08)))
+        comment = ""
+        if quantity < target:
+            comment = rng.choices(REASONS, REASON_WEIGHTS)[0]
+        hours.append(HourlyOutput(label, quantity, target, comment))
+    return hours
+
+
+def generate(jobs: int = 100, staff: int = 30, shifts: int = 10000,
+             seed: int = 1, start: date = date(2024, 1, 1)) -> tuple:
+    """Return (jobs, staff, shifts) lists of domain objects."""
+    rng = random.Random(seed)
+
+    job_list = [
+        Job(
+            job_number=str(900000 + i),
+            customer_name=rng.choice(CUSTOMERS),
+            product=rng.choice(PRODUCTS),
+            stocks=[StockItem("Carton", rng.randrange(50, 2000) * 1000)],
+        )
+        for i in range(jobs)
+    ]
+    staff_list = [
+        Staff(
+            staff_id=f"S{i:04d}",
+            name=f"Operator {i:04d}",
+            role="Operator",
+            shift_type=rng.choice(tuple(SHIFT_STARTS)),
+            date_joined=start.isoformat(),
+        )
+        for i in range(staff)
+    ]
+
+    # Spread shifts over consecutive days, several per day
+    per_day = max(1, len(staff_list) // 2)
+    shift_list = []
+    for i in range(shifts):
+        member = staff_list[i % len(staff_list)]
+        job = job_list[rng.randrange(len(job_list))]
+        day = (start + timedelta(days=i // per_day)).isoformat()
+        hours = shift_hours(member.shift_type, rng)
+        begin = SHIFT_STARTS[member.shift_type]
+        shift_list.append(ShiftRecord(
+            shift_id=f"{job.job_number}-{day}-{begin:02d}00-{i}",
+            job_number=job.job_number,
+            staff_name=member.name,
+            shift_date=day,
+            start_time=f"{begin:02d}:00",
+            end_time=f"{(begin + HOURS_PER_SHIFT) % 24:02d}:00",
+            shift_type=member.shift_type,
+            hourly_outputs=hours,
+            total_output=sum(h.quantity for h in hours),
+        ))
+    return job_list, staff_list, shift_list
@@ -0,0 +1,235 @@
+# ==============================================================
+#  FILE: metrics.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Opt-in timing instrumentation. Wrapped calls (json_store
+#     reads and writes, tab refreshes, exports) record wall time,
+#     call counts and bytes read/written into per-name rolling
+#     histograms. Off by default; a disabled wrapper costs one
+#     flag check. Enable with JPT_INSTRUMENT=1 (or --instrument
+#     on the command lines); JPT_INSTRUMENT_FILE names a JSON file
+#     the histograms are dumped to at exit. One call can also be
+#     captured with cProfile (profile_next).
+#
+#     JPT_INSTRUMENT        "1" to record from startup
+#     JPT_INSTRUMENT_FILE   dump the histograms here at exit
+# ==============================================================
+
+import atexit
+import bisect
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Optional
+
+# Bucket upper bounds in seconds: 50 µs doubling up to ~53 s, then overflow.
+BUCKETS = tuple(50e-6 * 2 ** i for i in range(21))
+
+# Samples kept per name for the percentiles.
+RECENT_SAMPLES = 512
+
+PROFILE_DIR = "exports/diagnostics"
+
+_enabled = os.environ.get("JPT_INSTRUMENT", "").strip() not in ("", "0")
+_lock = threading.Lock()
+_histograms = {}         # name -> Histogram
+_profile_prefix = None   # profile the next call whose name starts with this
+_last_profile = None     # path of the last cProfile capture
+
+
+class Histogram:
+    """Rolling statistics for one instrumented name."""
+
+    __slots__ = ("count", "total", "max", "buckets", "recent", "bytes_read", "bytes_written", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            # bucket upper bound (ms) -> calls, empty buckets left out
+            "histogram": {
+                (f"{BUCKETS[i] * 1000:g}" if i < len(BUCKETS) else "inf"): n
+                for i, n in enumerate(self.buckets) if n
+            },
+        }
+
+
+# ------------------- SWITCH -------------------
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(dump_file: Optional[str] = None) -> None:
+    """Start recording; with dump_file the histograms are written there at exit."""
+    global _enabled
+    _enabled = True
+    if dump_file:
+        atexit.register(dump, dump_file)
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+# ------------------- RECORDING -------------------
+def record(name: str, seconds: float, bytes_read: int = 0, bytes_written: int = 0,
+           error: bool = False) -> None:
+    with _lock:
+        h = _histograms.get(name)
+        if h is None:
+            h = _histograms[name] = Histogram()
+        h.add(seconds)
+        h.bytes_read += bytes_read
+        h.bytes_written += bytes_written
+        if error:
+            h.errors += 1
+
+
+def timed(name: str, io: Optional[Callable] = None):
+    """Decorator recording each call under name while instrumentation is on.
+
+    io(args, result) may return (bytes_read, bytes_written) for the call.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return call(name, fn, args, kwargs, io)
+        return wrapper
+    return decorate
+
+
+def call(name: str, fn: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+         io: Optional[Callable] = None):
+    """Run fn(*args, **kwargs), recording it under name (and profiling it if armed)."""
+    kwargs = kwargs or {}
+    if not _enabled:
+        return fn(*args, **kwargs)
+    profiler = _take_profiler(name)
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(fn, *args, **kwargs)
+        else:
+            result = fn(*args, **kwargs)
+    except BaseException:
+        record(name, time.perf_counter() - start, error=True)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            _save_profile(name, profiler)
+    read, written = io(args, result) if io else (0, 0)
+    record(name, elapsed, read, written)
+    return result
+
+
+# ------------------- CPROFILE -------------------
+def profile_next(prefix: str = "") -> None:
+    """Capture the next instrumented call whose name starts with prefix."""
+    global _profile_prefix
+    with _lock:
+        _profile_prefix = prefix
+
+
+def last_profile() -> Optional[str]:
+    return _last_profile
+
+
+def _take_profiler(name: str) -> Optional[cProfile.Profile]:
+    global _profile_prefix
+    if _profile_prefix is None:
+        return None
+    with _lock:
+        if _profile_prefix is None or not name.startswith(_profile_prefix):
+            return None
+        _profile_prefix = None
+    return cProfile.Profile()
+
+
+def _save_profile(name: str, profiler: cProfile.Profile) -> None:
+    """Write the capture as .prof (for snakeviz/pstats) plus a text summary."""
+    global _last_profile
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(PROFILE_DIR, f"profile_{_safe(name)}_{stamp}")
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(40)
+    _last_profile = base + ".prof"
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+# ------------------- OUTPUT -------------------
+def snapshot() -> dict:
+    """name -> statistics for every recorded name."""
+    with _lock:
+        return {name: h.to_dict() for name, h in sorted(_histograms.items())}
+
+
+def dump(file_path: str) -> str:
+    """Write the current statistics to file_path as JSON; returns the path."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({"generated": datetime.now().astimezone().isoformat(), "metrics": snapshot()}, f, indent=2)
+    return file_path
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def wrote_first_arg(args, result) -> tuple:
+    """io hook for calls whose first argument is the file they write."""
+    return 0, file_size(args[0])
+
+
+if _enabled and os.environ.get("JPT_INSTRUMENT_FILE"):
+    atexit.register(dump, os.environ["JPT_INSTRUMENT_FILE"])
@@ -0,0 +1,138 @@
+# ==============================================================
+#  FILE: hours.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Hourly slots and targets of a shift. An hour's target is the
+#     base rate, reduced pro rata when a break starts within the
+#     hour. Shared by the Shift & Output tab and the counter file
+#     import so both produce the same targets. ShiftHours holds the
+#     rows of a shift being entered with running totals.
+# ==============================================================
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from domain.models import HourlyOutput
+
+BASE_TARGET = 2500                       # units per full hour
+BREAKS = (("09:00", 20), ("12:00", 15))  # (break start, minutes)
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def _minutes(hhmm: str) -> int:
+    """Minutes after midnight for an HH:MM time; raises ValueError otherwise."""
+    t = datetime.strptime(hhmm, "%H:%M")
+    return t.hour * 60 + t.minute
+
+
+def hour_label(start: str) -> str:
+    """Label of the hour starting at start, e.g. 06:00 -> "06:00-07:00"."""
+    begin = datetime.strptime(start, "%H:%M")
+    return f"{begin.strftime('%H:%M')}-{(begin + timedelta(hours=1)).strftime('%H:%M')}"
+
+
+def hour_target(start: str, base_target: int = BASE_TARGET, breaks=BREAKS) -> int:
+    """Target for the hour starting at start (HH:MM)."""
+    begin = _minutes(start)
+    for b_time, b_min in breaks:
+        if (_minutes(b_time) - begin) % _MINUTES_PER_DAY < 60:
+            return round(base_target * (60 - b_min) / 60)
+    return base_target
+
+
+def hour_slots(start: str, end: str, base_target: int = BASE_TARGET, breaks=BREAKS) -> list:
+    """(hour label, target) for each hour from start up to end (HH:MM, same day)."""
+    current = datetime.strptime(start, "%H:%M")
+    end_time = datetime.strptime(end, "%H:%M")
+    slots = []
+    while current < end_time:
+        begin = current.strftime("%H:%M")
+        slots.append((hour_label(begin), hour_target(begin, base_target, breaks)))
+        current += timedelta(hours=1)
+    return slots
+
+
+class ShiftHours:
+    """Hourly rows of a shift being entered, with running totals.
+
+    cum_quantity[i] and cum_target[i] are the sums over rows 0..i, so a
+    change to row i only recomputes the sums from i on, and the shift
+    totals are the last entries.
+    """
+
+    __slots__ = ("rows", "cum_quantity", "cum_target")
+
+    def __init__(self, slots=()):
+        # slots: (hour label, target) pairs, e.g. from hour_slots()
+        self.rows = [HourlyOutput(label, 0, target) for label, target in slots]
+        self.cum_quantity = []
+        self.cum_target = []
+        self._accumulate(0)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> HourlyOutput:
+        return self.rows[index]
+
+    @property
+    def total_quantity(self) -> int:
+        return self.cum_quantity[-1] if self.rows else 0
+
+    @property
+    def total_target(self) -> int:
+        return self.cum_target[-1] if self.rows else 0
+
+    def index(self, hour_label: str) -> Optional[int]:
+        for i, row in enumerate(self.rows):
+            if row.hour_label == hour_label:
+                return i
+        return None
+
+    def first_pending(self) -> Optional[int]:
+        """Index of the first hour without output yet."""
+        for i, row in enumerate(self.rows):
+            if row.quantity == 0:
+                return i
+        return None
+
+    # ------------------- UPDATES -------------------
+    # Each returns the first row whose values (or running totals) changed.
+    def set_quantity(self, index: int, quantity: int, comment: Optional[str] = None) -> int:
+        row = self.rows[index]
+        row.quantity = quantity
+        if comment is not None:
+            row.comment = comment
+        self._accumulate(index)
+        return index
+
+    def set_quantities(self, quantities: dict) -> Optional[int]:
+        """Apply {index: quantity} with one pass over the running totals; None if nothing changed."""
+        changed = [i for i, q in quantities.items() if self.rows[i].quantity != q]
+        if not changed:
+            return None
+        for i in changed:
+            self.rows[i].quantity = quantities[i]
+        first = min(changed)
+        self._accumulate(first)
+        return first
+
+    def remove(self, index: int) -> int:
+        del self.rows[index]
+        self._accumulate(index)
+        return index
+
+    def _accumulate(self, start: int) -> None:
+        """Recompute the running totals from row start to the end."""
+        del self.cum_quantity[start:], self.cum_target[start:]
+        qty = self.cum_quantity[start - 1] if start else 0
+        tgt = self.cum_target[start - 1] if start else 0
+        for row in self.rows[start:]:
+            qty += row.quantity
+            tgt += row.target
+            self.cum_quantity.append(qty)
+            self.cum_target.append(tgt)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional
+from sys import intern
+from typing import Dict, List, Optional
 
 
 def now_iso() -> str:
@@ -8,13 +9,29 @@ def now_iso() -> str:
     return datetime.now(timezone.utc).astimezone().isoformat()
 
 
-@dataclass
+def _intern(value):
+    """Intern repeated strings (names, job numbers, labels) to share memory."""
+    return intern(value) if type(value) is str else value
+
+
+# Models use __slots__ and hand-written codecs: the read path builds one
+# object per shift and per hour, so avoiding per-instance dicts and the
+# generic dataclasses.asdict() keeps large histories compact and fast.
+
+@dataclass(slots=True)
 class StockItem:
     name: str
     quantity: int
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "StockItem":
+        return cls(_intern(d.get("name", "")), int(d.get("quantity", 0)))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "quantity": self.quantity}
+
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     job_number: str
     customer_name: str
@@ -24,17 +41,189 @@ class Job:
     date_created: str = field(default_factory=now_iso)
     date_updated: Optional[str] = None
 
+    @property
+    def target(self) -> int:
+        """Target quantity of the job (first stock line), or 0."""
+        return self.stocks[0].quantity if self.stocks else 0
 
-@dataclass
+    @classmethod
+    def from_dict(cls, d: dict) -> "Job":
+        return cls(
+            _intern(d["job_number"]),
+            _intern(d.get("customer_name", "")),
+            _intern(d.get("product", "")),
+            [StockItem.from_dict(s) for s in d.get("stocks") or ()],
+            _intern(d.get("status", "Pending")),
+            d.get("date_created"),
+            d.get("date_updated"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "job_number": self.job_number,
+            "customer_name": self.customer_name,
+            "product": self.product,
+            "stocks": [s.to_dict() for s in self.stocks],
+            "status": self.status,
+            "date_created": self.date_created,
+            "date_updated": self.date_updated,
+        }
+
+
+@dataclass(slots=True)
 class Staff:
     staff_id: str
     name: str
     role: str
-    department: str
-    active: bool = True
+    shift_type: str           # Morning | Afternoon | Night
+    status: str = "Active"    # Active | Inactive
+    date_joined: str = ""
+
+    @property
+    def active(self) -> bool:
+        return self.status == "Active"
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Staff":
+        return cls(
+            d["staff_id"],
+            _intern(d["name"]),
+            _intern(d.get("role", "")),
+            _intern(d.get("shift_type", "")),
+            _intern(d.get("status", "Active")),
+            d.get("date_joined", ""),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "staff_id": self.staff_id,
+            "name": self.name,
+            "role": self.role,
+            "shift_type": self.shift_type,
+            "status": self.status,
+            "date_joined": self.date_joined,
+        }
+
+
+@dataclass(slots=True)
+class JobProgress:
+    """Running production totals for one job (stored in production.json)."""
+    job_number: str
+    produced: int = 0
+    shift_count: int = 0
+    last_activity: str = ""   # latest shift_date seen
+    target: int = 0           # stocks[0].quantity of the job
+
+    @property
+    def percent(self) -> float:
+        return round(self.produced / self.target * 100, 2) if self.target else 0
+
+    @property
+    def job_status(self) -> str:
+        """Job status implied by the totals: Pending, InProgress or Completed."""
+        if self.target and self.produced >= self.target:
+            return "Completed"
+        return "InProgress" if self.shift_count else "Pending"
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "JobProgress":
+        return cls(
+            _intern(d["job_number"]),
+            int(d.get("produced", 0)),
+            int(d.get("shift_count", 0)),
+            d.get("last_activity") or "",
+            int(d.get("target", 0)),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "job_number": self.job_number,
+            "produced": self.produced,
+            "shift_count": self.shift_count,
+            "last_activity": self.last_activity,
+            "target": self.target,
+        }
+
 
+@dataclass(slots=True)
+class RollupCell:
+    """Shift totals for one (date, job, staff, shift type) combination."""
+    shift_date: str
+    job_number: str
+    staff_name: str
+    shift_type: str
+    output: int = 0           # sum of total_output
+    target: int = 0           # sum of the hourly targets
+    hours: int = 0            # number of hourly rows
+    shift_count: int = 0
+    # reason -> [lost units, hours] for the under-target hours
+    downtime: Dict[str, list] = field(default_factory=dict)
+
+    @property
+    def key(self) -> tuple:
+        return self.shift_date, self.job_number, self.staff_name, self.shift_type
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollupCell":
+        return cls(
+            _intern(d["shift_date"]),
+            _intern(d["job_number"]),
+            _intern(d["staff_name"]),
+            _intern(d.get("shift_type") or ""),
+            int(d.get("output", 0)),
+            int(d.get("target", 0)),
+            int(d.get("hours", 0)),
+            int(d.get("shift_count", 0)),
+            {_intern(r): [int(v[0]), int(v[1])] for r, v in (d.get("downtime") or {}).items()},
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "shift_date": self.shift_date,
+            "job_number": self.job_number,
+            "staff_name": self.staff_name,
+            "shift_type": self.shift_type,
+            "output": self.output,
+            "target": self.target,
+            "hours": self.hours,
+            "shift_count": self.shift_count,
+            "downtime": self.downtime,
+        }
+
+
+@dataclass(slots=True)
+class DowntimeCell:
+    """Lost units for one (date, job, staff, reason) combination."""
+    shift_date: str
+    job_number: str
+    staff_name: str
+    reason: str
+    lost_units: int = 0       # sum of target - quantity over under-target hours
+    hours: int = 0            # number of under-target hours
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "DowntimeCell":
+        return cls(
+            _intern(d["shift_date"]),
+            _intern(d["job_number"]),
+            _intern(d["staff_name"]),
+            _intern(d.get("reason") or ""),
+            int(d.get("lost_units", 0)),
+            int(d.get("hours", 0)),
+        )
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {
+            "shift_date": self.shift_date,
+            "job_number": self.job_number,
+            "staff_name": self.staff_name,
+            "reason": self.reason,
+            "lost_units": self.lost_units,
+            "hours": self.hours,
+        }
+
+
+@dataclass(slots=True)
 class LogEvent:
     log_id: str
     job_number: str
@@ -42,14 +231,38 @@ class LogEvent:
     by: Optional[str]
     timestamp: str = field(default_factory=now_iso)
 
-@dataclass
+
+@dataclass(slots=True)
 class HourlyOutput:
     hour_label: str         # e.g., "06:00-07:00"
     quantity: int           # actual output
     target: int             # hourly target
     comment: str = ""       # REQUIRED when quantity < target
 
-@dataclass
+    @property
+    def lost_units(self) -> int:
+        """Units short of the hourly target (0 when on or above target)."""
+        return max(self.target - self.quantity, 0)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "HourlyOutput":
+        return cls(
+            _intern(d["hour_label"]),
+            int(d.get("quantity", 0)),
+            int(d.get("target", 0)),
+            _intern(d.get("comment") or ""),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "hour_label": self.hour_label,
+            "quantity": self.quantity,
+            "target": self.target,
+            "comment": self.comment,
+        }
+
+
+@dataclass(slots=True)
 class ShiftRecord:
     shift_id: str
     job_number: str
@@ -61,3 +274,32 @@ class ShiftRecord:
     hourly_outputs: List[HourlyOutput] = field(default_factory=list)
     total_output: int = 0
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).astimezone().isoformat())
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ShiftRecord":
+        return cls(
+            d["shift_id"],
+            _intern(d["job_number"]),
+            _intern(d["staff_name"]),
+            _intern(d["shift_date"]),
+            _intern(d.get("start_time")),
+            _intern(d.get("end_time")),
+            _intern(d.get("shift_type")),
+            [HourlyOutput.from_dict(h) for h in d.get("hourly_outputs") or ()],
+            int(d.get("total_output") or 0),
+            d.get("timestamp"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "shift_id": self.shift_id,
+            "job_number": self.job_number,
+            "staff_name": self.staff_name,
+            "shift_date": self.shift_date,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "shift_type": self.shift_type,
+            "hourly_outputs": [h.to_dict() for h in self.hourly_outputs],
+            "total_output": self.total_output,
+            "timestamp": self.timestamp,
+        }
@@ -0,0 +1,3 @@
+from ingest.counters import main
+
+raise SystemExit(main())
@@ -0,0 +1,319 @@
+# ==============================================================
+#  FILE: counters.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Bulk import of hourly counts from the packing lines' counter
+#     exports (CSV, optionally gzip-compressed). The file is read as
+#     a stream and validated in chunks; valid lines are summed into
+#     hourly outputs, grouped into shifts and stored with one batched
+#     write. Each shift gets a row for every hour from its first to
+#     its last counted hour, in any line order; hours without lines
+#     are stored as 0. Targets and breaks come from domain.hours, as
+#     on the Shift & Output tab. Nothing here imports tkinter.
+#
+#     Columns (header row required, extra columns ignored):
+#         date          shift date, YYYY-MM-DD (overnight hours keep
+#                       the date the shift started)
+#         hour          HH:MM; lines within the same hour are summed
+#         job_number    an existing job
+#         staff_name    an existing staff member
+#         quantity      units counted, a whole number >= 0
+#         shift_type    optional; defaults to the staff member's
+#         comment       optional downtime reason for the hour
+#
+#         python -m ingest counters_2025-10.csv --errors bad_rows.csv
+# ==============================================================
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Optional
+
+from diagnostics import metrics
+from domain.hours import hour_slots
+from domain.models import HourlyOutput, ShiftRecord
+from storage.backends import get_backend
+
+REQUIRED_COLUMNS = ("date", "hour", "job_number", "staff_name", "quantity")
+SHIFT_TYPES = ("Morning", "Afternoon", "Night", "Custom")
+
+# Lines validated between progress reports / cancellation checks.
+CHUNK_ROWS = 2000
+
+
+class ImportCancelled(Exception):
+    """Raised when an import is cancelled before anything was stored."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0                 # data lines read
+    shifts: int = 0               # shifts stored (or that would be, on a dry run)
+    hours: int = 0                # hourly outputs in those shifts
+    total_output: int = 0
+    duplicates: int = 0           # shifts skipped because they are already stored
+    errors: list = field(default_factory=list)   # (line number, row dict, message)
+
+
+class _ShiftBuilder:
+    """Hourly counts of one shift, keyed by the start of the hour."""
+
+    __slots__ = ("shift_type", "hours")
+
+    def __init__(self, shift_type: str):
+        self.shift_type = shift_type
+        self.hours = {}          # "HH:00" -> [quantity, comment]
+
+    def add(self, hour: str, quantity: int, comment: str) -> None:
+        slot = self.hours.get(hour)
+        if slot is None:
+            self.hours[hour] = [quantity, comment]
+            return
+        slot[0] += quantity
+        if comment and not slot[1]:
+            slot[1] = comment
+
+    def span(self) -> tuple:
+        """(start, end) HH:MM of the shift, whatever order the lines came in.
+
+        The shift starts after the longest run of hours without counts, so
+        overnight hours (00:00, 01:00, ...) come after a 22:00 start.
+        """
+        starts = sorted(int(hour[:2]) for hour in self.hours)
+        n = len(starts)
+        # index of the last hour: the one followed by the most missing hours
+        last = max([n - 1] + list(range(n - 1)),
+                   key=lambda i: (starts[(i + 1) % n] - starts[i] - 1) % 24)
+        return f"{starts[(last + 1) % n]:02d}:00", f"{(starts[last] + 1) % 24:02d}:00"
+
+    def build(self, shift_date: str, job_number: str, staff_name: str) -> ShiftRecord:
+        """Shift with a row for every hour from start to end; hours without counts are 0."""
+        start, end = self.span()
+        if start < end:
+            slots = hour_slots(start, end)
+        else:
+            slots = hour_slots(start, "23:59") + hour_slots("00:00", end)
+        hours = []
+        for label, target in slots:
+            quantity, comment = self.hours.get(label[:5], (0, ""))
+            hours.append(HourlyOutput(label, quantity, target, comment))
+        return ShiftRecord(
+            shift_id=f"{job_number}-{shift_date}-{start.replace(':', '')}",
+            job_number=job_number,
+            staff_name=staff_name,
+            shift_date=shift_date,
+            start_time=start,
+            end_time=end,
+            shift_type=self.shift_type,
+            hourly_outputs=hours,
+            total_output=sum(h.quantity for h in hours),
+        )
+
+
+# ------------------- READING -------------------
+def _open(file_path: str):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", encoding="utf-8-sig", newline="")
+    return open(file_path, "r", encoding="utf-8-sig", newline="")
+
+
+def _normalize_header(fieldnames) -> list:
+    return [(name or "").strip().lower().replace(" ", "_") for name in fieldnames or ()]
+
+
+def _parse_hour(value: str) -> str:
+    """Start of the hour for 6, 06:15 or 06:15:30 ("06:00"); raises ValueError."""
+    value = value.strip()
+    if value.isdigit():
+        value += ":00"
+    t = datetime.strptime(value[:5] if value.count(":") > 1 else value, "%H:%M")
+    return f"{t.hour:02d}:00"
+
+
+# ------------------- VALIDATION -------------------
+class _Validator:
+    """Checks counter lines against the stored jobs and staff."""
+
+    def __init__(self, backend):
+        self.jobs = {j.job_number for j in backend.list_jobs()}
+        self.staff = {s.name.lower(): s for s in backend.list_staff()}
+
+    def check(self, row: dict) -> tuple:
+        """Return ((shift_date, job, staff, hour, quantity, shift_type, comment), None)
+        for a valid line, or (None, message)."""
+        shift_date = (row.get("date") or "").strip()
+        try:
+            date.fromisoformat(shift_date)
+        except ValueError:
+            return None, f"invalid date {shift_date!r} (use YYYY-MM-DD)"
+        try:
+            hour = _parse_hour(row.get("hour") or "")
+        except ValueError:
+            return None, f"invalid hour {row.get('hour')!r} (use HH:MM)"
+
+        job_number = (row.get("job_number") or "").strip()
+        if job_number not in self.jobs:
+            return None, f"unknown job {job_number!r}"
+        name = (row.get("staff_name") or "").strip()
+        member = self.staff.get(name.lower())
+        if member is None:
+            return None, f"unknown staff member {name!r}"
+
+        try:
+            quantity = int((row.get("quantity") or "").strip())
+        except ValueError:
+            return None, f"invalid quantity {row.get('quantity')!r}"
+        if quantity < 0:
+            return None, f"negative quantity {quantity}"
+
+        shift_type = (row.get("shift_type") or "").strip().title() or member.shift_type
+        if shift_type not in SHIFT_TYPES:
+            return None, f"unknown shift type {shift_type!r}"
+        comment = (row.get("comment") or "").strip()
+        return (shift_date, job_number, member.name, hour, quantity, shift_type, comment), None
+
+
+# ------------------- IMPORT -------------------
+@metrics.timed("import.counters", io=lambda args, result: (metrics.file_size(args[0]), 0))
+def import_counter_file(file_path: str, dry_run: bool = False,
+                        progress: Optional[Callable[[int, int], None]] = None,
+                        should_stop: Optional[Callable[[], bool]] = None) -> ImportResult:
+    """Validate a counter export and store its shifts with one batched write.
+
+    Invalid lines are reported in the result and left out; the rest of the
+    file is still imported. Shifts already stored (same shift id and staff)
+    are skipped, so a file can be imported again safely. With dry_run
+    nothing is stored. Cancelling (should_stop) before the write stores
+    nothing and raises ImportCancelled.
+    """
+    backend = get_backend()
+    validator = _Validator(backend)
+    result = ImportResult()
+    builders = {}            # (shift_date, job, staff) -> _ShiftBuilder
+
+    with _open(file_path) as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = _normalize_header(reader.fieldnames)
+        missing = [c for c in REQUIRED_COLUMNS if c not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"{file_path}: missing column(s) {', '.join(missing)}")
+
+        for row in reader:
+            result.rows += 1
+            parsed, error = validator.check(row)
+            if error:
+                result.errors.append((reader.line_num, row, error))
+            else:
+                shift_date, job_number, staff_name, hour, quantity, shift_type, comment = parsed
+                key = (shift_date, job_number, staff_name)
+                builder = builders.get(key)
+                if builder is None:
+                    builder = builders[key] = _ShiftBuilder(shift_type)
+                builder.add(hour, quantity, comment)
+
+            if result.rows % CHUNK_ROWS == 0:
+                if should_stop and should_stop():
+                    raise ImportCancelled()
+                if progress:
+                    progress(result.rows, 0)
+
+    shifts = [builder.build(*key) for key, builder in builders.items()]
+    shifts = _skip_stored(backend, shifts, result)
+    if should_stop and should_stop():
+        raise ImportCancelled()
+
+    result.shifts = len(shifts)
+    result.hours = sum(len(s.hourly_outputs) for s in shifts)
+    result.total_output = sum(s.total_output for s in shifts)
+    if not dry_run:
+        backend.add_shifts(shifts)
+    if progress:
+        progress(result.rows, result.rows)
+    return result
+
+
+def _skip_stored(backend, shifts: list, result: ImportResult) -> list:
+    """Drop shifts whose (shift_id, staff) is already stored, with one query."""
+    if not shifts:
+        return shifts
+    dates = (min(s.shift_date for s in shifts), max(s.shift_date for s in shifts))
+    stored = {(s.shift_id, s.staff_name) for s in backend.iter_shifts(dates=dates, with_hours=False)}
+    fresh = [s for s in shifts if (s.shift_id, s.staff_name) not in stored]
+    result.duplicates = len(shifts) - len(fresh)
+    return fresh
+
+
+def write_errors(file_path: str, result: ImportResult) -> int:
+    """Write the rejected lines, with their line number and reason, as CSV."""
+    if not result.errors:
+        return 0
+    columns = list(REQUIRED_COLUMNS) + ["shift_type", "comment"]
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "error"] + columns)
+        for line, row, message in result.errors:
+            writer.writerow([line, message] + [row.get(c) or "" for c in columns])
+    return len(result.errors)
+
+
+# ------------------- COMMAND LINE -------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m ingest",
+        description="Import hourly counts from machine counter CSV exports.",
+    )
+    parser.add_argument("files", nargs="+", metavar="FILE", help="counter export (.csv or .csv.gz)")
+    parser.add_argument("--dry-run", action="store_true", help="validate only; store nothing")
+    parser.add_argument("--errors", metavar="CSV",
+                        help="write rejected lines here (one file per input: name gets the input's stem)")
+    return parser
+
+
+def main(argv=None) -> int:
+    from storage import write_queue
+
+    args = build_parser().parse_args(argv)
+    failures = 0
+    for file_path in args.files:
+        try:
+            result = import_counter_file(file_path, dry_run=args.dry_run)
+        except (OSError, ValueError) as e:
+            failures += 1
+            print(f"{file_path}: FAILED ({e})", file=sys.stderr)
+            continue
+
+        verb = "would import" if args.dry_run else "imported"
+        print(f"{file_path}: {result.rows} lines, {verb} {result.shifts} shifts "
+              f"({result.hours} hours, {result.total_output:,} units), "
+              f"{result.duplicates} already stored, {len(result.errors)} rejected")
+        for line, _row, message in result.errors[:10]:
+            print(f"  line {line}: {message}", file=sys.stderr)
+        if len(result.errors) > 10:
+            print(f"  … {len(result.errors) - 10} more", file=sys.stderr)
+        if args.errors and result.errors:
+            path = args.errors
+            if len(args.files) > 1:
+                stem, ext = os.path.splitext(args.errors)
+                path = f"{stem}_{_stem(file_path)}{ext or '.csv'}"
+            write_errors(path, result)
+            print(f"  rejected lines written to {path}", file=sys.stderr)
+    write_queue.flush()
+    for path, error in write_queue.drain_errors():
+        failures += 1
+        print(f"{path}: could not be saved ({error})", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _stem(file_path: str) -> str:
+    name = os.path.basename(file_path)
+    for ext in (".gz", ".csv"):
+        if name.endswith(ext):
+            name = name[: -len(ext)]
+    return name
@@ -0,0 +1,338 @@
+# ==============================================================
+#  FILE: live.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Live count feed from the line PLCs. An asyncio listener on a
+#     background thread accepts count ticks over local TCP and UDP
+#     on the same port and adds them to in-memory per-minute
+#     buckets per (date, job, HH:MM). Readers (the Shift & Output
+#     tab) poll the sums over their hourly rows' time ranges, so
+#     the Tk thread never waits on the network and shifts starting
+#     off the hour get the right counts.
+#     Unsaved counts are appended to a per-day journal once per
+#     FLUSH_INTERVAL in one batched write, and replayed on start.
+#     Nothing here imports tkinter.
+#
+#     Tick format, one per line (several lines per TCP write or
+#     UDP datagram are fine):
+#         <job number or line id> <count> [unix time]
+#     Fields may also be comma separated. Line ids are mapped to
+#     job numbers through data/lines.json ({"L1": "950100"}).
+#
+#     JPT_LIVE_HOST   address to listen on (default 127.0.0.1)
+#     JPT_LIVE_PORT   TCP and UDP port (default 5020)
+#
+#         python -m ingest.live            # headless listener
+#         python -m ingest.simulator       # stand-in PLCs
+# ==============================================================
+
+import argparse
+import asyncio
+import atexit
+import os
+import shutil
+import threading
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from storage.backends import register_reset_hook
+from storage.json_store import extend_jsonl, load_json, load_jsonl
+from storage.repository import LIVE_DIR
+
+HOST = os.environ.get("JPT_LIVE_HOST", "127.0.0.1")
+PORT = int(os.environ.get("JPT_LIVE_PORT", "5020"))
+
+LINES_FILE = "data/lines.json"
+
+# Seconds between journal writes.
+FLUSH_INTERVAL = 1.0
+
+READ_SIZE = 64 * 1024
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def journal_file(day: str) -> str:
+    return os.path.join(LIVE_DIR, f"{day}.jsonl")
+
+
+# ------------------- TICKS -------------------
+def _bucket(ts: float) -> tuple:
+    t = time.localtime(ts)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}", f"{t.tm_hour:02d}:{t.tm_min:02d}"
+
+
+def parse_ticks(data: bytes, lines: dict, now: float, counts: dict) -> int:
+    """Add the ticks in data to counts {(date, job, HH:MM): units}; returns ticks read.
+
+    Malformed lines are ignored.
+    """
+    ticks = 0
+    now_bucket = _bucket(now)
+    for raw in data.split(b"\n"):
+        parts = raw.replace(b",", b" ").split()
+        if len(parts) < 2:
+            continue
+        try:
+            units = int(parts[1])
+            day, minute = _bucket(float(parts[2])) if len(parts) > 2 else now_bucket
+        except (ValueError, OverflowError, OSError):
+            continue
+        key = parts[0].decode("utf-8", "replace")
+        bucket = (day, lines.get(key, key), minute)
+        counts[bucket] = counts.get(bucket, 0) + units
+        ticks += 1
+    return ticks
+
+
+# ------------------- MINUTE BUCKETS -------------------
+class LiveCounter:
+    """Per-minute unit counts per (date, job), shared between the feed and its readers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()   # held while journals are written or cleared
+        self._totals = {}        # (date, job) -> {"HH:MM": units}
+        self._unsaved = {}       # (date, job, HH:MM) -> units not yet journaled
+        self.ticks = 0
+        self.version = 0         # bumped on every change; readers compare it
+        self._replayed = False
+
+    def add(self, counts: dict, ticks: int = 0) -> None:
+        if not counts:
+            return
+        with self._lock:
+            for (day, job, minute), units in counts.items():
+                minutes = self._totals.setdefault((day, job), {})
+                minutes[minute] = minutes.get(minute, 0) + units
+                key = (day, job, minute)
+                self._unsaved[key] = self._unsaved.get(key, 0) + units
+            self.ticks += ticks
+            self.version += 1
+
+    def range_totals(self, job_number: str, shift_date: str, ranges: list) -> list:
+        """Units counted for a job in each (start, end) HH:MM range of a shift date.
+
+        A range whose end is not after its start runs past midnight into
+        the next day. Raises ValueError for an invalid shift_date.
+        """
+        next_day = (date.fromisoformat(shift_date) + timedelta(days=1)).isoformat()
+        with self._lock:
+            today = dict(self._totals.get((shift_date, job_number), ()))
+            tomorrow = dict(self._totals.get((next_day, job_number), ())) if any(
+                end <= start for start, end in ranges) else {}
+        totals = []
+        for start, end in ranges:
+            if start < end:
+                units = sum(u for m, u in today.items() if start <= m < end)
+            else:
+                units = (sum(u for m, u in today.items() if m >= start)
+                         + sum(u for m, u in tomorrow.items() if m < end))
+            totals.append(units)
+        return totals
+
+    # ------------------- JOURNAL -------------------
+    def flush(self) -> int:
+        """Append unsaved counts to the day journals, one write per day."""
+        with self._io_lock:
+            with self._lock:
+                unsaved, self._unsaved = self._unsaved, {}
+            by_day = {}
+            for (day, job, minute), units in unsaved.items():
+                by_day.setdefault(day, []).append({"job": job, "minute": minute, "units": units})
+            written = 0
+            try:
+                for day, records in by_day.items():
+                    extend_jsonl(journal_file(day), records)
+                    written += len(records)
+            except OSError:
+                with self._lock:   # keep them for the next flush
+                    for key, units in unsaved.items():
+                        self._unsaved[key] = self._unsaved.get(key, 0) + units
+                raise
+            return written
+
+    def reset(self) -> None:
+        """Forget every count, in memory and in the day journals."""
+        with self._io_lock:
+            with self._lock:
+                self._totals, self._unsaved = {}, {}
+                self.version += 1
+            shutil.rmtree(LIVE_DIR, ignore_errors=True)
+
+    def replay(self, days: int = 2) -> None:
+        """Load the journals of the last days (yesterday covers night shifts), once."""
+        today = date.today()
+        with self._lock:
+            if self._replayed:
+                return
+            self._replayed = True
+            for offset in range(days):
+                day = (today - timedelta(days=offset)).isoformat()
+                for r in load_jsonl(journal_file(day), default=[]):
+                    try:
+                        minute = r.get("minute") or r["hour"]   # older journals kept whole hours
+                        minutes = self._totals.setdefault((day, r["job"]), {})
+                        minutes[minute] = minutes.get(minute, 0) + int(r["units"])
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        continue
+            self.version += 1
+
+
+# ------------------- LISTENER -------------------
+class _TickDatagrams(asyncio.DatagramProtocol):
+    def __init__(self, feed: "LiveFeed"):
+        self.feed = feed
+
+    def datagram_received(self, data, addr):
+        self.feed.ingest(data)
+
+
+class LiveFeed:
+    """asyncio TCP + UDP tick listener running on its own thread."""
+
+    def __init__(self, counter: Optional[LiveCounter] = None, host: str = HOST, port: int = PORT,
+                 lines: Optional[dict] = None):
+        self.counter = counter or LiveCounter()
+        self.host = host
+        self.port = port
+        self.lines = lines if lines is not None else (load_json(LINES_FILE, default={}) or {})
+        self._loop = None
+        self._stop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+        atexit.register(self.counter.flush)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start listening; raises OSError when the port cannot be bound."""
+        if self.running:
+            return
+        self.counter.replay()
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()),
+                                        name="live-feed", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+
+    def stop(self) -> None:
+        if self.running and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout=5)
+        self.counter.flush()
+
+    def ingest(self, data: bytes) -> None:
+        """Parse a block of tick lines and add it to the counter in one update."""
+        counts = {}
+        ticks = parse_ticks(data, self.lines, time.time(), counts)
+        self.counter.add(counts, ticks)
+
+    # ------------------- LOOP THREAD -------------------
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._on_client, self.host, self.port)
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _TickDatagrams(self), local_addr=(self.host, self.port)
+            )
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await self._loop.run_in_executor(None, self.counter.flush)
+                except OSError:
+                    pass   # retried on the next interval
+        finally:
+            transport.close()
+            server.close()
+            await server.wait_closed()
+
+    async def _on_client(self, reader, writer) -> None:
+        rest = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                data = rest + data
+                cut = data.rfind(b"\n")
+                if cut < 0:
+                    rest = data
+                    continue
+                rest = data[cut + 1:]
+                self.ingest(data[:cut])
+            if rest:
+                self.ingest(rest)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def get_feed() -> LiveFeed:
+    """Return the process-wide feed (not started)."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = LiveFeed()
+        return _feed
+
+
+def reset_counts() -> None:
+    """Clear the process-wide feed's counts; called on a data reset."""
+    with _feed_lock:
+        feed = _feed
+    if feed is not None:
+        feed.counter.reset()
+
+
+register_reset_hook(reset_counts)
+
+
+# ------------------- COMMAND LINE -------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ingest.live",
+                                     description="Listen for PLC count ticks without the GUI.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args(argv)
+
+    feed = LiveFeed(host=args.host, port=args.port)
+    feed.start()
+    print(f"Listening on {args.host}:{args.port} (TCP and UDP); Ctrl+C to stop")
+    last = feed.counter.ticks
+    try:
+        while True:
+            time.sleep(1)
+            ticks = feed.counter.ticks
+            print(f"{ticks - last:>8,} ticks/s  {ticks:>12,} total")
+            last = ticks
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+# ==============================================================
+#  FILE: simulator.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Stand-in for the line PLCs: sends count ticks to the live
+#     feed (ingest.live) at a steady rate over TCP or UDP, so the
+#     Shift & Output tab can be tried and load-tested without a
+#     production line.
+#
+#         python -m ingest.simulator --jobs 950100 950101 --rate 5000
+#         python -m ingest.simulator --protocol udp --seconds 30
+# ==============================================================
+
+import argparse
+import asyncio
+import random
+import time
+
+from ingest.live import HOST, PORT
+
+# Ticks are sent in batches this many times a second.
+BATCHES_PER_SECOND = 50
+
+# Largest UDP datagram sent; keeps clear of fragmentation.
+MAX_DATAGRAM = 1200
+
+
+def make_batch(jobs: list, size: int, rng: random.Random) -> list:
+    """size tick lines, each a few units for a random job."""
+    return [f"{rng.choice(jobs)} {rng.randint(1, 3)}\n".encode() for _ in range(size)]
+
+
+def _datagrams(lines: list) -> list:
+    packets, current = [], b""
+    for line in lines:
+        if len(current) + len(line) > MAX_DATAGRAM:
+            packets.append(current)
+            current = b""
+        current += line
+    if current:
+        packets.append(current)
+    return packets
+
+
+async def simulate(jobs: list, rate: int, seconds: float, protocol: str = "tcp",
+                   host: str = HOST, port: int = PORT, seed: int = 1) -> tuple:
+    """Send about rate ticks per second for seconds; returns (ticks, units) sent."""
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    if protocol == "udp":
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+                                                           remote_addr=(host, port))
+        send = lambda lines: [transport.sendto(p) for p in _datagrams(lines)]
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+        send = lambda lines: writer.write(b"".join(lines))
+
+    per_batch, carry = divmod(rate, BATCHES_PER_SECOND)
+    ticks = units = 0
+    start = time.perf_counter()
+    batch_no = 0
+    try:
+        while time.perf_counter() - start < seconds:
+            size = per_batch + (1 if batch_no % BATCHES_PER_SECOND < carry else 0)
+            lines = make_batch(jobs, size, rng)
+            send(lines)
+            if protocol == "tcp":
+                await writer.drain()
+            ticks += len(lines)
+            units += sum(int(line.split()[1]) for line in lines)
+            batch_no += 1
+            # Sleep until this batch's slot so the rate does not drift
+            delay = start + batch_no / BATCHES_PER_SECOND - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    finally:
+        if protocol == "udp":
+            transport.close()
+        else:
+            writer.close()
+            await writer.wait_closed()
+    return ticks, units
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ingest.simulator",
+                                     description="Send simulated PLC count ticks to the live feed.")
+    parser.add_argument("--jobs", nargs="+", default=["950100"], metavar="JOB",
+                        help="job numbers (or line ids) to send ticks for")
+    parser.add_argument("--rate", type=int, default=1000, help="ticks per second (default: 1000)")
+    parser.add_argument("--seconds", type=float, default=10, help="how long to run (default: 10)")
+    parser.add_argument("--protocol", choices=("tcp", "udp"), default="tcp")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    ticks, units = asyncio.run(simulate(args.jobs, args.rate, args.seconds, args.protocol,
+                                        args.host, args.port, args.seed))
+    elapsed = time.perf_counter() - started
+    print(f"Sent {ticks:,} ticks ({units:,} units) over {args.protocol.upper()} "
+          f"in {elapsed:.1f} s ({ticks / elapsed:,.0f} ticks/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,10 +2,19 @@ import sys, os
 sys.path.append(os.path.dirname(__file__))
 
 import tkinter as tk
+from diagnostics import metrics
 from main_window import JobProductionApp
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # --instrument [FILE]: record timings (see diagnostics/metrics.py),
+    # optionally dumping them to FILE at exit
+    if "--instrument" in argv:
+        i = argv.index("--instrument")
+        dump_file = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith("-") else None
+        metrics.enable(dump_file)
+
     root = tk.Tk()
     app = JobProductionApp(root)
     root.mainloop()
@@ -4,25 +4,49 @@
 #  DESCRIPTION:
 #     Main application window that orchestrates all modular tabs:
 #     Add Job, View Jobs, Shift Tracking, Staff Management,
-#     Production Logs, and Dashboard Analytics.
+#     Production Logs, and Dashboard Analytics, plus a hidden
+#     Diagnostics tab (Ctrl+Shift+D while instrumentation is on).
+#     Tabs are imported and built the first time they are selected,
+#     so matplotlib (Dashboard) and the report engines only load
+#     when they are needed.
 # ==============================================================
 
+import importlib
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-# ==== Import modular UI tabs ====
-from ui.tab_add_job import AddJobTab
-from ui.tab_view_jobs import ViewJobsTab
-from ui.tab_shift import ShiftTab
-from ui.tab_staff import StaffTab
-from ui.tab_logs import LogsTab
-from ui.tab_dashboard import DashboardTab
+from diagnostics import metrics
+from storage import write_queue
+from ui.refresh import RefreshPipeline
+
+_STARTED = time.perf_counter()
+
+# Seconds from loading this module until the window is ready; the
+# shop-floor PCs should stay under it. The measured time is shown in
+# the status bar and recorded as "app.startup" in diagnostics.metrics,
+# counted as an error when the target is exceeded.
+STARTUP_TARGET_SECONDS = 1.0
+
+# ==== Modular UI tabs: (attribute, notebook text, module, class) ====
+TABS = (
+    ("tab_add_job", "➕ Add Job", "ui.tab_add_job", "AddJobTab"),
+    ("tab_view_jobs", "📋 View Jobs", "ui.tab_view_jobs", "ViewJobsTab"),
+    ("tab_shift", "🕒 Shift & Output", "ui.tab_shift", "ShiftTab"),
+    ("tab_staff", "👥 Staff Management", "ui.tab_staff", "StaffTab"),
+    ("tab_logs", "📊 Production Logs", "ui.tab_logs", "LogsTab"),
+    ("tab_dashboard", "📈 Dashboard", "ui.tab_dashboard", "DashboardTab"),
+    ("tab_diagnostics", "🩺 Diagnostics", "ui.tab_diagnostics", "DiagnosticsTab"),
+)
+
+# Tabs left out of the notebook until asked for (see _show_diagnostics).
+HIDDEN_TABS = ("tab_diagnostics",)
 
 
 class JobProductionApp:
     """Main application window that hosts all modular tabs."""
 
-    def __init__(self, root):
+    def __init__(self, root, welcome=True):
         self.root = root
         self.root.title("UMAMCO Job Production Tracker")
         self.root.geometry("900x720")
@@ -35,58 +59,113 @@ class JobProductionApp:
         style.configure("Yellow.Horizontal.TProgressbar", troughcolor="white", background="orange")
         style.configure("Green.Horizontal.TProgressbar", troughcolor="white", background="green")
 
+        # ---- Status Bar (shows background refreshes) ----
+        self.lbl_status = ttk.Label(self.root, text="", anchor="w", foreground="gray")
+        self.lbl_status.pack(side="bottom", fill="x", padx=8)
+
         # ---- Notebook (Tabs Container) ----
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(expand=True, fill="both")
 
-        # ---- Initialize Each Tab ----
-        self.tab_add_job = AddJobTab(self.notebook)
-        self.tab_view_jobs = ViewJobsTab(self.notebook)
-        self.tab_shift = ShiftTab(self.notebook)
-        self.tab_staff = StaffTab(self.notebook)
-        self.tab_logs = LogsTab(self.notebook)
-        self.tab_dashboard = DashboardTab(self.notebook)
-
-        # ---- Add Tabs to Notebook ----
-        self.notebook.add(self.tab_add_job.frame, text="➕ Add Job", sticky="nsew")
-        self.notebook.add(self.tab_view_jobs.frame, text="📋 View Jobs")
-        self.notebook.add(self.tab_shift.frame, text="🕒 Shift & Output")
-        self.notebook.add(self.tab_staff.frame, text="👥 Staff Management")
-        self.notebook.add(self.tab_logs.frame, text="📊 Production Logs")
-        self.notebook.add(self.tab_dashboard.frame, text="📈 Dashboard")
+        # ---- Background refresh of tab data ----
+        self.refresher = RefreshPipeline(self.root, on_busy=self._set_busy)
+
+        # ---- Add an empty page per tab; contents are built on first selection ----
+        self._pages = []
+        for attr, text, _module, _cls in TABS:
+            page = ttk.Frame(self.notebook)
+            self.notebook.add(page, text=text, sticky="nsew",
+                              state="hidden" if attr in HIDDEN_TABS else "normal")
+            self._pages.append(page)
+            setattr(self, attr, None)
+        self._build_tab(0)
 
         # ---- Bind Tab Change Event ----
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
-
-        messagebox.showinfo("Welcome", "UMAMCO Job Production Tracker is ready.")
+        self.root.bind_all("<Control-Shift-D>", self._show_diagnostics)
+
+        # ---- Flush queued saves before the window closes ----
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # ---- Startup time ----
+        self.root.update_idletasks()
+        self.startup_seconds = time.perf_counter() - _STARTED
+        slow = self.startup_seconds > STARTUP_TARGET_SECONDS
+        metrics.record("app.startup", self.startup_seconds, error=slow)
+        status = f"Ready in {self.startup_seconds:.2f} s"
+        if slow:
+            status += f" (target {STARTUP_TARGET_SECONDS:.2f} s)"
+        self.lbl_status.config(text=status)
+
+        if welcome:
+            messagebox.showinfo("Welcome", "UMAMCO Job Production Tracker is ready.")
+
+    # ------------------- LAZY TABS -------------------
+    def _build_tab(self, index):
+        """Import and build a tab's contents the first time it is shown."""
+        attr, _text, module, cls = TABS[index]
+        tab = getattr(self, attr)
+        if tab is None:
+            tab = getattr(importlib.import_module(module), cls)(self._pages[index])
+            tab.frame.pack(fill="both", expand=True)
+            setattr(self, attr, tab)
+        return tab
 
     # ------------------- EVENT: TAB CHANGED -------------------
     def _on_tab_changed(self, event):
-        """Handle automatic refresh of data when switching between tabs."""
-        selected = event.widget.tab(event.widget.select(), "text")
-
+        """Build the selected tab if needed and refresh its data in the background.
+
+        Data is loaded on the refresh pipeline's worker threads and applied
+        to the widgets when ready; a refresh still running for the tab that
+        was left is cancelled. Tabs without a refresh_loader (Add Job) have
+        nothing to load.
+        """
+        index = self.notebook.index(self.notebook.select())
+        self.refresher.cancel_all()
+        if getattr(self, TABS[index][0]) is None:
+            self._set_busy(True)
+            self.root.update_idletasks()
+            try:
+                self._build_tab(index)
+            finally:
+                self._set_busy(False)
+
+        tab = getattr(self, TABS[index][0])
+        if not hasattr(tab, "refresh_loader"):
+            return
         try:
-            if "Shift" in selected:
-                # Reload staff and job data dynamically
-                self.tab_shift._load_active_staff_into_combobox()
-                self.tab_shift._load_job_numbers_into_combobox()
-
-            elif "Staff" in selected:
-                # Refresh staff table
-                self.tab_staff._load_staff_into_tree()
-
-            elif "Logs" in selected:
-                # Reload filters for job/staff selection
-                self.tab_logs._refresh_filters()
-                self.tab_logs._load_logs_to_tree()
-
-            elif "Dashboard" in selected:
-                # Refresh dashboard statistics
-                self.tab_dashboard._load_dashboard_data()
-
+            self.refresher.submit(TABS[index][0], tab.refresh_loader(), tab.apply_refresh, self._on_refresh_error)
         except Exception as e:
             messagebox.showerror("Error", f"Tab refresh failed:\n{e}")
 
+    def _show_diagnostics(self, event=None):
+        """Reveal and select the Diagnostics tab while instrumentation is on."""
+        if not metrics.enabled():
+            self.lbl_status.config(text="Instrumentation is off (start with --instrument)")
+            return
+        index = [attr for attr, _t, _m, _c in TABS].index("tab_diagnostics")
+        self.notebook.tab(index, state="normal")
+        self.notebook.select(index)
+
+    def _on_refresh_error(self, error):
+        messagebox.showerror("Error", f"Tab refresh failed:\n{error}")
+
+    def _set_busy(self, busy):
+        """Show a loading state while a refresh is running."""
+        self.lbl_status.config(text="Loading…" if busy else "")
+        self.root.config(cursor="watch" if busy else "")
+
+    # ------------------- EVENT: WINDOW CLOSE -------------------
+    def _on_close(self):
+        """Write any queued saves to disk, then close the application."""
+        self.refresher.shutdown()
+        write_queue.flush()
+        errors = write_queue.drain_errors()
+        if errors:
+            details = "\n".join(f"{path}: {err}" for path, err in errors)
+            messagebox.showerror("Save Failed", f"Some data could not be saved:\n{details}")
+        self.root.destroy()
+
 
 # ------------------- RUN APPLICATION -------------------
 if __name__ == "__main__":
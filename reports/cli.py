@@ -0,0 +1,161 @@
+# ==============================================================
+#  FILE: cli.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Headless command line for batch reports and nightly exports.
+#     Uses the same filters and aggregation as the GUI without
+#     importing tkinter. One report is written per combination of
+#     --job, --staff and --date and per --format:
+#
+#         python -m reports --format csv pdf --date 2025-10 --all-jobs --jobs 4
+#         python -m reports --format json --staff "Amin Umar" --date 2025
+#         python -m reports --format summary
+#         python -m reports --format downtime --date 2025-10
+#         python -m reports --format pdf --instrument timings.json
+# ==============================================================
+
+import argparse
+import itertools
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+FORMATS = ("csv", "pdf", "json", "summary", "downtime")
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value) if value else "All"
+
+
+def report_path(out_dir: str, fmt: str, job: str, staff: str, date_filter: str,
+                detailed: bool = False, compress: bool = False) -> str:
+    if fmt == "summary":
+        return os.path.join(out_dir, f"Dashboard_Summary_{_slug(date_filter)}.json")
+    if fmt == "downtime":
+        return os.path.join(out_dir, f"Downtime_Pareto_{_slug(job)}_{_slug(staff)}_{_slug(date_filter)}.json")
+    name = "Production_Report_Detailed" if detailed else "Production_Report"
+    ext = {"csv": ".csv.gz" if compress else ".csv", "pdf": ".pdf", "json": ".json"}[fmt]
+    return os.path.join(out_dir, f"{name}_{_slug(job)}_{_slug(staff)}_{_slug(date_filter)}{ext}")
+
+
+def run_report(fmt: str, file_path: str, job: str = "", staff: str = "", date_filter: str = "",
+               detailed: bool = False, compress: bool = False) -> tuple:
+    """Write one report; returns (file_path, records written). Runs in worker processes."""
+    if fmt == "csv":
+        from reports.csv_export import export_csv
+        from storage.backends import get_backend, date_range
+
+        backend = get_backend()
+        dates = date_range(date_filter)
+        if not backend.count_shifts(job, staff, dates):
+            return file_path, 0
+        shifts = backend.iter_shifts(job, staff, dates, with_hours=detailed)
+        return file_path, export_csv(file_path, shifts, backend.job_targets(), detailed, compress)
+    if fmt == "pdf":
+        from reports.pdf_report import write_log_report
+        return file_path, write_log_report(file_path, job, staff, date_filter)
+    if fmt == "json":
+        from reports.json_report import write_json_report
+        return file_path, write_json_report(file_path, job, staff, date_filter)
+    if fmt == "summary":
+        from reports.json_report import write_dashboard_json
+        return file_path, write_dashboard_json(file_path)
+    if fmt == "downtime":
+        from reports.json_report import write_downtime_json
+        return file_path, write_downtime_json(file_path, job, staff, date_filter)
+    raise ValueError(f"Unknown report format: {fmt!r}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m reports",
+        description="Write Production Logs reports without the GUI.",
+    )
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["csv"],
+                        help="report formats to write (default: csv)")
+    parser.add_argument("--job", action="append", default=[], metavar="JOB_NUMBER",
+                        help="job filter; repeat for several jobs")
+    parser.add_argument("--all-jobs", action="store_true",
+                        help="write one report per job")
+    parser.add_argument("--staff", action="append", default=[], metavar="NAME",
+                        help="staff filter; repeat for several staff members")
+    parser.add_argument("--date", action="append", default=[], metavar="YYYY[-MM[-DD]]",
+                        help="date filter; repeat for several periods")
+    parser.add_argument("--detailed", action="store_true",
+                        help="CSV: one row per hourly output")
+    parser.add_argument("--gzip", action="store_true", help="CSV: gzip-compress the output")
+    parser.add_argument("--out", default="exports", help="output directory (default: exports)")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="run N reports in parallel worker processes")
+    parser.add_argument("--instrument", nargs="?", const="exports/diagnostics/metrics.json", metavar="FILE",
+                        help="record timings and write them to FILE "
+                             "(default: exports/diagnostics/metrics.json; in-process reports only)")
+    return parser
+
+
+def plan_reports(args) -> list:
+    """Expand the filters into (format, path, job, staff, date, detailed, gzip) tasks."""
+    jobs = list(args.job)
+    if args.all_jobs:
+        from storage.backends import get_backend
+        jobs += [j.job_number for j in get_backend().list_jobs() if j.job_number not in jobs]
+
+    tasks = []
+    for fmt in args.format:
+        if fmt == "summary":
+            tasks.append((fmt, report_path(args.out, fmt, "", "", ""), "", "", "", False, False))
+            continue
+        for job, staff, date_filter in itertools.product(jobs or [""], args.staff or [""], args.date or [""]):
+            path = report_path(args.out, fmt, job, staff, date_filter, args.detailed, args.gzip)
+            tasks.append((fmt, path, job, staff, date_filter, args.detailed, args.gzip))
+    return tasks
+
+
+def prepare_storage() -> None:
+    """Run one-off storage work (legacy migration, progress and rollup rebuilds) once,
+    before worker processes start, so they do not race to do it."""
+    from storage import write_queue
+    from storage.backends import get_backend
+
+    backend = get_backend()
+    backend.all_progress()
+    backend.rollup_cells()
+    write_queue.flush()
+    for path, error in write_queue.drain_errors():
+        print(f"{path}: could not be saved ({error})", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.instrument:
+        from diagnostics import metrics
+        metrics.enable(args.instrument)
+    prepare_storage()
+    tasks = plan_reports(args)
+    failures = 0
+
+    def report(path, count):
+        if count:
+            print(f"{path}: {count} records")
+        else:
+            print(f"{path}: no matching data, skipped")
+
+    if args.jobs <= 1:
+        for task in tasks:
+            try:
+                report(*run_report(*task))
+            except Exception as e:
+                failures += 1
+                print(f"{task[1]}: FAILED ({e})", file=sys.stderr)
+        return 1 if failures else 0
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(run_report, *task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                report(*future.result())
+            except Exception as e:
+                failures += 1
+                print(f"{futures[future][1]}: FAILED ({e})", file=sys.stderr)
+    return 1 if failures else 0
@@ -0,0 +1,124 @@
+# ==============================================================
+#  FILE: columnar.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Columnar (NumPy) view of the shift rollup cells for analytics.
+#     Job and staff names become integer category codes and dates
+#     become day ordinals, so output totals by job, staff, day,
+#     ISO year-week, month and year are vectorized group-bys
+#     (np.bincount) over one row per distinct (date, job, staff,
+#     shift type). The view is cached until the shifts change.
+# ==============================================================
+
+import threading
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+
+from domain.models import RollupCell
+from storage.backends import get_backend
+from storage.rollup import period_key
+
+NO_DATE = -1
+
+_cache_lock = threading.Lock()
+_cache = (None, None)    # (shifts_version, ShiftColumns)
+
+
+def _day_ordinal(shift_date: str) -> int:
+    try:
+        return date.fromisoformat(shift_date).toordinal()
+    except (TypeError, ValueError):
+        return NO_DATE
+
+
+class ShiftColumns:
+    """One array per field, one element per rollup cell."""
+
+    __slots__ = ("jobs", "staff", "job_code", "staff_code", "day", "output")
+
+    def __init__(self, jobs, staff, job_code, staff_code, day, output):
+        self.jobs = jobs              # job_number per code, in first-seen order
+        self.staff = staff            # staff_name per code, in first-seen order
+        self.job_code = job_code      # int32
+        self.staff_code = staff_code  # int32
+        self.day = day                # int32 date ordinal, NO_DATE if unparsable
+        self.output = output          # int64 output
+
+    @classmethod
+    def from_cells(cls, cells: Iterable[RollupCell]) -> "ShiftColumns":
+        job_codes, staff_codes, day_codes = {}, {}, {}
+        job_col, staff_col, day_col, output_col = [], [], [], []
+        for c in cells:
+            job_col.append(job_codes.setdefault(c.job_number, len(job_codes)))
+            staff_col.append(staff_codes.setdefault(c.staff_name, len(staff_codes)))
+            day = day_codes.get(c.shift_date)
+            if day is None:
+                day = day_codes[c.shift_date] = _day_ordinal(c.shift_date)
+            day_col.append(day)
+            output_col.append(c.output)
+        return cls(
+            list(job_codes), list(staff_codes),
+            np.array(job_col, dtype=np.int32),
+            np.array(staff_col, dtype=np.int32),
+            np.array(day_col, dtype=np.int32),
+            np.array(output_col, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.output)
+
+    # ------------------- GROUP-BYS -------------------
+    def _sum_by(self, codes, size: int) -> np.ndarray:
+        return np.bincount(codes, weights=self.output, minlength=size).astype(np.int64)
+
+    def job_totals(self) -> dict:
+        return dict(zip(self.jobs, self._sum_by(self.job_code, len(self.jobs)).tolist()))
+
+    def staff_totals(self) -> dict:
+        return dict(zip(self.staff, self._sum_by(self.staff_code, len(self.staff)).tolist()))
+
+    def _day_totals(self) -> tuple:
+        """(distinct day ordinals, output per day), dated shifts only."""
+        dated = self.day != NO_DATE
+        days, inverse = np.unique(self.day[dated], return_inverse=True)
+        totals = np.bincount(inverse, weights=self.output[dated], minlength=len(days))
+        return days.tolist(), totals.astype(np.int64).tolist()
+
+    def daily_totals(self) -> dict:
+        days, totals = self._day_totals()
+        return {date.fromordinal(d).isoformat(): t for d, t in zip(days, totals)}
+
+    def period_totals(self, period: str) -> dict:
+        """Output per day, week (YYYY-Www), month (YYYY-MM) or year (YYYY)."""
+        # Python only touches distinct days, never individual cells
+        result = {}
+        for d, t in zip(*self._day_totals()):
+            k = period_key(date.fromordinal(d).isoformat(), period)
+            result[k] = result.get(k, 0) + t
+        return result
+
+    def weekly_totals(self) -> dict:
+        return self.period_totals("week")
+
+    def monthly_totals(self) -> dict:
+        return self.period_totals("month")
+
+    def yearly_totals(self) -> dict:
+        return self.period_totals("year")
+
+
+def shift_columns(backend=None) -> ShiftColumns:
+    """Return the columnar view of the rollup cells, rebuilt only when shifts change."""
+    global _cache
+    backend = backend or get_backend()
+    version = backend.shifts_version()
+    with _cache_lock:
+        if _cache[0] == version:
+            return _cache[1]
+    columns = ShiftColumns.from_cells(backend.rollup_cells())
+    with _cache_lock:
+        _cache = (version, columns)
+    return columns
+
@@ -0,0 +1,73 @@
+# ==============================================================
+#  FILE: csv_export.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Streams shift records from storage into a CSV file in chunks,
+#     optionally gzip-compressed and optionally with one row per
+#     hourly output. Runs on any thread; the file only appears
+#     under its final name once it is complete.
+# ==============================================================
+
+import csv
+import gzip
+import os
+from typing import Callable, Iterable, Optional
+
+from diagnostics import metrics
+from domain.models import ShiftRecord
+from reports.logs import LOG_COLUMNS, DETAIL_COLUMNS, ExportCancelled, log_row, detail_rows
+
+# Rows buffered before each write (and progress report).
+CHUNK_ROWS = 1000
+
+
+@metrics.timed("export.csv", io=metrics.wrote_first_arg)
+def export_csv(file_path: str, shifts: Iterable[ShiftRecord], job_targets: dict,
+               detailed: bool = False, compress: Optional[bool] = None,
+               progress: Optional[Callable[[int], None]] = None,
+               should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """Write shifts to file_path and return the number of shifts exported.
+
+    compress defaults to file_path ending in .gz. progress(shifts_done) is
+    called after every chunk; if should_stop() turns true the partial file
+    is removed and ExportCancelled is raised.
+    """
+    if compress is None:
+        compress = file_path.endswith(".gz")
+    columns = DETAIL_COLUMNS if detailed else LOG_COLUMNS
+
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = file_path + ".part"
+    opener = gzip.open if compress else open
+
+    done = 0
+    try:
+        with opener(tmp_path, "wt", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([c.upper() for c in columns])
+            chunk = []
+            for shift in shifts:
+                if detailed:
+                    chunk.extend(detail_rows(shift))
+                else:
+                    chunk.append(log_row(shift, job_targets.get(shift.job_number, 0))[0])
+                done += 1
+                if len(chunk) >= CHUNK_ROWS:
+                    writer.writerows(chunk)
+                    chunk = []
+                    if progress:
+                        progress(done)
+                    if should_stop and should_stop():
+                        raise ExportCancelled()
+            writer.writerows(chunk)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress:
+        progress(done)
+    return done
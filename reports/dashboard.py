@@ -0,0 +1,37 @@
+# ==============================================================
+#  FILE: dashboard.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Dashboard aggregates (output by job, staff and ISO year-week,
+#     the downtime Pareto and the summary statistics), shared by the
+#     Dashboard tab and the command line. Nothing here imports tkinter.
+# ==============================================================
+
+from reports.columnar import shift_columns
+from reports.downtime import overall_pareto
+from storage.backends import get_backend
+
+
+def collect_dashboard() -> tuple:
+    """Return (job_totals, staff_totals, weekly_totals, job_progress, downtime_pareto).
+
+    Totals come from the cached columnar view of the rollup cells;
+    weeks are keyed YYYY-Www.
+    """
+    backend = get_backend()
+    columns = shift_columns(backend)
+    progress = backend.all_progress()
+    downtime = overall_pareto(backend)
+    return columns.job_totals(), columns.staff_totals(), columns.weekly_totals(), progress, downtime
+
+
+def summary_stats(progress: dict, staff_totals: dict) -> dict:
+    """Headline figures: job count, total output, average progress, top performer."""
+    targeted = [p.percent for p in progress.values() if p.target]
+    top = max(staff_totals.items(), key=lambda x: x[1]) if staff_totals else None
+    return {
+        "total_jobs": len(progress),
+        "total_output": sum(p.produced for p in progress.values()),
+        "avg_progress": round(sum(targeted) / len(targeted), 1) if targeted else 0,
+        "top_performer": top,
+    }
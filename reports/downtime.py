@@ -0,0 +1,94 @@
+# ==============================================================
+#  FILE: downtime.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Downtime analytics over the reasons recorded on under-target
+#     hours. Lost units (target - quantity) are read from the
+#     pre-aggregated downtime counters, never from the hourly rows,
+#     and ranked into a Pareto table (largest reason first, with a
+#     cumulative share). Totals per job, staff and period come from
+#     the same cells. Nothing here imports tkinter.
+# ==============================================================
+
+import threading
+
+from storage.backends import get_backend, date_range
+from storage.rollup import period_key
+
+# Dimensions lost units can be grouped by, besides the reason.
+DIMENSIONS = ("reason", "job", "staff", "day", "week", "month", "year")
+
+_cache_lock = threading.Lock()
+_cache = (None, None)    # (shifts_version, Pareto rows over all downtime)
+
+
+def downtime_cells(job: str = "", staff: str = "", date_filter: str = "") -> list:
+    """DowntimeCells matching the filters."""
+    cells = get_backend().downtime_cells(date_range(date_filter))
+    return [
+        c for c in cells
+        if (not job or c.job_number == job) and (not staff or c.staff_name == staff)
+    ]
+
+
+def lost_by(cells, dimension: str) -> dict:
+    """Lost units per reason, job, staff or period (day/week/month/year)."""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown downtime dimension: {dimension!r}")
+    totals = {}
+    for c in cells:
+        if dimension == "reason":
+            key = c.reason
+        elif dimension == "job":
+            key = c.job_number
+        elif dimension == "staff":
+            key = c.staff_name
+        else:
+            try:
+                key = period_key(c.shift_date, dimension)
+            except ValueError:
+                continue
+        totals[key] = totals.get(key, 0) + c.lost_units
+    return totals
+
+
+def pareto(cells) -> list:
+    """Rows of (reason, lost units, hours, cumulative %), largest reason first."""
+    by_reason = {}
+    for c in cells:
+        lost, hours = by_reason.get(c.reason, (0, 0))
+        by_reason[c.reason] = (lost + c.lost_units, hours + c.hours)
+    ranked = sorted(by_reason.items(), key=lambda item: (-item[1][0], item[0]))
+    total = sum(lost for _reason, (lost, _hours) in ranked)
+
+    rows, running = [], 0
+    for reason, (lost, hours) in ranked:
+        running += lost
+        rows.append((reason, lost, hours, round(running / total * 100, 1) if total else 0))
+    return rows
+
+
+def overall_pareto(backend=None) -> list:
+    """Pareto over all recorded downtime, recomputed only when shifts change."""
+    global _cache
+    backend = backend or get_backend()
+    version = backend.shifts_version()
+    with _cache_lock:
+        if _cache[0] == version:
+            return _cache[1]
+    rows = pareto(backend.downtime_cells())
+    with _cache_lock:
+        _cache = (version, rows)
+    return rows
+
+
+def collect_downtime(job: str = "", staff: str = "", date_filter: str = "") -> dict:
+    """Pareto table plus lost units by job, staff and month for the filters."""
+    cells = downtime_cells(job, staff, date_filter)
+    return {
+        "pareto": pareto(cells),
+        "total_lost": sum(c.lost_units for c in cells),
+        "by_job": lost_by(cells, "job"),
+        "by_staff": lost_by(cells, "staff"),
+        "by_month": dict(sorted(lost_by(cells, "month").items())),
+    }
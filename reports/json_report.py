@@ -0,0 +1,93 @@
+# ==============================================================
+#  FILE: json_report.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     JSON versions of the Production Logs report, the dashboard
+#     summary and the downtime Pareto, for scripts and nightly jobs.
+# ==============================================================
+
+import json
+import os
+
+from diagnostics import metrics
+from domain.models import now_iso
+from reports.dashboard import collect_dashboard, summary_stats
+from reports.downtime import collect_downtime
+from reports.logs import LOG_COLUMNS, collect_log_report
+
+
+def _write(file_path: str, document: dict) -> None:
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = file_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, file_path)
+
+
+@metrics.timed("export.json.write_json_report", io=metrics.wrote_first_arg)
+def write_json_report(file_path: str, filter_job: str = "", filter_staff: str = "",
+                      filter_date: str = "") -> int:
+    """Write the logs report for a filter as JSON; returns the number of shifts.
+
+    Nothing is written when no shift matches.
+    """
+    report = collect_log_report(filter_job, filter_staff, filter_date)
+    if not report["rows"]:
+        return 0
+    progress = report["progress"]
+    _write(file_path, {
+        "generated": now_iso(),
+        "filters": {"job": filter_job, "staff": filter_staff, "date": filter_date},
+        "total_shifts": len(report["rows"]),
+        "total_output": report["total_output"],
+        "job_progress": {"target": progress[0], "produced": progress[1]} if progress else None,
+        "shifts": [dict(zip(LOG_COLUMNS, values)) for _key, values, _tag in report["rows"]],
+    })
+    return len(report["rows"])
+
+
+@metrics.timed("export.json.write_dashboard_json", io=metrics.wrote_first_arg)
+def write_dashboard_json(file_path: str) -> int:
+    """Write the dashboard totals and summary as JSON; returns the number of jobs."""
+    job_totals, staff_totals, weekly_totals, progress, downtime = collect_dashboard()
+    stats = summary_stats(progress, staff_totals)
+    top = stats["top_performer"]
+    _write(file_path, {
+        "generated": now_iso(),
+        "summary": dict(stats, top_performer={"name": top[0], "output": top[1]} if top else None),
+        "output_by_job": job_totals,
+        "output_by_staff": staff_totals,
+        "output_by_week": dict(sorted(weekly_totals.items())),
+        "job_progress": {job: p.to_dict() for job, p in progress.items()},
+        "downtime_pareto": [_pareto_row(row) for row in downtime],
+    })
+    return len(progress)
+
+
+def _pareto_row(row: tuple) -> dict:
+    reason, lost, hours, cumulative = row
+    return {"reason": reason, "lost_units": lost, "hours": hours, "cumulative_percent": cumulative}
+
+
+@metrics.timed("export.json.write_downtime_json", io=metrics.wrote_first_arg)
+def write_downtime_json(file_path: str, filter_job: str = "", filter_staff: str = "",
+                        filter_date: str = "") -> int:
+    """Write the downtime Pareto for a filter as JSON; returns the number of reasons.
+
+    Nothing is written when no under-target hour matches.
+    """
+    report = collect_downtime(filter_job, filter_staff, filter_date)
+    if not report["pareto"]:
+        return 0
+    _write(file_path, {
+        "generated": now_iso(),
+        "filters": {"job": filter_job, "staff": filter_staff, "date": filter_date},
+        "total_lost_units": report["total_lost"],
+        "pareto": [_pareto_row(row) for row in report["pareto"]],
+        "lost_by_job": report["by_job"],
+        "lost_by_staff": report["by_staff"],
+        "lost_by_month": report["by_month"],
+    })
+    return len(report["pareto"])
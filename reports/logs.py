@@ -0,0 +1,87 @@
+# ==============================================================
+#  FILE: logs.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Rows of the Production Logs report, shared by the Logs tab,
+#     the exporters and the command line. Nothing here imports
+#     tkinter.
+# ==============================================================
+
+from typing import Callable, Optional
+
+from domain.models import ShiftRecord
+from storage.backends import get_backend, date_range
+
+LOG_COLUMNS = ("date", "job", "staff", "shift", "output", "target", "progress", "status")
+
+DETAIL_COLUMNS = (
+    "date", "job", "staff", "shift", "shift_id",
+    "hour", "quantity", "target", "achievement", "comment",
+)
+
+
+class ExportCancelled(Exception):
+    """Raised when the user cancels an export while it is being written."""
+
+
+def log_row(shift: ShiftRecord, target: int) -> tuple:
+    """Return (values, tag) for one shift in the logs report."""
+    total = shift.total_output
+    pct = round((total / target) * 100, 1) if target else 0
+    tag = "low" if pct < 90 else "mid" if pct < 100 else "ok"
+    values = (
+        shift.shift_date, shift.job_number, shift.staff_name,
+        shift.shift_type, total, target,
+        f"{pct}%", "Completed" if pct >= 100 else "Ongoing",
+    )
+    return values, tag
+
+
+def detail_rows(shift: ShiftRecord):
+    """Yield one row per hourly output of a shift."""
+    for h in shift.hourly_outputs:
+        pct = round((h.quantity / h.target) * 100, 1) if h.target else 0
+        yield (
+            shift.shift_date, shift.job_number, shift.staff_name, shift.shift_type,
+            shift.shift_id, h.hour_label, h.quantity, h.target, f"{pct}%", h.comment,
+        )
+
+
+def collect_log_report(filter_job: str = "", filter_staff: str = "", filter_date: str = "",
+                       check: Optional[Callable[[], None]] = None) -> dict:
+    """Build the logs report for a job / staff / date filter.
+
+    Returns {"rows": [(key, values, tag)], "total_output", "progress"}, where
+    progress is (target, produced) for a filtered job with a target, else
+    None. check() is called every 500 rows so a caller can abort early.
+    """
+    backend = get_backend()
+    job_targets = backend.job_targets()
+
+    # --- Job progress (reads the maintained per-job totals) ---
+    progress = None
+    if filter_job:
+        job_entry = backend.get_job(filter_job)
+        if job_entry and job_entry.stocks:
+            job_progress = backend.job_progress(filter_job)
+            progress = (job_entry.target, job_progress.produced if job_progress else 0)
+
+    # --- Flexible Date Filter (YYYY, YYYY-MM or YYYY-MM-DD) ---
+    shifts = backend.iter_shifts(filter_job, filter_staff, date_range(filter_date), with_hours=False)
+
+    rows = []
+    seen = {}
+    total_output = 0
+    for shift in shifts:
+        if check is not None and len(rows) % 500 == 0:
+            check()
+        values, tag = log_row(shift, job_targets.get(shift.job_number, 0))
+
+        # shift_id is not unique on its own; number repeats to key the row
+        n = seen[shift.shift_id] = seen.get(shift.shift_id, 0) + 1
+        key = shift.shift_id if n == 1 else f"{shift.shift_id}#{n}"
+
+        rows.append((key, values, tag))
+        total_output += shift.total_output
+
+    return {"rows": rows, "total_output": total_output, "progress": progress}
@@ -0,0 +1,251 @@
+# ==============================================================
+#  FILE: pdf_report.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     PDF report engine for the Production Logs report. Shifts are
+#     streamed from storage into row-chunked tables with a repeating
+#     header, using one cached stylesheet and TableStyle. Reports
+#     are built in a separate process (multiprocessing) so the UI
+#     stays responsive, and month-end packs build one PDF per job in
+#     parallel across cores.
+# ==============================================================
+
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Callable, Iterable, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from diagnostics import metrics
+from domain.models import ShiftRecord
+from reports.cli import _slug
+from reports.logs import LOG_COLUMNS, ExportCancelled, log_row
+from storage import write_queue
+from storage.backends import get_backend, date_range
+
+# Shift rows per table; each chunk repeats the header row when it spans pages.
+CHUNK_ROWS = 200
+
+# Children are spawned rather than forked: the GUI process runs Tk and
+# background threads, which are not safe to fork.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+_styles = None
+_table_style = None
+
+
+# ------------------- CACHED STYLES -------------------
+def _get_styles():
+    global _styles
+    if _styles is None:
+        _styles = getSampleStyleSheet()
+    return _styles
+
+
+def _get_table_style() -> TableStyle:
+    global _table_style
+    if _table_style is None:
+        _table_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
+        ])
+    return _table_style
+
+
+class _ChunkTable(Table):
+    """Table for one row chunk; remembers how many rows are done once it is drawn."""
+
+    chunk_end = 0
+
+    def split(self, availWidth, availHeight):
+        parts = super().split(availWidth, availHeight)
+        for part in parts:
+            part.chunk_end = self.chunk_end
+        return parts
+
+
+class _ReportDoc(SimpleDocTemplate):
+    """Document template that reports progress as table chunks are laid out."""
+
+    def __init__(self, file_path, total_rows, progress=None, should_stop=None, **kw):
+        super().__init__(file_path, **kw)
+        self.total_rows = total_rows
+        self.progress = progress
+        self.should_stop = should_stop
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, _ChunkTable):
+            if self.should_stop and self.should_stop():
+                raise ExportCancelled()
+            if self.progress:
+                self.progress(flowable.chunk_end, self.total_rows)
+
+
+# ------------------- BUILD ONE REPORT -------------------
+@metrics.timed("export.pdf.build_report", io=metrics.wrote_first_arg)
+def build_report(file_path: str, title: str, info: str,
+                 shifts: Iterable[ShiftRecord], job_targets: dict,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """Write a logs report for shifts to file_path; returns the number of shifts.
+
+    progress(done, total) is called as the tables are laid out; if
+    should_stop() turns true, ExportCancelled is raised and no file is left.
+    """
+    styles = _get_styles()
+    header = [c.upper() for c in LOG_COLUMNS]
+
+    elements = [Paragraph(title, styles["Title"]), Spacer(1, 12),
+                Paragraph(info, styles["Normal"]), Spacer(1, 12)]
+    chunk, count, total_output = [], 0, 0
+    for shift in shifts:
+        chunk.append(log_row(shift, job_targets.get(shift.job_number, 0))[0])
+        count += 1
+        total_output += shift.total_output
+        if len(chunk) >= CHUNK_ROWS:
+            elements.append(_chunk_table(header, chunk, count))
+            chunk = []
+    if chunk:
+        elements.append(_chunk_table(header, chunk, count))
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph(
+        f"Total Shifts: {count} | Total Output: {total_output} units", styles["Italic"]
+    ))
+
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = file_path + ".part"
+    try:
+        _ReportDoc(tmp_path, count, progress, should_stop, pagesize=A4).build(elements)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def _chunk_table(header: list, rows: list, chunk_end: int) -> _ChunkTable:
+    table = _ChunkTable([header] + rows, repeatRows=1)
+    table.setStyle(_get_table_style())
+    table.chunk_end = chunk_end
+    return table
+
+
+@metrics.timed("export.pdf.write_log_report", io=metrics.wrote_first_arg)
+def write_log_report(file_path: str, filter_job: str = "", filter_staff: str = "",
+                     filter_date: str = "", progress=None, should_stop=None) -> int:
+    """Build the logs report for the given filters from storage.
+
+    Returns the number of shifts written; nothing is written when no shift
+    matches.
+    """
+    backend = get_backend()
+    dates = date_range(filter_date)
+    if not backend.count_shifts(filter_job, filter_staff, dates):
+        return 0
+    info = (
+        f"Generated on: {date.today()}<br/>"
+        f"Job Filter: {filter_job or 'All'} | "
+        f"Staff: {filter_staff or 'All'} | "
+        f"Date: {filter_date or 'All'}"
+    )
+    return build_report(
+        file_path, "📊 Production Logs Report", info,
+        backend.iter_shifts(filter_job, filter_staff, dates, with_hours=False), backend.job_targets(),
+        progress, should_stop,
+    )
+
+
+# ------------------- SEPARATE PROCESS -------------------
+def _report_process(messages, file_path, filter_job, filter_staff, filter_date) -> None:
+    """Child process entry point: build one report and post its progress."""
+    try:
+        count = write_log_report(
+            file_path, filter_job, filter_staff, filter_date,
+            progress=lambda done, total: messages.put(("progress", done, total)),
+        )
+        messages.put(("done", count))
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+
+
+@metrics.timed("export.pdf.export_pdf_in_process", io=metrics.wrote_first_arg)
+def export_pdf_in_process(file_path: str, filter_job: str = "", filter_staff: str = "",
+                          filter_date: str = "", progress=None, should_stop=None) -> int:
+    """Build a logs report in a child process and wait for it.
+
+    Meant to be called from a worker thread: progress(done, total) relays
+    the child's progress, and should_stop() terminates the child.
+    """
+    write_queue.flush()   # the child reads the files from disk
+    messages = _MP_CONTEXT.Queue()
+    proc = _MP_CONTEXT.Process(
+        target=_report_process, name="pdf-report",
+        args=(messages, file_path, filter_job, filter_staff, filter_date),
+    )
+    proc.start()
+    try:
+        while True:
+            if should_stop and should_stop():
+                raise ExportCancelled()
+            try:
+                message = messages.get(timeout=0.1)
+            except queue.Empty:
+                if not proc.is_alive() and messages.empty():
+                    raise RuntimeError(f"PDF process exited with code {proc.exitcode}")
+                continue
+            if message[0] == "progress":
+                if progress:
+                    progress(message[1], message[2])
+            elif message[0] == "done":
+                return message[1]
+            else:
+                raise RuntimeError(message[1])
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+        if os.path.exists(file_path + ".part"):   # left behind by a terminated child
+            os.remove(file_path + ".part")
+
+
+# ------------------- MONTH-END JOB PACKS -------------------
+@metrics.timed("export.pdf.write_job_pack")
+def write_job_pack(out_dir: str, job_numbers: list, filter_date: str = "",
+                   workers: Optional[int] = None, progress=None, should_stop=None) -> list:
+    """Write one PDF per job in parallel processes; returns the files written.
+
+    Jobs without shifts in the date range are skipped. File names are
+    Job_<job number>.pdf, with the job number sanitized as in the CLI.
+    """
+    write_queue.flush()
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as pool:
+        futures = {}
+        for job in job_numbers:
+            path = os.path.join(out_dir, f"Job_{_slug(job)}.pdf")
+            futures[pool.submit(write_log_report, path, job, "", filter_date)] = path
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    written.append(futures[future])
+                if progress:
+                    progress(done, len(futures))
+                if should_stop and should_stop():
+                    raise ExportCancelled()
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    return sorted(written)
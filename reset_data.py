@@ -1,16 +1,9 @@
 # reset_data.py
-import json
 from tkinter import messagebox
-
-FILES_TO_CLEAR = [
-    "data/jobs.json",
-    "data/staff.json",
-    "data/shift_output.json",
-    "data/production.json"
-]
+from storage.backends import get_backend
 
 def reset_all_data():
-    """Clear all JSON files after user confirms."""
+    """Clear all stored data after user confirms."""
     
     confirm = messagebox.askyesno(
         "Confirm Reset",
@@ -28,9 +21,7 @@ def reset_all_data():
         return False   # User cancelled
 
     try:
-        for file_path in FILES_TO_CLEAR:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump([], f, indent=2)
+        get_backend().reset()
 
         messagebox.showinfo("Reset Complete", "All data files have been cleared successfully.")
         return True
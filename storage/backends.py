@@ -0,0 +1,327 @@
+# ==============================================================
+#  FILE: backends.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Pluggable storage backends used by the UI tabs. The JSON
+#     backend works on the cached data files; the SQLite backend
+#     runs the same operations as indexed SQL. The active backend
+#     is chosen by storage.config.STORAGE_BACKEND.
+# ==============================================================
+
+import shutil
+import threading
+from dataclasses import replace
+from typing import Optional
+
+from domain.models import DowntimeCell, Job, JobProgress, Staff, ShiftRecord, now_iso
+from storage import config
+from storage.partitions import ShiftPartitions
+from storage.progress import ProgressTable
+from storage.rollup import RollupTable
+from storage.repository import (
+    JOBS_FILE, STAFF_FILE, SHIFTS_FILE, SHIFTS_DIR, PRODUCTION_FILE, ROLLUP_FILE, LIVE_DIR,
+    DRAFTS_FILE,
+    load_collection, save_collection, append_record
+)
+
+_backend = None
+_backend_lock = threading.Lock()
+_reset_hooks = []        # called after every backend reset
+
+
+# ------------------- DATE FILTER -------------------
+def date_range(filter_date: str) -> Optional[tuple]:
+    """Translate a YYYY, YYYY-MM or YYYY-MM-DD filter into inclusive bounds.
+
+    Returns None for an empty filter (no restriction).
+    """
+    filter_date = (filter_date or "").strip()
+    if not filter_date:
+        return None
+    if len(filter_date) in (4, 7):       # YYYY or YYYY-MM
+        return filter_date, filter_date + "~"
+    return filter_date, filter_date       # Full date YYYY-MM-DD
+
+
+def in_range(shift_date: str, bounds: Optional[tuple]) -> bool:
+    return bounds is None or bounds[0] <= shift_date <= bounds[1]
+
+
+# ------------------- SHIFT DRAFTS -------------------
+class ShiftDrafts:
+    """Shifts still being filled in (e.g. from the live feed), kept in
+    DRAFTS_FILE apart from the stored history until they are saved.
+
+    Each draft is {"shift": ShiftRecord dict, "live_hours": [hour labels
+    filled from the feed]}. Saves go through the write-behind queue, so
+    frequent updates collapse into few writes. Shared by both backends.
+    """
+
+    def save_draft(self, shift: ShiftRecord, live_hours=()) -> None:
+        key = (shift.shift_id, shift.staff_name)
+        drafts = [d for d in load_collection(DRAFTS_FILE) if _draft_key(d) != key]
+        drafts.append({"shift": shift.to_dict(), "live_hours": sorted(live_hours)})
+        save_collection(DRAFTS_FILE, drafts)
+
+    def get_draft(self, shift_id: str, staff_name: str) -> Optional[tuple]:
+        """Return (ShiftRecord, set of live hour labels) or None."""
+        for d in load_collection(DRAFTS_FILE):
+            if _draft_key(d) == (shift_id, staff_name):
+                try:
+                    return ShiftRecord.from_dict(d["shift"]), set(d.get("live_hours") or ())
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    return None
+        return None
+
+    def discard_draft(self, shift_id: str, staff_name: str) -> None:
+        drafts = load_collection(DRAFTS_FILE)
+        kept = [d for d in drafts if _draft_key(d) != (shift_id, staff_name)]
+        if len(kept) != len(drafts):
+            save_collection(DRAFTS_FILE, kept)
+
+
+def _draft_key(draft) -> tuple:
+    shift = draft.get("shift") if isinstance(draft, dict) else None
+    if not isinstance(shift, dict):
+        return None, None
+    return shift.get("shift_id"), shift.get("staff_name")
+
+
+# ------------------- JSON BACKEND -------------------
+class JsonBackend(ShiftDrafts):
+    """Backend over the data/*.json files and the shared repository cache.
+
+    Shifts are stored in monthly partitions under SHIFTS_DIR; a legacy
+    shift_output.json history is split into partitions on first use.
+    Per-job progress totals are maintained in PRODUCTION_FILE and
+    per-day rollup cells in ROLLUP_FILE.
+    """
+
+    name = "json"
+
+    def __init__(self):
+        self.shifts = ShiftPartitions(SHIFTS_DIR, legacy_file=SHIFTS_FILE)
+        self._job_index = (None, 0, {})   # (cached job list, its length, job_number -> Job)
+        self.progress = ProgressTable(
+            PRODUCTION_FILE, self.shifts.count,
+            lambda: (self.shifts.iter(), self.job_targets()),
+        )
+        self.rollup = RollupTable(ROLLUP_FILE, self.shifts.count, self.shifts.iter)
+
+    # ---- Jobs ----
+    def list_jobs(self) -> list:
+        return load_collection(JOBS_FILE, Job)
+
+    def _jobs_by_number(self) -> dict:
+        """job_number -> Job, rebuilt only when the cached job list changes.
+
+        The list is replaced on saves and grows in place on appends.
+        """
+        jobs = self.list_jobs()
+        if self._job_index[0] is not jobs or self._job_index[1] != len(jobs):
+            self._job_index = (jobs, len(jobs), {j.job_number: j for j in jobs})
+        return self._job_index[2]
+
+    def get_job(self, job_number: str) -> Optional[Job]:
+        return self._jobs_by_number().get(job_number)
+
+    def add_job(self, job: Job) -> None:
+        append_record(JOBS_FILE, job)
+        self.progress.set_target(job.job_number, job.target)
+        self._sync_job_status(self.progress.get(job.job_number))
+
+    def delete_job(self, job_number: str) -> None:
+        jobs = [j for j in self.list_jobs() if j.job_number != job_number]
+        save_collection(JOBS_FILE, jobs)   # its progress row stays; see all_progress()
+
+    def set_job_status(self, job_number: str, status: str) -> None:
+        jobs = [
+            replace(j, status=status, date_updated=now_iso()) if j.job_number == job_number else j
+            for j in self.list_jobs()
+        ]
+        save_collection(JOBS_FILE, jobs)
+
+    def job_targets(self) -> dict:
+        return {j.job_number: j.target for j in self.list_jobs() if j.stocks}
+
+    # ---- Staff ----
+    def list_staff(self) -> list:
+        return load_collection(STAFF_FILE, Staff)
+
+    def add_staff(self, staff: Staff) -> None:
+        append_record(STAFF_FILE, staff)
+
+    def set_staff_status(self, staff_id: str, status: str) -> None:
+        db = [
+            replace(s, status=status) if s.staff_id == staff_id else s
+            for s in self.list_staff()
+        ]
+        save_collection(STAFF_FILE, db)
+
+    def delete_staff(self, staff_id: str) -> None:
+        db = [s for s in self.list_staff() if s.staff_id != staff_id]
+        save_collection(STAFF_FILE, db)
+
+    # ---- Shifts ----
+    def add_shift(self, shift: ShiftRecord) -> None:
+        self.add_shifts([shift])
+
+    def add_shifts(self, shifts: list) -> None:
+        """Store many shifts with one write per partition and one save per table."""
+        if not shifts:
+            return
+        self.shifts.extend(shifts)
+        self.rollup.record_many(shifts)
+        targets = {}
+        for shift in shifts:
+            if shift.job_number not in targets:
+                job = self.get_job(shift.job_number)
+                targets[shift.job_number] = job.target if job else 0
+        for progress in self.progress.record_many(shifts, targets):
+            self._sync_job_status(progress)
+
+    def iter_shifts(self, job_number: str = "", staff_name: str = "",
+                    dates: Optional[tuple] = None, with_hours: bool = True):
+        """Stream shifts matching the filters, one record at a time.
+
+        Filtered queries go through the shift indexes and only read the
+        matching lines; an unfiltered query streams every partition.
+        JSON records always carry their hourly rows.
+        """
+        if job_number or staff_name or dates is not None:
+            locations = self.shifts.index.lookup(job_number, staff_name, dates)
+            yield from self.shifts.index.read(locations)
+            return
+        for s in self.shifts.iter(dates):
+            if ((not job_number or s.job_number == job_number)
+                    and (not staff_name or s.staff_name == staff_name)
+                    and in_range(s.shift_date, dates)):
+                yield s
+
+    def query_shifts(self, job_number: str = "", staff_name: str = "",
+                     dates: Optional[tuple] = None) -> list:
+        return list(self.iter_shifts(job_number, staff_name, dates, with_hours=True))
+
+    def count_shifts(self, job_number: str = "", staff_name: str = "",
+                     dates: Optional[tuple] = None) -> int:
+        if job_number or staff_name or dates is not None:
+            return len(self.shifts.index.lookup(job_number, staff_name, dates))
+        return self.shifts.count()
+
+    def shifts_version(self) -> tuple:
+        """Cheap marker that changes whenever the stored shifts change."""
+        return self.shifts.version()
+
+    def job_output_total(self, job_number: str) -> int:
+        progress = self.job_progress(job_number)
+        return progress.produced if progress else 0
+
+    # ---- Job progress ----
+    # The table keeps the rows of deleted jobs, whose shifts are still
+    # stored, so its drift check holds; only existing jobs are returned.
+    def job_progress(self, job_number: str) -> Optional[JobProgress]:
+        if job_number not in self._jobs_by_number():
+            return None
+        return self.progress.get(job_number)
+
+    def all_progress(self) -> dict:
+        jobs = self._jobs_by_number()
+        return {job: p for job, p in self.progress.all().items() if job in jobs}
+
+    def _sync_job_status(self, progress: Optional[JobProgress]) -> None:
+        """Move a job to the status implied by its progress totals."""
+        if progress is None:
+            return
+        job = self.get_job(progress.job_number)
+        if job and job.status != progress.job_status:
+            self.set_job_status(job.job_number, progress.job_status)
+
+    def output_totals(self) -> tuple:
+        """Return (by_job, by_staff, by_day) output totals."""
+        by_job, by_staff, by_day = {}, {}, {}
+        for rec in self.shifts.iter():
+            job, staff, day, total = rec.job_number, rec.staff_name, rec.shift_date, rec.total_output
+            by_job[job] = by_job.get(job, 0) + total
+            by_staff[staff] = by_staff.get(staff, 0) + total
+            by_day[day] = by_day.get(day, 0) + total
+        return by_job, by_staff, by_day
+
+    def rollup_cells(self, dates: Optional[tuple] = None) -> list:
+        """Pre-aggregated (date, job, staff, shift_type) totals, optionally for a date range."""
+        return [c for c in self.rollup.all() if in_range(c.shift_date, dates)]
+
+    def downtime_cells(self, dates: Optional[tuple] = None) -> list:
+        """Lost units per (date, job, staff, reason), read from the rollup cells."""
+        merged = {}
+        for c in self.rollup_cells(dates):
+            for reason, (lost, hours) in c.downtime.items():
+                key = (c.shift_date, c.job_number, c.staff_name, reason)
+                cell = merged.get(key)
+                if cell is None:
+                    merged[key] = DowntimeCell(*key, lost_units=lost, hours=hours)
+                else:
+                    cell.lost_units += lost
+                    cell.hours += hours
+        return list(merged.values())
+
+    # ---- Maintenance ----
+    def reset(self) -> None:
+        for file_path in (JOBS_FILE, STAFF_FILE, SHIFTS_FILE, PRODUCTION_FILE, ROLLUP_FILE):
+            save_collection(file_path, [])
+        self.shifts.reset()
+        self.progress.reset()
+        self.rollup.reset()
+        _after_reset()
+
+
+# ------------------- SQLITE BACKEND -------------------
+class SqliteBackend(ShiftDrafts):
+    """Backend that delegates every operation to an SqliteStore."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str):
+        from storage.sqlite_store import SqliteStore
+
+        self.store = SqliteStore(db_path)
+        if not self.store.is_migrated():
+            source = JsonBackend()
+            self.store.migrate(source.list_jobs(), source.list_staff(), source.query_shifts())
+
+    def __getattr__(self, attr):
+        return getattr(self.store, attr)
+
+    def reset(self) -> None:
+        self.store.reset()
+        save_collection(PRODUCTION_FILE, [])
+        save_collection(ROLLUP_FILE, [])
+        _after_reset()
+
+
+# ------------------- RESET HOOKS -------------------
+def register_reset_hook(hook) -> None:
+    """Have hook() called after every backend reset, e.g. to drop in-memory state."""
+    if hook not in _reset_hooks:
+        _reset_hooks.append(hook)
+
+
+def _after_reset() -> None:
+    save_collection(DRAFTS_FILE, [])
+    for hook in list(_reset_hooks):
+        hook()
+    shutil.rmtree(LIVE_DIR, ignore_errors=True)   # live count journals
+
+
+# ------------------- SELECTION -------------------
+def get_backend():
+    """Return the process-wide backend selected in storage.config."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if config.STORAGE_BACKEND == "sqlite":
+                _backend = SqliteBackend(config.SQLITE_FILE)
+            elif config.STORAGE_BACKEND == "json":
+                _backend = JsonBackend()
+            else:
+                raise ValueError(f"Unknown storage backend: {config.STORAGE_BACKEND!r}")
+        return _backend
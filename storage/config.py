@@ -0,0 +1,14 @@
+# ==============================================================
+#  FILE: config.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Storage settings, read once from environment variables.
+#
+#     JPT_STORAGE_BACKEND   "json" (default) or "sqlite"
+#     JPT_SQLITE_FILE       database file for the sqlite backend
+# ==============================================================
+
+import os
+
+STORAGE_BACKEND = os.environ.get("JPT_STORAGE_BACKEND", "json").strip().lower()
+SQLITE_FILE = os.environ.get("JPT_SQLITE_FILE", "data/tracker.db")
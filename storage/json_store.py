@@ -5,6 +5,8 @@
 #  DESCRIPTION:
 #     This module provides utility functions to load and save JSON data
 #     to and from files, ensuring proper directory structure and error handling.
+#     List files can also grow through an append-only JSON-Lines journal
+#     that is periodically compacted back into the snapshot file.
 #  CREATED ON: 29th November 2025
 #  LAST UPDATED: 2nd November 2025
 # Status: Stable, but needs modification as codebase evolves.
@@ -12,7 +14,22 @@
 
 import json
 import os
-from typing import Any
+import threading
+from typing import Any, Iterator, Optional
+
+from diagnostics import metrics
+
+# Number of journal lines after which a background compaction is started.
+COMPACT_EVERY = 500
+
+# Read size used when streaming records out of a JSON array file.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_guard = threading.Lock()
+_locks = {}              # file_path -> threading.Lock
+_journal_lines = {}      # file_path -> known number of journal lines
+_compacting = set()      # file_paths with a compaction thread running
+_folds = {}              # file_path -> fold(records) applied when compacting
 
 
 def ensure_directory(path: str) -> None:
@@ -22,8 +39,72 @@ def ensure_directory(path: str) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
-def load_json(file_path: str, default: Any) -> Any:
-    """Load JSON data from file_path, or return default if not found/invalid."""
+def journal_path(file_path: str) -> str:
+    """Return the JSON-Lines journal that sits next to a snapshot file."""
+    base, _ = os.path.splitext(file_path)
+    return base + ".journal.jsonl"
+
+
+def _compacting_path(file_path: str) -> str:
+    return journal_path(file_path) + ".compacting"
+
+
+def backing_files(file_path: str) -> tuple:
+    """Return every file that holds part of a collection, snapshot first."""
+    if file_path.endswith(".jsonl"):
+        return (file_path,)
+    return (file_path, _compacting_path(file_path), journal_path(file_path))
+
+
+# ---- Byte counts for the instrumentation (only computed while it is on) ----
+def _read_io(args, result) -> tuple:
+    return sum(metrics.file_size(p) for p in backing_files(args[0])), 0
+
+
+def _spans_io(args, result) -> tuple:
+    return 0, (result[-1][1] - result[0][0]) if result else 0
+
+
+def _record_io(args, result) -> tuple:
+    return 0, len(json.dumps(args[1], ensure_ascii=False).encode("utf-8")) + 1
+
+
+def _lock_for(file_path: str) -> threading.Lock:
+    key = os.path.abspath(file_path)
+    with _guard:
+        if key not in _locks:
+            _locks[key] = threading.Lock()
+        return _locks[key]
+
+
+def register_fold(file_path: str, fold) -> None:
+    """Pass the merged records of file_path through fold(records) -> records on compaction.
+
+    Lets a collection whose journal holds deltas (e.g. per-key increments)
+    be compacted back into one record per key.
+    """
+    with _guard:
+        _folds[file_path] = fold
+
+
+def _read_journal(path: str) -> list:
+    """Read journal records, skipping a torn last line after a crash."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _load_snapshot(file_path: str, default: Any) -> Any:
     if not os.path.exists(file_path):
         return default
     try:
@@ -33,8 +114,269 @@ def load_json(file_path: str, default: Any) -> Any:
         return default
 
 
-def save_json(file_path: str, data: Any) -> None:
-    """Save Python data as JSON with indentation."""
+@metrics.timed("json_store.load_json", io=_read_io)
+def load_json(file_path: str, default: Any) -> Any:
+    """Load JSON data from file_path, or return default if not found/invalid.
+
+    For list files, records still waiting in the journal are appended to
+    the snapshot so callers always see the full collection.
+    """
+    with _lock_for(file_path):
+        data = _load_snapshot(file_path, default)
+        pending = []
+        try:
+            for path in (_compacting_path(file_path), journal_path(file_path)):
+                pending.extend(_read_journal(path))
+        except OSError:
+            pending = []
+
+    if pending:
+        if data is None:
+            data = []
+        if isinstance(data, list):
+            data = data + pending
+    return data
+
+
+def _write_atomic(file_path: str, data: Any, indent: Optional[int]) -> None:
+    """Write JSON to a temporary file and rename it over file_path.
+
+    A crash mid-write leaves the previous file intact instead of a
+    truncated one.
+    """
+    tmp_path = file_path + ".tmp"
+    separators = None if indent is not None else (",", ":")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, separators=separators, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+
+@metrics.timed("json_store.save_json", io=metrics.wrote_first_arg)
+def save_json(file_path: str, data: Any, indent: Optional[int] = 2) -> None:
+    """Save Python data as JSON with indentation (indent=None for compact).
+
+    The file is replaced atomically. A full save replaces the collection,
+    so any journal for the file is discarded afterwards.
+    """
+    ensure_directory(file_path)
+    with _lock_for(file_path):
+        _write_atomic(file_path, data, indent)
+        for path in (_compacting_path(file_path), journal_path(file_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        _journal_lines[file_path] = 0
+
+
+def iter_records(file_path: str) -> Iterator[Any]:
+    """Yield the records of a list file one at a time.
+
+    Works on JSON arrays (followed by any journal records) and on
+    JSON-Lines files, so memory use does not grow with the file size.
+    A truncated or invalid tail simply ends the iteration.
+    """
+    if file_path.endswith(".jsonl"):
+        yield from _iter_lines(file_path)
+        return
+
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield from _iter_array(f)
+        except OSError:
+            pass
+    for path in (_compacting_path(file_path), journal_path(file_path)):
+        yield from _iter_lines(path)
+
+
+def _iter_lines(path: str) -> Iterator[Any]:
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _iter_array(f) -> Iterator[Any]:
+    """Incrementally decode the elements of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buf = f.read(STREAM_CHUNK_SIZE).lstrip()
+    if not buf.startswith("["):
+        return
+    pos, eof = 1, False
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+
+        # Only trust a decoded value if it did not run into the buffer end.
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+            complete = end < len(buf) or eof
+        except json.JSONDecodeError:
+            complete = False
+        if complete:
+            yield obj
+            pos = end
+            continue
+
+        if eof:
+            return
+        chunk = f.read(STREAM_CHUNK_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
+@metrics.timed("json_store.load_jsonl", io=_read_io)
+def load_jsonl(file_path: str, default: Any) -> Any:
+    """Load a JSON-Lines file as a list, or return default if not found."""
+    if not os.path.exists(file_path):
+        return default
+    with _lock_for(file_path):
+        try:
+            return _read_journal(file_path)
+        except OSError:
+            return default
+
+
+def append_jsonl(file_path: str, record: Any) -> tuple:
+    """Append one record as a line to a JSON-Lines file.
+
+    Returns the (start, end) byte offsets of the written line.
+    """
+    return extend_jsonl(file_path, [record])[0]
+
+
+@metrics.timed("json_store.extend_jsonl", io=_spans_io)
+def extend_jsonl(file_path: str, records: list) -> list:
+    """Append many records to a JSON-Lines file with a single write.
+
+    Returns the (start, end) byte offsets of every written line, so
+    callers can index records for direct seeks later.
+    """
     ensure_directory(file_path)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records]
+    with _lock_for(file_path):
+        with open(file_path, "a+b") as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset and _torn(f, offset):
+                f.write(b"\n")
+                offset += 1
+            f.write(b"".join(lines))
+    spans = []
+    for line in lines:
+        spans.append((offset, offset + len(line)))
+        offset += len(line)
+    return spans
+
+
+@metrics.timed("json_store.append_json", io=_record_io)
+def append_json(file_path: str, record: Any) -> None:
+    """Append a single record to the file's journal in constant time.
+
+    Once the journal holds COMPACT_EVERY lines it is folded back into the
+    snapshot on a background thread.
+    """
+    path = journal_path(file_path)
+    ensure_directory(path)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    with _lock_for(file_path):
+        if file_path not in _journal_lines:
+            _journal_lines[file_path] = _count_lines(path)
+        with open(path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size and _torn(f, size):
+                line = b"\n" + line
+            f.write(line)
+        _journal_lines[file_path] += 1
+        needs_compaction = _journal_lines[file_path] >= COMPACT_EVERY
+
+    if needs_compaction:
+        _start_compaction(file_path)
+
+
+def _torn(f, size: int) -> bool:
+    """True if a binary file of the given size does not end with a newline.
+
+    Appending after such a partial line would glue the new record onto it.
+    """
+    f.seek(size - 1)
+    return f.read(1) != b"\n"
+
+
+def _count_lines(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def _start_compaction(file_path: str) -> None:
+    with _guard:
+        if file_path in _compacting:
+            return
+        _compacting.add(file_path)
+
+    def run():
+        try:
+            compact_journal(file_path)
+        except (OSError, ValueError):
+            pass  # the journal stays in place and is retried on a later append
+        finally:
+            with _guard:
+                _compacting.discard(file_path)
+
+    threading.Thread(target=run, name=f"compact:{file_path}", daemon=True).start()
+
+
+@metrics.timed("json_store.compact_journal", io=metrics.wrote_first_arg)
+def compact_journal(file_path: str) -> None:
+    """Fold the journal into the snapshot file.
+
+    The journal is rotated aside under the file lock, merged and written to
+    a temporary file without holding the lock, and the finished snapshot is
+    swapped in atomically so appends never wait on the full rewrite.
+    """
+    lock = _lock_for(file_path)
+    active = journal_path(file_path)
+    rotated = _compacting_path(file_path)
+
+    with lock:
+        if not os.path.exists(rotated):
+            if not os.path.exists(active):
+                return
+            os.replace(active, rotated)
+        _journal_lines[file_path] = 0
+        snapshot = _load_snapshot(file_path, [])
+
+    if not isinstance(snapshot, list):
+        raise ValueError(f"{file_path} does not hold a JSON list")
+    merged = snapshot + _read_journal(rotated)
+    fold = _folds.get(file_path)
+    if fold is not None:
+        merged = fold(merged)
+
+    tmp_path = file_path + ".compact.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    with lock:
+        if not os.path.exists(rotated):
+            # A full save_json replaced the collection while we merged.
+            os.remove(tmp_path)
+            return
+        os.replace(tmp_path, file_path)
+        os.remove(rotated)
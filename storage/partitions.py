@@ -0,0 +1,176 @@
+# ==============================================================
+#  FILE: partitions.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Month-partitioned shift storage for the JSON backend.
+#     Each month lives in its own JSON-Lines file, e.g.
+#     data/shifts/2025/10.jsonl, and a small manifest.json records
+#     the date span of every partition so date-filtered loads only
+#     open the months that overlap the requested range. Job, staff
+#     and date indexes over the partitions live in shift_index.py.
+# ==============================================================
+
+import json
+import os
+import re
+import shutil
+import threading
+from typing import Optional
+
+from domain.models import ShiftRecord
+from storage.json_store import ensure_directory, load_json, extend_jsonl
+from storage.repository import load_collection, iter_collection, append_record, invalidate
+from storage.shift_index import ShiftIndex
+
+MANIFEST_NAME = "manifest.json"
+UNDATED = "undated"
+
+_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})")
+
+
+def partition_key(shift_date: str) -> str:
+    """Return the YYYY-MM partition key for a shift date."""
+    match = _MONTH_RE.match(shift_date or "")
+    return f"{match.group(1)}-{match.group(2)}" if match else UNDATED
+
+
+class ShiftPartitions:
+    """Routes shift records to monthly JSON-Lines partitions."""
+
+    def __init__(self, root: str, legacy_file: Optional[str] = None):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self._lock = threading.RLock()   # index callbacks re-enter partition_files()
+        self._manifest = None
+        self.index = ShiftIndex(self.partition_files)
+        if legacy_file:
+            self._migrate_legacy(legacy_file)
+
+    # ------------------- MANIFEST -------------------
+    def _load_manifest(self) -> dict:
+        if self._manifest is None:
+            manifest = load_json(self.manifest_path, default=None)
+            if not isinstance(manifest, dict):
+                manifest = {"version": 1, "partitions": {}}
+            self._manifest = manifest
+        return self._manifest
+
+    def _write_manifest(self) -> None:
+        ensure_directory(self.manifest_path)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _partition_path(self, key: str) -> str:
+        if key == UNDATED:
+            return os.path.join(self.root, f"{UNDATED}.jsonl")
+        year, month = key.split("-")
+        return os.path.join(self.root, year, f"{month}.jsonl")
+
+    # ------------------- WRITE -------------------
+    def append(self, record: ShiftRecord) -> None:
+        """Append a shift record to the partition for its shift_date."""
+        self.extend([record])
+
+    def extend(self, records: list) -> None:
+        """Route many shift records to their partitions with one write each."""
+        groups = {}
+        for record in records:
+            groups.setdefault(partition_key(record.shift_date), []).append(record)
+
+        with self._lock:
+            entries = self._load_manifest()["partitions"]
+            for key, batch in groups.items():
+                path = self._partition_path(key)
+                if len(batch) == 1:
+                    spans = [append_record(path, batch[0])]
+                else:
+                    spans = extend_jsonl(path, [r.to_dict() for r in batch])
+                    invalidate(path)
+
+                dates = [r.shift_date or "" for r in batch]
+                entry = entries.setdefault(key, {
+                    "file": os.path.relpath(path, self.root).replace(os.sep, "/"),
+                    "count": 0, "first_date": min(dates), "last_date": max(dates),
+                })
+                entry["count"] += len(batch)
+                entry["first_date"] = min(entry["first_date"], *dates)
+                entry["last_date"] = max(entry["last_date"], *dates)
+                self.index.add(key, path, batch, spans)
+            if groups:
+                self._write_manifest()
+
+    # ------------------- READ -------------------
+    def partition_files(self) -> dict:
+        """Return {partition_key: file path} for every partition."""
+        with self._lock:
+            entries = self._load_manifest()["partitions"]
+            return {key: os.path.join(self.root, e["file"]) for key, e in entries.items()}
+
+    def partitions_for(self, dates: Optional[tuple] = None) -> list:
+        """Return partition files overlapping the inclusive date bounds, oldest first."""
+        with self._lock:
+            entries = dict(self._load_manifest()["partitions"])
+
+        paths = []
+        for key in sorted(entries):
+            entry = entries[key]
+            if dates is not None:
+                if key == UNDATED:
+                    continue
+                if entry["last_date"] < dates[0] or entry["first_date"] > dates[1]:
+                    continue
+            paths.append(os.path.join(self.root, entry["file"]))
+        return paths
+
+    def load(self, dates: Optional[tuple] = None) -> list:
+        """Return shift records from the partitions overlapping the bounds."""
+        shifts = []
+        for path in self.partitions_for(dates):
+            shifts.extend(load_collection(path, ShiftRecord))
+        return shifts
+
+    def iter(self, dates: Optional[tuple] = None):
+        """Stream shift records from the partitions overlapping the bounds."""
+        for path in self.partitions_for(dates):
+            yield from iter_collection(path, ShiftRecord)
+
+    def count(self) -> int:
+        with self._lock:
+            return sum(e["count"] for e in self._load_manifest()["partitions"].values())
+
+    def version(self) -> tuple:
+        """Changes whenever shifts are added or the partitions are reset."""
+        with self._lock:
+            try:
+                mtime = os.stat(self.manifest_path).st_mtime_ns
+            except OSError:
+                mtime = None
+            return self.count(), mtime
+
+    # ------------------- MAINTENANCE -------------------
+    def reset(self) -> None:
+        with self._lock:
+            if os.path.isdir(self.root):
+                shutil.rmtree(self.root)
+            self._manifest = {"version": 1, "partitions": {}}
+            self.index.reset()
+            invalidate()
+
+    def _migrate_legacy(self, legacy_file: str) -> None:
+        """Split a single-file shift history into partitions, once.
+
+        The legacy file is left untouched; the manifest, written after the
+        last partition, marks the migration as done. Partitions left by an
+        interrupted migration are cleared first so no shift is copied
+        twice, and malformed legacy records are skipped.
+        """
+        if os.path.exists(self.manifest_path):
+            return
+        if os.path.isdir(self.root):
+            self.reset()
+        self.extend(list(iter_collection(legacy_file, ShiftRecord)))
+        with self._lock:
+            self._load_manifest()
+            self._write_manifest()
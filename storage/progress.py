@@ -0,0 +1,167 @@
+# ==============================================================
+#  FILE: progress.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Materialized per-job progress for the JSON backend, kept in
+#     data/production.json. Totals are adjusted in place whenever a
+#     shift is saved, so progress reads never scan the shift history.
+#     Saved shifts are journaled as per-job deltas; loading and
+#     journal compaction fold them back into one row per job. The
+#     table is rebuilt from the shifts only when its shift count
+#     disagrees with the partition manifest. Rows of deleted jobs
+#     are kept, since their shifts are still stored; the backend
+#     only returns rows of existing jobs.
+# ==============================================================
+
+import threading
+from dataclasses import replace
+from typing import Callable, Iterable, Optional
+
+from domain.models import JobProgress, ShiftRecord
+from storage import write_queue
+from storage.json_store import COMPACT_EVERY, register_fold
+from storage.repository import load_collection, save_collection, append_record
+
+
+class ProgressTable:
+    """job_number -> JobProgress, persisted through the write-behind queue."""
+
+    def __init__(self, file_path: str, shift_count: Callable[[], int],
+                 history: Callable[[], tuple]):
+        # shift_count() -> number of stored shifts, used to detect drift
+        # history() -> (iterable of every shift, {job_number: target})
+        self.file_path = file_path
+        self._shift_count = shift_count
+        self._history = history
+        self._lock = threading.RLock()
+        self._rows = None
+        register_fold(file_path, fold_records)
+
+    # ------------------- LOADING -------------------
+    def _table(self, pending: int = 0) -> tuple:
+        """Return (rows, rebuilt), rebuilding the table if it has drifted.
+
+        pending is the number of shifts already stored but not yet
+        recorded; a rebuild includes them.
+        """
+        if self._rows is not None:
+            return self._rows, False
+        rows = {}
+        for p in load_collection(self.file_path, JobProgress):
+            _add(rows, p)          # journaled deltas share their job's row
+        if sum(p.shift_count for p in rows.values()) + pending == self._shift_count():
+            self._rows = rows
+            return rows, False
+        shifts, targets = self._history()
+        self._rows = _compute(shifts, targets)
+        self._save()
+        return self._rows, True
+
+    def _save(self) -> None:
+        save_collection(self.file_path, list(self._rows.values()))
+
+    # ------------------- UPDATES -------------------
+    def record(self, shift: ShiftRecord, target: int) -> JobProgress:
+        """Add a just-saved shift to its job's totals and return the new totals."""
+        return self.record_many([shift], {shift.job_number: target})[0]
+
+    def record_many(self, shifts: list, targets: dict) -> list:
+        """Add just-saved shifts to their jobs' totals.
+
+        targets maps job_number -> target; returns the new totals of every
+        job touched, in first-seen order. Each touched job's delta is
+        journaled; a batch touching more jobs than a journal holds before
+        compaction, or one arriving while a full save is queued, is saved
+        in full instead.
+        """
+        with self._lock:
+            rows, rebuilt = self._table(pending=len(shifts))
+            deltas = {}
+            for shift in shifts:
+                _add(deltas, JobProgress(
+                    shift.job_number,
+                    produced=shift.total_output,
+                    shift_count=1,
+                    last_activity=shift.shift_date or "",
+                    target=targets.get(shift.job_number, 0),
+                ))
+            if rebuilt:
+                # the rebuild already counted these shifts; only the targets are new
+                for job, delta in deltas.items():
+                    rows[job] = replace(rows[job], target=delta.target)
+                self._save()
+            else:
+                for delta in deltas.values():
+                    _add(rows, delta)
+                if len(deltas) >= COMPACT_EVERY or write_queue.is_pending(self.file_path):
+                    self._save()
+                else:
+                    for delta in deltas.values():
+                        append_record(self.file_path, delta)
+            return [rows[job] for job in deltas]
+
+    def set_target(self, job_number: str, target: int) -> None:
+        with self._lock:
+            rows, _ = self._table()
+            p = rows.get(job_number)
+            if p is not None and p.target != target:
+                rows[job_number] = replace(p, target=target)
+                if write_queue.is_pending(self.file_path):
+                    self._save()
+                else:
+                    append_record(self.file_path, JobProgress(job_number, target=target))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows = None
+
+    # ------------------- READ -------------------
+    def get(self, job_number: str) -> Optional[JobProgress]:
+        with self._lock:
+            return self._table()[0].get(job_number)
+
+    def all(self) -> dict:
+        with self._lock:
+            return dict(self._table()[0])
+
+
+def fold_records(records: list) -> list:
+    """Merge raw progress records of the same job; used when the journal is compacted."""
+    rows = {}
+    for raw in records:
+        try:
+            _add(rows, JobProgress.from_dict(raw))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+    return [p.to_dict() for p in rows.values()]
+
+
+def _add(rows: dict, delta: JobProgress) -> None:
+    """Add a delta to its job's row; the later record's target wins."""
+    current = rows.get(delta.job_number)
+    if current is None:
+        rows[delta.job_number] = delta
+        return
+    # rows are shared with the cached collection, so replace rather than mutate
+    rows[delta.job_number] = JobProgress(
+        delta.job_number,
+        produced=current.produced + delta.produced,
+        shift_count=current.shift_count + delta.shift_count,
+        last_activity=max(current.last_activity, delta.last_activity),
+        target=delta.target,
+    )
+
+
+def _compute(shifts: Iterable[ShiftRecord], targets: dict) -> dict:
+    """Build job_number -> JobProgress from a full shift history."""
+    rows = {}
+    for shift in shifts:
+        p = rows.get(shift.job_number)
+        if p is None:
+            p = rows[shift.job_number] = JobProgress(
+                shift.job_number, target=targets.get(shift.job_number, 0)
+            )
+        p.produced += shift.total_output
+        p.shift_count += 1
+        p.last_activity = max(p.last_activity, shift.shift_date or "")
+    return rows
@@ -0,0 +1,228 @@
+# ==============================================================
+#  FILE: repository.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Process-wide, in-memory cache of the parsed data collections.
+#     Files are only re-parsed when their stat signature changes,
+#     and the cache is bounded by an approximate memory budget.
+#     Full saves are handed to the write-behind queue; the cached
+#     copy serves reads until the file is on disk.
+# ==============================================================
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Iterator, Optional
+
+from storage import write_queue
+from storage.json_store import (
+    load_json, append_json, load_jsonl, append_jsonl, backing_files, iter_records
+)
+
+JOBS_FILE = "data/jobs.json"
+STAFF_FILE = "data/staff.json"
+SHIFTS_FILE = "data/shift_output.json"
+PRODUCTION_FILE = "data/production.json"
+ROLLUP_FILE = "data/rollup.json"
+DRAFTS_FILE = "data/shift_drafts.json"
+SHIFTS_DIR = "data/shifts"
+LIVE_DIR = "data/live"
+
+# Upper bound on the total on-disk size of cached files. Parsed data is
+# larger than the file, but the ratio is stable enough to use as a budget.
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_lock = threading.RLock()
+_cache = OrderedDict()   # file_path -> (signature, data, size, model)
+_cached_bytes = 0
+_PENDING = "pending"     # signature of an entry whose save is still queued
+
+
+def _signature(file_path: str) -> tuple:
+    """Stat signature covering the snapshot and its journal files."""
+    sig = []
+    for path in backing_files(file_path):
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _signature_size(sig: tuple) -> int:
+    return sum(part[1] for part in sig if part)
+
+
+def _store(file_path: str, sig, data: Any, model: Optional[type]) -> None:
+    global _cached_bytes
+    if sig == _PENDING:
+        previous = _cache.get(file_path)
+        size = previous[2] if previous else 0
+    else:
+        size = _signature_size(sig)
+    _drop(file_path)
+    if size > MAX_CACHE_BYTES:
+        return
+    _cache[file_path] = (sig, data, size, model)
+    _cached_bytes += size
+    while _cached_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+        oldest = next(iter(_cache))
+        _drop(oldest)
+
+
+def _drop(file_path: str) -> None:
+    global _cached_bytes
+    entry = _cache.pop(file_path, None)
+    if entry:
+        _cached_bytes -= entry[2]
+
+
+def _current(file_path: str, model: Optional[type]) -> Optional[tuple]:
+    """Return the cache entry if it matches the file on disk and the model."""
+    entry = _cache.get(file_path)
+    if entry and entry[3] is model and entry[0] in (_PENDING, _signature(file_path)):
+        return entry
+    return None
+
+
+def _decode(records, model: Optional[type]):
+    """Yield records as model instances, skipping malformed entries."""
+    if model is None:
+        yield from records
+        return
+    from_dict = model.from_dict
+    for raw in records:
+        try:
+            yield from_dict(raw)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+
+
+def _encode(record: Any) -> Any:
+    return record.to_dict() if hasattr(record, "to_dict") else record
+
+
+def load_collection(file_path: str, model: Optional[type] = None) -> Any:
+    """Return the parsed collection for file_path, re-parsing only on change.
+
+    With a model (a domain class with from_dict/to_dict) the records are
+    decoded once and the typed list is what gets cached. The returned list
+    is shared between callers and must be treated as read-only; build a new
+    list before saving modifications. append_record() grows it in place, so
+    a caller caching something derived from it should key on its length as
+    well as its identity. Files ending in .jsonl are read as JSON-Lines.
+    """
+    sig = _signature(file_path)
+    with _lock:
+        entry = _cache.get(file_path)
+        if entry and entry[3] is model and entry[0] in (_PENDING, sig):
+            _cache.move_to_end(file_path)
+            return entry[1]
+
+    if write_queue.is_pending(file_path):
+        write_queue.flush()   # the disk copy is stale until the queued save lands
+        sig = _signature(file_path)
+    loader = load_jsonl if file_path.endswith(".jsonl") else load_json
+    raw = loader(file_path, default=None)
+    if raw is None:
+        return []
+    data = list(_decode(raw, model)) if isinstance(raw, list) else raw
+    with _lock:
+        _store(file_path, sig, data, model)
+    return data
+
+
+def iter_collection(file_path: str, model: Optional[type] = None) -> Iterator[Any]:
+    """Iterate a collection without materializing it.
+
+    Uses the cached copy when it is current, otherwise streams the records
+    from disk and leaves the cache untouched.
+    """
+    with _lock:
+        entry = _current(file_path, model)
+    if entry is not None:
+        return iter(entry[1])
+    if write_queue.is_pending(file_path):
+        write_queue.flush()
+    return _decode(iter_records(file_path), model)
+
+
+def save_collection(file_path: str, data: list) -> None:
+    """Queue a full write of a collection and make it the cached copy.
+
+    The write happens on the write-behind thread; reads are served from
+    the cache until it lands on disk.
+    """
+    model = type(data[0]) if data and hasattr(data[0], "to_dict") else None
+    with _lock:
+        _store(file_path, _PENDING, data, model)
+        write_queue.submit(
+            file_path, data,
+            encode=lambda rows: [_encode(r) for r in rows],
+            on_written=_mark_written,
+            on_failed=_mark_failed,
+        )
+
+
+def _mark_written(file_path: str, data: list) -> None:
+    """Stamp the cached copy with the on-disk signature once it is saved."""
+    with _lock:
+        entry = _cache.get(file_path)
+        if entry and entry[1] is data:
+            _store(file_path, _signature(file_path), data, entry[3])
+
+
+def _mark_failed(file_path: str, data: list) -> None:
+    """Drop a cached copy that never reached the disk, so reads show what is saved."""
+    with _lock:
+        entry = _cache.get(file_path)
+        if entry and entry[1] is data:
+            _drop(file_path)
+
+
+def append_record(file_path: str, record: Any) -> Optional[tuple]:
+    """Journal a single record and append it to the cached list in place.
+
+    If a full save of the file is queued, the record is added to the
+    queued snapshot instead: that save would discard the journal line.
+    The pending check and the append happen under the cache lock, which
+    save_collection also takes, so no save can be queued in between.
+    For .jsonl files the (start, end) byte span of the new line is returned.
+    """
+    model = type(record) if hasattr(record, "to_dict") else None
+    while True:
+        with _lock:
+            if not write_queue.is_pending(file_path):
+                entry = _current(file_path, model)
+                span = None
+                if file_path.endswith(".jsonl"):
+                    span = append_jsonl(file_path, _encode(record))
+                else:
+                    append_json(file_path, _encode(record))
+                if entry is not None and isinstance(entry[1], list):
+                    entry[1].append(record)
+                    _store(file_path, _signature(file_path), entry[1], model)
+                else:
+                    _drop(file_path)
+                return span
+
+            entry = _current(file_path, model)
+            if entry is not None:
+                entry[1].append(record)
+                save_collection(file_path, entry[1])   # written again if already in flight
+                return None
+        # The queued snapshot is not cached (evicted); let it land first,
+        # outside the lock since the writer thread needs it.
+        write_queue.flush()
+
+
+def invalidate(file_path: Optional[str] = None) -> None:
+    """Forget one cached file, or every cached file when no path is given."""
+    global _cached_bytes
+    with _lock:
+        if file_path is None:
+            _cache.clear()
+            _cached_bytes = 0
+        else:
+            _drop(file_path)
@@ -0,0 +1,180 @@
+# ==============================================================
+#  FILE: rollup.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Pre-aggregated shift totals for the JSON backend, kept in
+#     data/rollup.json: one RollupCell per (date, job, staff,
+#     shift type) with output, target and hours. A saved shift
+#     adds to its cell in place, so analytics read one row per
+#     distinct combination instead of every shift. Day, ISO
+#     year-week, month and year periods are derived from the
+#     cell dates with period_key(). Each cell also counts the lost
+#     units (target - quantity) of its under-target hours per
+#     downtime reason. Saved shifts are journaled as per-cell
+#     deltas; loading and journal compaction fold them back into
+#     one cell per key.
+# ==============================================================
+
+import threading
+from datetime import date
+from typing import Callable, Iterable
+
+from domain.models import RollupCell, ShiftRecord
+from storage import write_queue
+from storage.json_store import COMPACT_EVERY, register_fold
+from storage.repository import load_collection, save_collection, append_record
+
+PERIODS = ("day", "week", "month", "year")
+
+# Downtime reason recorded for under-target hours saved without a comment.
+UNSPECIFIED_REASON = "Unspecified"
+
+
+def period_key(shift_date: str, period: str) -> str:
+    """Bucket a YYYY-MM-DD date: 2025-10-29, 2025-W44, 2025-10 or 2025.
+
+    Weeks are ISO weeks labelled with their ISO year, so week 1 of two
+    different years never share a bucket. Raises ValueError for an
+    unparsable date when period is "week".
+    """
+    if period == "day":
+        return shift_date
+    if period == "month":
+        return shift_date[:7]
+    if period == "year":
+        return shift_date[:4]
+    if period == "week":
+        year, week, _ = date.fromisoformat(shift_date).isocalendar()
+        return f"{year}-W{week:02d}"
+    raise ValueError(f"Unknown period: {period!r}")
+
+
+def shift_downtime(shift: ShiftRecord) -> dict:
+    """reason -> [lost units, hours] over the shift's under-target hours."""
+    downtime = {}
+    for h in shift.hourly_outputs:
+        lost = h.lost_units
+        if lost:
+            counts = downtime.setdefault(h.comment or UNSPECIFIED_REASON, [0, 0])
+            counts[0] += lost
+            counts[1] += 1
+    return downtime
+
+
+def shift_cell(shift: ShiftRecord) -> RollupCell:
+    """The totals one shift contributes to its cell."""
+    return RollupCell(
+        shift.shift_date, shift.job_number, shift.staff_name, shift.shift_type or "",
+        output=shift.total_output,
+        target=sum(h.target for h in shift.hourly_outputs),
+        hours=len(shift.hourly_outputs),
+        shift_count=1,
+        downtime=shift_downtime(shift),
+    )
+
+
+class RollupTable:
+    """(date, job, staff, shift_type) -> RollupCell, persisted through the write-behind queue."""
+
+    def __init__(self, file_path: str, shift_count: Callable[[], int],
+                 history: Callable[[], Iterable[ShiftRecord]]):
+        # shift_count() -> number of stored shifts, used to detect drift
+        # history() -> every stored shift, with its hourly rows
+        self.file_path = file_path
+        self._shift_count = shift_count
+        self._history = history
+        self._lock = threading.RLock()
+        self._cells = None
+        register_fold(file_path, fold_records)
+
+    # ------------------- LOADING -------------------
+    def _table(self, pending: int = 0) -> tuple:
+        """Return (cells, rebuilt), rebuilding the table if it has drifted."""
+        if self._cells is not None:
+            return self._cells, False
+        cells = {}
+        for cell in load_collection(self.file_path, RollupCell):
+            _add(cells, cell)      # journaled deltas share their cell's key
+        if sum(c.shift_count for c in cells.values()) + pending == self._shift_count():
+            self._cells = cells
+            return cells, False
+        self._cells = {}
+        for shift in self._history():
+            _add(self._cells, shift_cell(shift))
+        self._save()
+        return self._cells, True
+
+    def _save(self) -> None:
+        save_collection(self.file_path, list(self._cells.values()))
+
+    # ------------------- UPDATES -------------------
+    def record(self, shift: ShiftRecord) -> None:
+        """Add a just-saved shift to its cell."""
+        self.record_many([shift])
+
+    def record_many(self, shifts: list) -> None:
+        """Add just-saved shifts to their cells.
+
+        Each touched cell's delta is journaled. A batch touching more
+        cells than a journal holds before compaction, or one arriving
+        while a full save is still queued, is saved in full instead.
+        """
+        with self._lock:
+            cells, rebuilt = self._table(pending=len(shifts))
+            if rebuilt:
+                return
+            deltas = {}
+            for shift in shifts:
+                _add(deltas, shift_cell(shift))
+            for delta in deltas.values():
+                _add(cells, delta)
+            if len(deltas) >= COMPACT_EVERY or write_queue.is_pending(self.file_path):
+                self._save()
+            else:
+                for delta in deltas.values():
+                    append_record(self.file_path, delta)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cells = None
+
+    # ------------------- READ -------------------
+    def all(self) -> list:
+        with self._lock:
+            return list(self._table()[0].values())
+
+
+def fold_records(records: list) -> list:
+    """Merge raw cell records sharing a key; used when the journal is compacted."""
+    cells = {}
+    for raw in records:
+        try:
+            _add(cells, RollupCell.from_dict(raw))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+    return [c.to_dict() for c in cells.values()]
+
+
+def _add(cells: dict, cell: RollupCell) -> None:
+    current = cells.get(cell.key)
+    if current is None:
+        cells[cell.key] = cell
+        return
+    # cells are shared with the cached collection, so replace rather than mutate
+    cells[cell.key] = RollupCell(
+        *cell.key,
+        output=current.output + cell.output,
+        target=current.target + cell.target,
+        hours=current.hours + cell.hours,
+        shift_count=current.shift_count + cell.shift_count,
+        downtime=_merge_downtime(current.downtime, cell.downtime),
+    )
+
+
+def _merge_downtime(a: dict, b: dict) -> dict:
+    merged = {reason: list(counts) for reason, counts in a.items()}
+    for reason, (lost, hours) in b.items():
+        counts = merged.setdefault(reason, [0, 0])
+        counts[0] += lost
+        counts[1] += hours
+    return merged
@@ -0,0 +1,214 @@
+# ==============================================================
+#  FILE: shift_index.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Secondary indexes over the monthly shift partitions.
+#     Every partition has an append-only sidecar (10.idx.jsonl next
+#     to 10.jsonl) holding one row per shift:
+#         [start_offset, end_offset, job_number, staff_name, shift_date]
+#     In memory the rows become job -> locations, staff -> locations
+#     and a sorted shift_date list, so filtered loads seek straight
+#     to the matching lines instead of scanning every shift.
+# ==============================================================
+
+import bisect
+import json
+import os
+import threading
+from typing import Iterator, Optional
+
+from domain.models import ShiftRecord
+from storage.json_store import ensure_directory
+
+
+def index_path(partition_path: str) -> str:
+    """Return the index sidecar for a partition file."""
+    base, _ = os.path.splitext(partition_path)
+    return base + ".idx.jsonl"
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _has_shifts(path: str, offset: int) -> bool:
+    """True if any line of the file from offset on is a shift record."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(rec, dict) and "job_number" in rec:
+                return True
+    return False
+
+
+class ShiftIndex:
+    """Job, staff and date indexes for a set of shift partitions.
+
+    Sidecars are updated on every append and rebuilt lazily from the
+    partition file when missing or out of step with it.
+    """
+
+    def __init__(self, partition_files):
+        # partition_files() -> {partition_key: partition_path}. It takes the
+        # partitions lock, which is held while add() runs, so it is only
+        # called before self._lock is taken (or from within add()).
+        self._partition_files = partition_files
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._sizes = {}          # partition_key -> indexed byte size
+        self._by_job = {}         # job_number -> [(key, offset)]
+        self._by_staff = {}       # staff_name -> [(key, offset)]
+        self._by_date = []        # sorted [(shift_date, key, offset)]
+
+    # ------------------- LOADING -------------------
+    def _ensure_loaded(self, files: Optional[dict] = None) -> None:
+        if self._loaded:
+            return
+        if files is None:
+            files = self._partition_files()
+        self._by_job, self._by_staff, self._by_date, self._sizes = {}, {}, [], {}
+        for key, path in files.items():
+            rows = self._load_partition(path)
+            self._add_rows(key, rows)
+            self._sizes[key] = _file_size(path)
+        self._by_date.sort()
+        self._loaded = True
+
+    def _load_partition(self, path: str) -> list:
+        """Return index rows for a partition, rebuilding a stale sidecar.
+
+        The sidecar is current when it covers the file up to its end, or up
+        to a tail holding no shifts (a line torn by a crash, which the next
+        append terminates).
+        """
+        size = _file_size(path)
+        rows = []
+        sidecar = index_path(path)
+        if os.path.exists(sidecar):
+            with open(sidecar, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        rows = []
+                        break
+        end = rows[-1][1] if rows else 0
+        if end == size or (end < size and not _has_shifts(path, end)):
+            return rows
+        return self._rebuild_partition(path)
+
+    def _rebuild_partition(self, path: str) -> list:
+        rows = []
+        offset = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    end = offset + len(line)
+                    try:
+                        rec = json.loads(line)
+                        rows.append([offset, end, rec["job_number"], rec["staff_name"], rec["shift_date"]])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                    offset = end
+
+        sidecar = index_path(path)
+        ensure_directory(sidecar)
+        tmp_path = f"{sidecar}.{os.getpid()}.tmp"   # report processes may rebuild concurrently
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+        os.replace(tmp_path, sidecar)
+        return rows
+
+    def _add_rows(self, key: str, rows: list, keep_sorted: bool = False) -> None:
+        for start, _end, job, staff, shift_date in rows:
+            loc = (key, start)
+            self._by_job.setdefault(job, []).append(loc)
+            self._by_staff.setdefault(staff, []).append(loc)
+            if keep_sorted:
+                bisect.insort(self._by_date, (shift_date, key, start))
+            else:
+                self._by_date.append((shift_date, key, start))
+
+    def _check_fresh(self, files: dict) -> None:
+        """Reload everything if a partition changed behind the index."""
+        if set(files) != set(self._sizes) or any(
+            _file_size(path) != self._sizes.get(key) for key, path in files.items()
+        ):
+            self._loaded = False
+        self._ensure_loaded(files)
+
+    # ------------------- UPDATES -------------------
+    def add(self, key: str, path: str, records: list, spans: list) -> None:
+        """Record freshly appended shifts and their byte spans."""
+        with self._lock:
+            self._ensure_loaded()
+            if spans and self._sizes.get(key) == spans[-1][1]:
+                return                    # the lazy load already indexed them
+            if not spans or self._sizes.get(key, 0) != spans[0][0]:
+                self._loaded = False      # sidecar out of step; rebuild lazily
+                return
+
+            rows = [
+                [start, end, r.job_number, r.staff_name, r.shift_date]
+                for r, (start, end) in zip(records, spans)
+            ]
+            sidecar = index_path(path)
+            ensure_directory(sidecar)
+            with open(sidecar, "a", encoding="utf-8", newline="\n") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+
+            self._add_rows(key, rows, keep_sorted=True)
+            self._sizes[key] = spans[-1][1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._sizes, self._by_job, self._by_staff, self._by_date = {}, {}, {}, []
+
+    # ------------------- LOOKUPS -------------------
+    def lookup(self, job_number: str = "", staff_name: str = "",
+               dates: Optional[tuple] = None) -> list:
+        """Return sorted (partition_key, offset) locations matching every filter."""
+        files = self._partition_files()   # before self._lock; see __init__
+        with self._lock:
+            self._check_fresh(files)
+            candidates = []
+            if job_number:
+                candidates.append(self._by_job.get(job_number, []))
+            if staff_name:
+                candidates.append(self._by_staff.get(staff_name, []))
+            if dates is not None:
+                lo = bisect.bisect_left(self._by_date, (dates[0],))
+                hi = bisect.bisect_right(self._by_date, (dates[1], "\uffff"))
+                candidates.append([(key, off) for _, key, off in self._by_date[lo:hi]])
+
+        if not candidates:
+            return []
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for other in candidates[1:]:
+            result.intersection_update(other)
+        return sorted(result)
+
+    def read(self, locations: list) -> Iterator[ShiftRecord]:
+        """Yield the shifts stored at the given locations, in order."""
+        files = self._partition_files()
+        current_key, f = None, None
+        try:
+            for key, offset in locations:
+                if key != current_key:
+                    if f:
+                        f.close()
+                    current_key, f = key, open(files[key], "rb")
+                f.seek(offset)
+                yield ShiftRecord.from_dict(json.loads(f.readline()))
+        finally:
+            if f:
+                f.close()
@@ -0,0 +1,492 @@
+# ==============================================================
+#  FILE: sqlite_store.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     SQLite storage for jobs, staff, shifts and hourly outputs.
+#     Shift filters and output totals run as indexed SQL queries;
+#     per-job progress (job_progress), per-day rollup cells
+#     (shift_rollup) and lost units per downtime reason
+#     (downtime_rollup) are updated in the same transaction as
+#     every shift insert.
+#     Includes a one-shot migrator from the data/*.json files:
+#
+#         python -m storage.sqlite_store [database file]
+# ==============================================================
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from typing import Optional
+
+from domain.models import DowntimeCell, Job, JobProgress, RollupCell, Staff, ShiftRecord, now_iso
+from storage.json_store import ensure_directory
+from storage.rollup import UNSPECIFIED_REASON, shift_downtime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_number      TEXT PRIMARY KEY,
+    customer_name   TEXT NOT NULL,
+    product         TEXT NOT NULL,
+    stocks          TEXT NOT NULL DEFAULT '[]',
+    target_quantity INTEGER NOT NULL DEFAULT 0,
+    status          TEXT NOT NULL DEFAULT 'Pending',
+    date_created    TEXT,
+    date_updated    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS staff (
+    staff_id    TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    role        TEXT,
+    shift_type  TEXT,
+    status      TEXT,
+    date_joined TEXT
+);
+
+CREATE TABLE IF NOT EXISTS shifts (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    shift_id     TEXT NOT NULL,
+    job_number   TEXT NOT NULL,
+    staff_name   TEXT NOT NULL,
+    shift_date   TEXT NOT NULL,
+    start_time   TEXT,
+    end_time     TEXT,
+    shift_type   TEXT,
+    total_output INTEGER NOT NULL DEFAULT 0,
+    timestamp    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS hourly_outputs (
+    shift_row  INTEGER NOT NULL REFERENCES shifts(id) ON DELETE CASCADE,
+    position   INTEGER NOT NULL,
+    hour_label TEXT NOT NULL,
+    quantity   INTEGER NOT NULL DEFAULT 0,
+    target     INTEGER NOT NULL DEFAULT 0,
+    comment    TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (shift_row, position)
+);
+
+CREATE TABLE IF NOT EXISTS job_progress (
+    job_number    TEXT PRIMARY KEY,
+    produced      INTEGER NOT NULL DEFAULT 0,
+    shift_count   INTEGER NOT NULL DEFAULT 0,
+    last_activity TEXT NOT NULL DEFAULT '',
+    target        INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS shift_rollup (
+    shift_date  TEXT NOT NULL,
+    job_number  TEXT NOT NULL,
+    staff_name  TEXT NOT NULL,
+    shift_type  TEXT NOT NULL DEFAULT '',
+    output      INTEGER NOT NULL DEFAULT 0,
+    target      INTEGER NOT NULL DEFAULT 0,
+    hours       INTEGER NOT NULL DEFAULT 0,
+    shift_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (shift_date, job_number, staff_name, shift_type)
+);
+
+CREATE TABLE IF NOT EXISTS downtime_rollup (
+    shift_date  TEXT NOT NULL,
+    job_number  TEXT NOT NULL,
+    staff_name  TEXT NOT NULL,
+    reason      TEXT NOT NULL,
+    lost_units  INTEGER NOT NULL DEFAULT 0,
+    hours       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (shift_date, job_number, staff_name, reason)
+);
+
+CREATE INDEX IF NOT EXISTS idx_shifts_job_number ON shifts(job_number);
+CREATE INDEX IF NOT EXISTS idx_shifts_staff_name ON shifts(staff_name);
+CREATE INDEX IF NOT EXISTS idx_shifts_shift_date ON shifts(shift_date);
+"""
+
+SHIFT_COLUMNS = (
+    "shift_id", "job_number", "staff_name", "shift_date",
+    "start_time", "end_time", "shift_type", "total_output", "timestamp",
+)
+
+
+class SqliteStore:
+    """Thread-aware wrapper around one SQLite database file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        ensure_directory(db_path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            if _progress_drifted(conn):
+                _rebuild_progress(conn)
+            if _rollup_drifted(conn) or not _downtime_built(conn):
+                _rebuild_rollup(conn)
+
+    # ------------------- CONNECTION -------------------
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------- JOBS -------------------
+    def list_jobs(self) -> list:
+        rows = self._connect().execute("SELECT * FROM jobs ORDER BY rowid")
+        return [_job_from_row(r) for r in rows]
+
+    def get_job(self, job_number: str) -> Optional[Job]:
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE job_number = ?", (job_number,)
+        ).fetchone()
+        return _job_from_row(row) if row else None
+
+    def add_job(self, job: Job) -> None:
+        with self._connect() as conn:
+            _insert_job(conn, job)
+            conn.execute(
+                "UPDATE job_progress SET target = ? WHERE job_number = ?",
+                (job.target, job.job_number),
+            )
+            _sync_job_status(conn, job.job_number)
+
+    def delete_job(self, job_number: str) -> None:
+        with self._connect() as conn:
+            # job_progress keeps the row: the job's shifts are still stored
+            conn.execute("DELETE FROM jobs WHERE job_number = ?", (job_number,))
+
+    def set_job_status(self, job_number: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, date_updated = ? WHERE job_number = ?",
+                (status, now_iso(), job_number),
+            )
+
+    def job_targets(self) -> dict:
+        rows = self._connect().execute("SELECT job_number, target_quantity FROM jobs")
+        return {r["job_number"]: r["target_quantity"] for r in rows}
+
+    # ------------------- STAFF -------------------
+    def list_staff(self) -> list:
+        rows = self._connect().execute("SELECT * FROM staff ORDER BY rowid")
+        return [Staff.from_dict(dict(r)) for r in rows]
+
+    def add_staff(self, staff: Staff) -> None:
+        with self._connect() as conn:
+            _insert_staff(conn, staff)
+
+    def set_staff_status(self, staff_id: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE staff SET status = ? WHERE staff_id = ?", (status, staff_id))
+
+    def delete_staff(self, staff_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM staff WHERE staff_id = ?", (staff_id,))
+
+    # ------------------- SHIFTS -------------------
+    def add_shift(self, shift: ShiftRecord) -> None:
+        with self._connect() as conn:
+            _insert_shift(conn, shift)
+
+    def add_shifts(self, shifts: list) -> None:
+        """Store many shifts in one transaction."""
+        with self._connect() as conn:
+            for shift in shifts:
+                _insert_shift(conn, shift)
+
+    def iter_shifts(self, job_number: str = "", staff_name: str = "",
+                    dates: Optional[tuple] = None, with_hours: bool = True):
+        """Stream shifts matching the filters.
+
+        Hourly rows come from a second cursor walked in step with the
+        shifts; pass with_hours=False to skip them when only shift totals
+        are needed.
+        """
+        conn = self._connect()
+        where, params = _shift_where(job_number, staff_name, dates)
+        sql = f"SELECT id, {', '.join(SHIFT_COLUMNS)} FROM shifts{where} ORDER BY id"
+        if not with_hours:
+            for row in conn.execute(sql, params):
+                yield ShiftRecord.from_dict(dict(row))
+            return
+
+        hours = conn.execute(
+            "SELECT shift_row, hour_label, quantity, target, comment FROM hourly_outputs "
+            f"WHERE shift_row IN (SELECT id FROM shifts{where}) ORDER BY shift_row, position",
+            params,
+        )
+        hour = hours.fetchone()
+        for row in conn.execute(sql, params):
+            shift = dict(row)
+            shift["hourly_outputs"] = outputs = []
+            while hour is not None and hour["shift_row"] <= row["id"]:
+                if hour["shift_row"] == row["id"]:
+                    outputs.append(dict(hour))
+                hour = hours.fetchone()
+            yield ShiftRecord.from_dict(shift)
+
+    def count_shifts(self, job_number: str = "", staff_name: str = "",
+                     dates: Optional[tuple] = None) -> int:
+        where, params = _shift_where(job_number, staff_name, dates)
+        return self._connect().execute(f"SELECT COUNT(*) FROM shifts{where}", params).fetchone()[0]
+
+    def query_shifts(self, job_number: str = "", staff_name: str = "",
+                     dates: Optional[tuple] = None) -> list:
+        return list(self.iter_shifts(job_number, staff_name, dates, with_hours=True))
+
+    def shifts_version(self) -> tuple:
+        """Cheap marker that changes whenever the stored shifts change."""
+        return tuple(self._connect().execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM shifts").fetchone())
+
+    def job_output_total(self, job_number: str) -> int:
+        progress = self.job_progress(job_number)
+        return progress.produced if progress else 0
+
+    # ------------------- JOB PROGRESS -------------------
+    # Rows of deleted jobs are kept so the totals still cover every stored
+    # shift; reads only return the jobs that exist.
+    def job_progress(self, job_number: str) -> Optional[JobProgress]:
+        row = self._connect().execute(
+            "SELECT p.* FROM job_progress p JOIN jobs j ON j.job_number = p.job_number "
+            "WHERE p.job_number = ?", (job_number,)
+        ).fetchone()
+        return JobProgress.from_dict(dict(row)) if row else None
+
+    def all_progress(self) -> dict:
+        rows = self._connect().execute(
+            "SELECT p.* FROM job_progress p JOIN jobs j ON j.job_number = p.job_number "
+            "ORDER BY p.rowid"
+        )
+        return {r["job_number"]: JobProgress.from_dict(dict(r)) for r in rows}
+
+    def rollup_cells(self, dates: Optional[tuple] = None) -> list:
+        """Pre-aggregated (date, job, staff, shift_type) totals, optionally for a date range."""
+        where, params = _shift_where("", "", dates)
+        rows = self._connect().execute(f"SELECT * FROM shift_rollup{where}", params)
+        return [RollupCell.from_dict(dict(r)) for r in rows]
+
+    def downtime_cells(self, dates: Optional[tuple] = None) -> list:
+        """Lost units per (date, job, staff, reason), optionally for a date range."""
+        where, params = _shift_where("", "", dates)
+        rows = self._connect().execute(f"SELECT * FROM downtime_rollup{where}", params)
+        return [DowntimeCell.from_dict(dict(r)) for r in rows]
+
+    def output_totals(self) -> tuple:
+        """Return (by_job, by_staff, by_day) output totals."""
+        conn = self._connect()
+        totals = []
+        for column in ("job_number", "staff_name", "shift_date"):
+            rows = conn.execute(
+                f"SELECT {column}, SUM(total_output) FROM shifts GROUP BY {column} ORDER BY MIN(id)"
+            )
+            totals.append({r[0]: r[1] for r in rows})
+        return tuple(totals)
+
+    # ------------------- MAINTENANCE -------------------
+    def reset(self) -> None:
+        with self._connect() as conn:
+            for table in ("hourly_outputs", "shifts", "job_progress", "shift_rollup",
+                          "downtime_rollup", "staff", "jobs"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def is_migrated(self) -> bool:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+        ).fetchone()
+        return row is not None
+
+    def migrate(self, jobs: list, staff: list, shifts: list) -> dict:
+        """Copy the JSON backend's jobs, staff and shifts into the database once."""
+        if self.is_migrated():
+            return {}
+        with self._connect() as conn:
+            for job in jobs:
+                _insert_job(conn, job)
+            for member in staff:
+                _insert_staff(conn, member)
+            for shift in shifts:
+                _insert_shift(conn, shift)
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from_json', datetime('now'))"
+            )
+        return {"jobs": len(jobs), "staff": len(staff), "shifts": len(shifts)}
+
+
+# ------------------- ROW HELPERS -------------------
+def _job_from_row(row) -> Job:
+    job = dict(row)
+    job["stocks"] = json.loads(job["stocks"] or "[]")
+    return Job.from_dict(job)
+
+
+def _insert_job(conn, job: Job) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO jobs (job_number, customer_name, product, stocks, "
+        "target_quantity, status, date_created, date_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (job.job_number, job.customer_name, job.product,
+         json.dumps([s.to_dict() for s in job.stocks], ensure_ascii=False), job.target,
+         job.status, job.date_created, job.date_updated),
+    )
+
+
+def _insert_staff(conn, staff: Staff) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO staff (staff_id, name, role, shift_type, status, date_joined) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (staff.staff_id, staff.name, staff.role, staff.shift_type, staff.status, staff.date_joined),
+    )
+
+
+def _insert_shift(conn, shift: ShiftRecord) -> None:
+    cur = conn.execute(
+        f"INSERT INTO shifts ({', '.join(SHIFT_COLUMNS)}) VALUES ({', '.join('?' * len(SHIFT_COLUMNS))})",
+        tuple(getattr(shift, c) for c in SHIFT_COLUMNS),
+    )
+    conn.executemany(
+        "INSERT INTO hourly_outputs (shift_row, position, hour_label, quantity, target, comment) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (cur.lastrowid, i, h.hour_label, h.quantity, h.target, h.comment)
+            for i, h in enumerate(shift.hourly_outputs)
+        ],
+    )
+    conn.execute(
+        "INSERT INTO job_progress (job_number, produced, shift_count, last_activity, target) "
+        "VALUES (?, ?, 1, ?, COALESCE((SELECT target_quantity FROM jobs WHERE job_number = ?), 0)) "
+        "ON CONFLICT (job_number) DO UPDATE SET "
+        "produced = produced + excluded.produced, shift_count = shift_count + 1, "
+        "last_activity = MAX(last_activity, excluded.last_activity), target = excluded.target",
+        (shift.job_number, shift.total_output, shift.shift_date or "", shift.job_number),
+    )
+    conn.execute(
+        "INSERT INTO shift_rollup (shift_date, job_number, staff_name, shift_type, "
+        "output, target, hours, shift_count) VALUES (?, ?, ?, ?, ?, ?, ?, 1) "
+        "ON CONFLICT (shift_date, job_number, staff_name, shift_type) DO UPDATE SET "
+        "output = output + excluded.output, target = target + excluded.target, "
+        "hours = hours + excluded.hours, shift_count = shift_count + 1",
+        (shift.shift_date, shift.job_number, shift.staff_name, shift.shift_type or "",
+         shift.total_output, sum(h.target for h in shift.hourly_outputs), len(shift.hourly_outputs)),
+    )
+    conn.executemany(
+        "INSERT INTO downtime_rollup (shift_date, job_number, staff_name, reason, lost_units, hours) "
+        "VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (shift_date, job_number, staff_name, reason) DO UPDATE SET "
+        "lost_units = lost_units + excluded.lost_units, hours = hours + excluded.hours",
+        [
+            (shift.shift_date, shift.job_number, shift.staff_name, reason, lost, hours)
+            for reason, (lost, hours) in shift_downtime(shift).items()
+        ],
+    )
+    _sync_job_status(conn, shift.job_number)
+
+
+def _sync_job_status(conn, job_number: str) -> None:
+    """Move a job to the status implied by its progress totals."""
+    row = conn.execute(
+        "SELECT p.*, j.status AS job_status FROM job_progress p "
+        "JOIN jobs j ON j.job_number = p.job_number WHERE p.job_number = ?",
+        (job_number,),
+    ).fetchone()
+    if row is None:
+        return
+    status = JobProgress.from_dict(dict(row)).job_status
+    if status != row["job_status"]:
+        conn.execute(
+            "UPDATE jobs SET status = ?, date_updated = ? WHERE job_number = ?",
+            (status, now_iso(), job_number),
+        )
+
+
+def _progress_drifted(conn) -> bool:
+    """True when job_progress no longer accounts for every stored shift."""
+    recorded = conn.execute("SELECT COALESCE(SUM(shift_count), 0) FROM job_progress").fetchone()[0]
+    stored = conn.execute("SELECT COUNT(*) FROM shifts").fetchone()[0]
+    return recorded != stored
+
+
+def _rebuild_progress(conn) -> None:
+    conn.execute("DELETE FROM job_progress")
+    conn.execute(
+        "INSERT INTO job_progress (job_number, produced, shift_count, last_activity, target) "
+        "SELECT s.job_number, SUM(s.total_output), COUNT(*), MAX(s.shift_date), "
+        "COALESCE(j.target_quantity, 0) FROM shifts s "
+        "LEFT JOIN jobs j ON j.job_number = s.job_number GROUP BY s.job_number ORDER BY MIN(s.id)"
+    )
+    for (job_number,) in conn.execute("SELECT job_number FROM job_progress").fetchall():
+        _sync_job_status(conn, job_number)
+
+
+def _rollup_drifted(conn) -> bool:
+    """True when shift_rollup no longer accounts for every stored shift."""
+    recorded = conn.execute("SELECT COALESCE(SUM(shift_count), 0) FROM shift_rollup").fetchone()[0]
+    stored = conn.execute("SELECT COUNT(*) FROM shifts").fetchone()[0]
+    return recorded != stored
+
+
+def _rebuild_rollup(conn) -> None:
+    conn.execute("DELETE FROM shift_rollup")
+    conn.execute(
+        "INSERT INTO shift_rollup (shift_date, job_number, staff_name, shift_type, "
+        "output, target, hours, shift_count) "
+        "SELECT s.shift_date, s.job_number, s.staff_name, COALESCE(s.shift_type, ''), "
+        "SUM(s.total_output), COALESCE(SUM(h.target), 0), COALESCE(SUM(h.hours), 0), COUNT(*) "
+        "FROM shifts s LEFT JOIN ("
+        "  SELECT shift_row, SUM(target) AS target, COUNT(*) AS hours "
+        "  FROM hourly_outputs GROUP BY shift_row"
+        ") h ON h.shift_row = s.id "
+        "GROUP BY s.shift_date, s.job_number, s.staff_name, COALESCE(s.shift_type, '')"
+    )
+    conn.execute("DELETE FROM downtime_rollup")
+    conn.execute(
+        "INSERT INTO downtime_rollup (shift_date, job_number, staff_name, reason, lost_units, hours) "
+        "SELECT s.shift_date, s.job_number, s.staff_name, COALESCE(NULLIF(h.comment, ''), ?), "
+        "SUM(h.target - h.quantity), COUNT(*) "
+        "FROM hourly_outputs h JOIN shifts s ON s.id = h.shift_row WHERE h.quantity < h.target "
+        "GROUP BY s.shift_date, s.job_number, s.staff_name, COALESCE(NULLIF(h.comment, ''), ?)",
+        (UNSPECIFIED_REASON, UNSPECIFIED_REASON),
+    )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('downtime_rollup', datetime('now'))")
+
+
+def _downtime_built(conn) -> bool:
+    return conn.execute("SELECT 1 FROM meta WHERE key = 'downtime_rollup'").fetchone() is not None
+
+
+def _shift_where(job_number: str, staff_name: str, dates: Optional[tuple]) -> tuple:
+    clauses, params = [], []
+    if job_number:
+        clauses.append("job_number = ?")
+        params.append(job_number)
+    if staff_name:
+        clauses.append("staff_name = ?")
+        params.append(staff_name)
+    if dates:
+        clauses.append("shift_date BETWEEN ? AND ?")
+        params.extend(dates)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+# ------------------- ONE-SHOT MIGRATION -------------------
+if __name__ == "__main__":
+    from storage.config import SQLITE_FILE
+    from storage.backends import JsonBackend
+
+    target = sys.argv[1] if len(sys.argv) > 1 else SQLITE_FILE
+    if os.path.exists(target) and SqliteStore(target).is_migrated():
+        print(f"{target} has already been migrated.")
+        sys.exit(0)
+    source = JsonBackend()
+    counts = SqliteStore(target).migrate(source.list_jobs(), source.list_staff(), source.query_shifts())
+    print(f"Migrated {counts['jobs']} jobs, {counts['staff']} staff and "
+          f"{counts['shifts']} shifts into {target}.")
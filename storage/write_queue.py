@@ -0,0 +1,120 @@
+# ==============================================================
+#  FILE: write_queue.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Write-behind queue for full-file saves. A background thread
+#     writes queued collections atomically; several saves of the
+#     same file within a short burst collapse into one write.
+#     Call flush() before the application exits; failed writes are
+#     kept until drain_errors() collects them.
+# ==============================================================
+
+import atexit
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from storage.json_store import save_json
+
+# How long the writer waits after the first queued save so that a burst
+# of edits to the same file is written once.
+COALESCE_DELAY = 0.05
+
+
+class WriteBehindQueue:
+    """Coalescing background writer keyed by file path."""
+
+    def __init__(self, delay: float = COALESCE_DELAY):
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending = {}       # file_path -> (data, encode, on_written, on_failed)
+        self._in_flight = set()
+        self._errors = []
+        self._thread = None
+
+    def submit(self, file_path: str, data: Any,
+               encode: Optional[Callable[[Any], Any]] = None,
+               on_written: Optional[Callable[[str, Any], None]] = None,
+               on_failed: Optional[Callable[[str, Any], None]] = None) -> None:
+        """Queue data for file_path, replacing any save still waiting.
+
+        encode runs on the writer thread and turns data into JSON-ready
+        values; on_written(file_path, data) is called after the file is on
+        disk, on_failed(file_path, data) when the write raised.
+        """
+        with self._cond:
+            self._pending[file_path] = (data, encode, on_written, on_failed)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def is_pending(self, file_path: str) -> bool:
+        """True while a save for file_path is queued or being written."""
+        with self._cond:
+            return file_path in self._pending or file_path in self._in_flight
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued save is written; False on timeout.
+
+        Failed writes stay recorded for drain_errors().
+        """
+        with self._cond:
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def drain_errors(self) -> list:
+        """Return and forget the (file_path, exception) pairs of failed writes."""
+        with self._cond:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+            time.sleep(self.delay)
+
+            with self._cond:
+                batch, self._pending = self._pending, {}
+                self._in_flight = set(batch)
+
+            for file_path, (data, encode, on_written, on_failed) in batch.items():
+                try:
+                    save_json(file_path, encode(data) if encode else data, indent=None)
+                    if on_written:
+                        on_written(file_path, data)
+                except Exception as e:
+                    with self._cond:
+                        self._errors.append((file_path, e))
+                    if on_failed:
+                        on_failed(file_path, data)
+
+            with self._cond:
+                self._in_flight = set()
+                self._cond.notify_all()
+
+
+_queue = WriteBehindQueue()
+
+
+def submit(file_path: str, data: Any, encode=None, on_written=None, on_failed=None) -> None:
+    """Queue a full save of file_path on the shared writer."""
+    _queue.submit(file_path, data, encode, on_written, on_failed)
+
+
+def is_pending(file_path: str) -> bool:
+    return _queue.is_pending(file_path)
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """Wait for the shared writer to finish; see WriteBehindQueue.flush."""
+    return _queue.flush(timeout)
+
+
+def drain_errors() -> list:
+    """Return and forget the shared writer's failed writes."""
+    return _queue.drain_errors()
+
+
+atexit.register(flush)
@@ -0,0 +1,60 @@
+# ==============================================================
+#  FILE: test_counters.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Shifts built from counter export lines must cover every hour
+#     from start to end in shift order, whatever order the lines
+#     come in and whether or not an hour has lines.
+# ==============================================================
+
+from domain.hours import hour_slots
+from ingest.counters import _ShiftBuilder
+
+
+def _build(lines) -> object:
+    builder = _ShiftBuilder("Morning")
+    for hour, quantity in lines:
+        builder.add(hour, quantity, "")
+    return builder.build("2025-03-04", "900001", "Operator 0001")
+
+
+def _quantities(shift) -> list:
+    return [(h.hour_label[:5], h.quantity) for h in shift.hourly_outputs]
+
+
+def test_unsorted_lines_build_shift_in_hour_order():
+    shift = _build([("09:00", 30), ("06:00", 10), ("08:00", 20), ("07:00", 15), ("06:00", 5)])
+
+    assert (shift.start_time, shift.end_time) == ("06:00", "10:00")
+    assert shift.shift_id == "900001-2025-03-04-0600"
+    assert _quantities(shift) == [("06:00", 15), ("07:00", 15), ("08:00", 20), ("09:00", 30)]
+    assert [(h.hour_label, h.target) for h in shift.hourly_outputs] == hour_slots("06:00", "10:00")
+    assert shift.total_output == 80
+
+
+def test_missing_hours_are_kept_with_zero_quantity():
+    shift = _build([("13:00", 40), ("06:00", 10), ("09:00", 25)])
+
+    assert (shift.start_time, shift.end_time) == ("06:00", "14:00")
+    assert [(h.hour_label, h.target) for h in shift.hourly_outputs] == hour_slots("06:00", "14:00")
+    assert dict(_quantities(shift)) == {
+        "06:00": 10, "07:00": 0, "08:00": 0, "09:00": 25,
+        "10:00": 0, "11:00": 0, "12:00": 0, "13:00": 40,
+    }
+    assert shift.total_output == 75
+
+
+def test_overnight_hours_follow_the_start():
+    shift = _build([("02:00", 7), ("23:00", 3), ("00:00", 4), ("22:00", 1)])
+
+    assert (shift.start_time, shift.end_time) == ("22:00", "03:00")
+    assert shift.shift_id == "900001-2025-03-04-2200"
+    assert _quantities(shift) == [("22:00", 1), ("23:00", 3), ("00:00", 4), ("01:00", 0), ("02:00", 7)]
+    assert shift.hourly_outputs[-1].hour_label == "02:00-03:00"
+
+
+def test_single_hour_before_midnight():
+    shift = _build([("23:00", 9)])
+
+    assert (shift.start_time, shift.end_time) == ("23:00", "00:00")
+    assert _quantities(shift) == [("23:00", 9)]
@@ -0,0 +1,71 @@
+# ==============================================================
+#  FILE: test_hours.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Running totals of domain.hours.ShiftHours must always equal
+#     the prefix sums of its rows.
+# ==============================================================
+
+from itertools import accumulate
+
+from domain.hours import ShiftHours, hour_slots
+
+
+def _assert_prefix_sums(hours: ShiftHours) -> None:
+    assert hours.cum_quantity == list(accumulate(r.quantity for r in hours))
+    assert hours.cum_target == list(accumulate(r.target for r in hours))
+    assert hours.total_quantity == sum(r.quantity for r in hours)
+    assert hours.total_target == sum(r.target for r in hours)
+
+
+def _shift() -> ShiftHours:
+    return ShiftHours(hour_slots("06:00", "14:00"))
+
+
+def test_new_shift_totals():
+    hours = _shift()
+    assert len(hours) == 8
+    assert hours.total_quantity == 0
+    _assert_prefix_sums(hours)
+
+
+def test_set_quantities_recomputes_from_first_change():
+    hours = _shift()
+    assert hours.set_quantities({5: 2000, 2: 1800, 7: 2500}) == 2
+    _assert_prefix_sums(hours)
+
+    assert hours.set_quantities({2: 1800, 5: 2000}) is None     # nothing changed
+    assert hours.set_quantities({0: 100, 5: 2001}) == 0
+    _assert_prefix_sums(hours)
+
+
+def test_set_quantity_keeps_comment_unless_given():
+    hours = _shift()
+    hours.set_quantity(3, 1200, "Machine cleaning")
+    hours.set_quantity(3, 1300)
+    assert hours[3].comment == "Machine cleaning"
+    _assert_prefix_sums(hours)
+
+
+def test_remove_rows():
+    hours = _shift()
+    hours.set_quantities({i: 1000 + i for i in range(8)})
+    for index in (7, 0, 3):
+        assert hours.remove(index) == index
+        _assert_prefix_sums(hours)
+    assert len(hours) == 5
+
+    while len(hours):
+        hours.remove(0)
+    _assert_prefix_sums(hours)
+    assert hours.total_quantity == hours.total_target == 0
+
+
+def test_mixed_updates_match_prefix_sums():
+    hours = ShiftHours(hour_slots("22:00", "23:59"))
+    hours.set_quantity(0, 2400)
+    hours.set_quantities({1: 900})
+    hours.remove(0)
+    hours.set_quantity(0, 950)
+    _assert_prefix_sums(hours)
+    assert hours.first_pending() is None
@@ -0,0 +1,153 @@
+# ==============================================================
+#  FILE: test_json_store.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Journal, compaction and streaming behaviour of
+#     storage.json_store.
+# ==============================================================
+
+import io
+import json
+import os
+
+import pytest
+
+from storage import json_store
+from storage.json_store import (
+    append_json, compact_journal, extend_jsonl, iter_records, journal_path, load_json, save_json
+)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / "records.json")
+    yield path
+    json_store._journal_lines.pop(path, None)
+    json_store._folds.pop(path, None)
+
+
+# ------------------- JOURNAL + COMPACTION -------------------
+def test_compaction_merges_journal_into_snapshot(snapshot):
+    save_json(snapshot, [{"n": 0}])
+    for n in range(1, 4):
+        append_json(snapshot, {"n": n})
+
+    compact_journal(snapshot)
+
+    with open(snapshot, encoding="utf-8") as f:
+        assert [r["n"] for r in json.load(f)] == [0, 1, 2, 3]
+    assert load_json(snapshot, default=[]) == [{"n": n} for n in range(4)]
+
+
+def test_save_during_compaction_wins(snapshot, monkeypatch):
+    save_json(snapshot, [{"n": 0}])
+    append_json(snapshot, {"n": 1})
+
+    # A full save lands after the journal was rotated aside but before
+    # the merged snapshot is swapped in.
+    read_journal = json_store._read_journal
+
+    def save_mid_merge(path):
+        records = read_journal(path)
+        save_json(snapshot, [{"n": "saved"}])
+        return records
+
+    monkeypatch.setattr(json_store, "_read_journal", save_mid_merge)
+    compact_journal(snapshot)
+    monkeypatch.undo()
+
+    assert load_json(snapshot, default=[]) == [{"n": "saved"}]
+    assert not os.path.exists(snapshot + ".compact.tmp")
+
+
+def test_append_during_compaction_is_kept(snapshot, monkeypatch):
+    save_json(snapshot, [{"n": 0}])
+    append_json(snapshot, {"n": 1})
+
+    read_journal = json_store._read_journal
+
+    def append_mid_merge(path):
+        records = read_journal(path)
+        append_json(snapshot, {"n": 2})
+        return records
+
+    monkeypatch.setattr(json_store, "_read_journal", append_mid_merge)
+    compact_journal(snapshot)
+    monkeypatch.undo()
+
+    assert load_json(snapshot, default=[]) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_compaction_applies_registered_fold(snapshot):
+    json_store.register_fold(snapshot, lambda records: [{"n": sum(r["n"] for r in records)}])
+    save_json(snapshot, [{"n": 1}])
+    append_json(snapshot, {"n": 2})
+    append_json(snapshot, {"n": 3})
+
+    compact_journal(snapshot)
+
+    assert load_json(snapshot, default=[]) == [{"n": 6}]
+
+
+# ------------------- TORN JOURNAL LINES -------------------
+def test_torn_final_journal_line_is_skipped(snapshot):
+    save_json(snapshot, [{"n": 0}])
+    with open(journal_path(snapshot), "w", encoding="utf-8") as f:
+        f.write('{"n": 1}\n{"n": 2')          # crash mid-append
+
+    assert load_json(snapshot, default=[]) == [{"n": 0}, {"n": 1}]
+    assert list(iter_records(snapshot)) == [{"n": 0}, {"n": 1}]
+
+
+def test_append_after_torn_journal_line_is_kept(snapshot):
+    save_json(snapshot, [])
+    with open(journal_path(snapshot), "w", encoding="utf-8") as f:
+        f.write('{"n": 1}\n{"n": 2')
+
+    append_json(snapshot, {"n": 3})
+
+    assert load_json(snapshot, default=[]) == [{"n": 1}, {"n": 3}]
+
+
+def test_extend_jsonl_after_torn_line(tmp_path):
+    path = str(tmp_path / "10.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"n": 1}\n{"n": ')
+
+    spans = extend_jsonl(path, [{"n": 2}, {"n": 3}])
+
+    assert list(iter_records(path)) == [{"n": 1}, {"n": 2}, {"n": 3}]
+    with open(path, "rb") as f:
+        data = f.read()
+    assert [json.loads(data[start:end]) for start, end in spans] == [{"n": 2}, {"n": 3}]
+
+
+# ------------------- STREAMING -------------------
+RECORDS = [
+    {"id": i, "text": "brackets ] [ and, commas" * (i % 4), "nested": {"list": list(range(i % 7))},
+     "unicode": "Ümamco ✓" if i % 3 else ""}
+    for i in range(200)
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_array_across_chunk_boundaries(monkeypatch, chunk_size, indent):
+    monkeypatch.setattr(json_store, "STREAM_CHUNK_SIZE", chunk_size)
+    text = json.dumps(RECORDS, indent=indent, ensure_ascii=False)
+
+    assert list(json_store._iter_array(io.StringIO(text))) == RECORDS
+
+
+@pytest.mark.parametrize("chunk_size", [3, 64])
+def test_iter_array_stops_at_truncated_tail(monkeypatch, chunk_size):
+    monkeypatch.setattr(json_store, "STREAM_CHUNK_SIZE", chunk_size)
+    text = json.dumps(RECORDS[:5])
+    cut = text.rindex('{"id": 4')
+
+    assert list(json_store._iter_array(io.StringIO(text[:cut + 10]))) == RECORDS[:4]
+
+
+def test_iter_array_empty_and_not_an_array():
+    assert list(json_store._iter_array(io.StringIO("[]"))) == []
+    assert list(json_store._iter_array(io.StringIO('{"a": 1}'))) == []
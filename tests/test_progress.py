@@ -0,0 +1,69 @@
+# ==============================================================
+#  FILE: test_progress.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     storage.progress.ProgressTable journals per-job deltas on a
+#     shift save; reloading and compaction fold them into one row
+#     per job with the same totals.
+# ==============================================================
+
+import os
+
+import pytest
+
+from domain.models import ShiftRecord
+from storage import json_store, repository, write_queue
+from storage.json_store import compact_journal, journal_path, load_json
+from storage.progress import ProgressTable
+
+
+def _shift(n: int, job: str, output: int) -> ShiftRecord:
+    return ShiftRecord(
+        shift_id=f"{job}-{n}", job_number=job, staff_name="Operator", shift_date=f"2025-01-{n:02d}",
+        start_time="06:00", end_time="14:00", shift_type="Day", hourly_outputs=[], total_output=output,
+    )
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = str(tmp_path / "production.json")
+    stored = []
+    table = ProgressTable(path, lambda: len(stored), lambda: (list(stored), {}))
+
+    def save(shifts, targets):
+        stored.extend(shifts)
+        return table.record_many(shifts, targets)
+
+    yield path, table, save
+    write_queue.flush()
+    write_queue.drain_errors()
+    repository.invalidate()
+    json_store._journal_lines.pop(path, None)
+    json_store._folds.pop(path, None)
+
+
+def _totals(rows: dict) -> dict:
+    return {job: (p.produced, p.shift_count, p.last_activity, p.target) for job, p in rows.items()}
+
+
+def test_shift_saves_are_journaled_and_fold_on_reload(table):
+    path, progress, save = table
+    save([_shift(1, "A", 100)], {"A": 1000})        # first save builds the table in full
+    write_queue.flush()
+    for n in range(2, 6):
+        save([_shift(n, "A", 100), _shift(n, "B", 50)], {"A": 1000, "B": 500})
+    progress.set_target("B", 800)
+    expected = _totals(progress.all())
+
+    assert os.path.exists(journal_path(path))       # later saves only appended deltas
+    repository.invalidate()
+    progress.reset()
+    assert _totals(progress.all()) == expected
+    assert expected["A"] == (500, 5, "2025-01-05", 1000)
+    assert expected["B"] == (200, 4, "2025-01-05", 800)
+
+    compact_journal(path)
+    assert len(load_json(path, default=[])) == 2
+    repository.invalidate()
+    progress.reset()
+    assert _totals(progress.all()) == expected
@@ -0,0 +1,45 @@
+# ==============================================================
+#  FILE: test_repository.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Cached collections in storage.repository: appends extend the
+#     cached list in place and survive a queued full save.
+# ==============================================================
+
+import pytest
+
+from storage import json_store, repository, write_queue
+from storage.json_store import load_json, save_json
+
+
+@pytest.fixture
+def collection(tmp_path):
+    path = str(tmp_path / "records.json")
+    save_json(path, [{"n": 0}])
+    yield path
+    write_queue.flush()
+    write_queue.drain_errors()
+    repository.invalidate()
+    json_store._journal_lines.pop(path, None)
+
+
+def test_append_extends_cached_list_in_place(collection):
+    cached = repository.load_collection(collection)
+    for n in range(1, 4):
+        repository.append_record(collection, {"n": n})
+
+    assert repository.load_collection(collection) is cached
+    assert cached == [{"n": n} for n in range(4)]
+    assert load_json(collection, default=[]) == cached
+
+
+def test_append_while_save_is_queued_is_kept(collection, monkeypatch):
+    monkeypatch.setattr(write_queue._queue, "delay", 0.2)   # keep the save queued
+    repository.save_collection(collection, [{"n": "saved"}])
+    repository.append_record(collection, {"n": 1})
+    write_queue.flush()
+
+    assert write_queue.drain_errors() == []
+    assert load_json(collection, default=[]) == [{"n": "saved"}, {"n": 1}]
+    repository.invalidate()
+    assert repository.load_collection(collection) == [{"n": "saved"}, {"n": 1}]
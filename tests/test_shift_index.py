@@ -0,0 +1,145 @@
+# ==============================================================
+#  FILE: test_shift_index.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     ShiftIndex lookups over monthly partitions must return the
+#     same shifts as a linear filter over the full history.
+# ==============================================================
+
+import os
+import threading
+from datetime import date
+
+import pytest
+
+from benchmarks.synthetic import generate
+from storage import repository
+from storage.partitions import ShiftPartitions
+from storage.shift_index import ShiftIndex, index_path
+
+
+def _key(shift) -> tuple:
+    return shift.shift_id, shift.staff_name, shift.shift_date
+
+
+def _linear(shifts, job_number="", staff_name="", dates=None) -> list:
+    return sorted(
+        _key(s) for s in shifts
+        if (not job_number or s.job_number == job_number)
+        and (not staff_name or s.staff_name == staff_name)
+        and (dates is None or dates[0] <= s.shift_date <= dates[1])
+    )
+
+
+def _indexed(partitions, job_number="", staff_name="", dates=None) -> list:
+    locations = partitions.index.lookup(job_number, staff_name, dates)
+    return sorted(_key(s) for s in partitions.index.read(locations))
+
+
+@pytest.fixture
+def history(tmp_path):
+    _jobs, _staff, shifts = generate(jobs=6, staff=5, shifts=400, start=date(2024, 11, 20))
+    root = str(tmp_path / "shifts")
+    partitions = ShiftPartitions(root)
+    partitions.extend(shifts[:300])            # batched writes
+    for shift in shifts[300:]:                 # single appends
+        partitions.append(shift)
+    yield root, partitions, shifts
+    repository.invalidate()
+
+
+FILTERS = [
+    {"job_number": "900002"},
+    {"staff_name": "Operator 0003"},
+    {"dates": ("2024-12-01", "2024-12-31")},
+    {"dates": ("2024-11-30", "2025-01-02")},
+    {"job_number": "900001", "staff_name": "Operator 0001"},
+    {"job_number": "900004", "dates": ("2024-12-15", "2025-02-01")},
+    {"job_number": "900000", "staff_name": "Operator 0002", "dates": ("2024-11-01", "2025-12-31")},
+    {"job_number": "missing"},
+    {"dates": ("2030-01-01", "2030-12-31")},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_lookup_matches_linear_filter(history, filters):
+    _root, partitions, shifts = history
+    assert _indexed(partitions, **filters) == _linear(shifts, **filters)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_lookup_after_reload_from_sidecars(history, filters):
+    root, _partitions, shifts = history
+    reopened = ShiftPartitions(root)
+    assert _indexed(reopened, **filters) == _linear(shifts, **filters)
+
+
+def test_lookup_rebuilds_missing_sidecar(history):
+    root, partitions, shifts = history
+    for path in partitions.partition_files().values():
+        os.remove(index_path(path))
+
+    reopened = ShiftPartitions(root)
+    for filters in FILTERS:
+        assert _indexed(reopened, **filters) == _linear(shifts, **filters)
+
+
+def test_lookup_sees_shifts_appended_after_load(history):
+    _root, partitions, shifts = history
+    _indexed(partitions, job_number="900002")          # load the index
+    _jobs, _staff, more = generate(jobs=6, staff=5, shifts=40, seed=2, start=date(2025, 3, 1))
+    partitions.extend(more)
+
+    for filters in FILTERS:
+        assert _indexed(partitions, **filters) == _linear(shifts + more, **filters)
+
+
+def test_concurrent_extend_and_lookup_do_not_deadlock(history):
+    _root, partitions, shifts = history
+    _jobs, _staff, more = generate(jobs=6, staff=5, shifts=600, seed=3, start=date(2025, 7, 1))
+    errors = []
+
+    def writer():
+        try:
+            for i in range(0, len(more), 5):
+                partitions.extend(more[i:i + 5])
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(300):
+                partitions.index.lookup(job_number="900001")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, daemon=True), threading.Thread(target=reader, daemon=True)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=20)
+    assert not any(t.is_alive() for t in threads), "extend and lookup deadlocked"
+    assert not errors
+    assert _indexed(partitions, job_number="900001") == _linear(shifts + more, job_number="900001")
+
+
+def test_torn_tail_does_not_rebuild_sidecar(history, monkeypatch):
+    root, partitions, shifts = history
+    path = sorted(partitions.partition_files().values())[-1]
+    with open(path, "ab") as f:
+        f.write(b'{"shift_id": "torn", "job_nu')        # crash mid-write
+
+    rebuilt = []
+    rebuild = ShiftIndex._rebuild_partition
+    monkeypatch.setattr(ShiftIndex, "_rebuild_partition",
+                        lambda self, p: rebuilt.append(p) or rebuild(self, p))
+    for _ in range(2):
+        reopened = ShiftPartitions(root)
+        for filters in FILTERS:
+            assert _indexed(reopened, **filters) == _linear(shifts, **filters)
+    assert rebuilt == []
+
+    _jobs, _staff, more = generate(jobs=6, staff=5, shifts=20, seed=4, start=date(2025, 1, 10))
+    reopened.extend(more)
+    for filters in FILTERS:
+        assert _indexed(reopened, **filters) == _linear(shifts + more, **filters)
@@ -0,0 +1,119 @@
+# ==============================================================
+#  FILE: charts.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Persistent matplotlib charts for Tk frames. Each chart owns
+#     one Figure and one FigureCanvasTkAgg for the life of the tab;
+#     a refresh updates the bar heights or line data in place and
+#     asks for a draw_idle(). Bars are only recreated when the
+#     number of categories changes. pyplot is not used, so no
+#     global figure state is kept.
+# ==============================================================
+
+from tkinter import ttk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class Chart:
+    """One figure with a single Axes, plus a placeholder message for empty data."""
+
+    def __init__(self, parent, title: str, xlabel: str = "", ylabel: str = "",
+                 figsize=(5.5, 3.2)):
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, linestyle="--", alpha=0.5)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.widget = self.canvas.get_tk_widget()
+        self.lbl_message = ttk.Label(parent, font=("Segoe UI", 10, "italic"), foreground="gray")
+        self._mode = None   # "chart" or "message" once something is packed
+
+    def show_message(self, text: str) -> None:
+        """Hide the chart and show text in its place."""
+        self.lbl_message.config(text=text)
+        if self._mode != "message":
+            self.widget.pack_forget()
+            self.lbl_message.pack(pady=20)
+            self._mode = "message"
+
+    def _redraw(self) -> None:
+        if self._mode != "chart":
+            self.lbl_message.pack_forget()
+            self.widget.pack(fill="both", expand=True)
+            self._mode = "chart"
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+
+class BarChart(Chart):
+    """Bar chart over named categories; horizontal=True draws barh."""
+
+    def __init__(self, parent, title: str, xlabel: str = "", ylabel: str = "",
+                 color: str = "steelblue", horizontal: bool = False, figsize=(5.5, 3.2)):
+        super().__init__(parent, title, xlabel, ylabel, figsize)
+        self.color = color
+        self.horizontal = horizontal
+        self._bars = None
+
+    def update(self, labels, values) -> None:
+        self._set_bars(list(labels), list(values))
+        self._redraw()
+
+    def _set_bars(self, labels: list, values: list) -> None:
+        positions = range(len(values))
+        if self._bars is None or len(self._bars) != len(values):
+            if self._bars is not None:
+                self._bars.remove()
+            draw = self.ax.barh if self.horizontal else self.ax.bar
+            self._bars = draw(positions, values, color=self.color)
+        else:
+            for bar, value in zip(self._bars, values):
+                if self.horizontal:
+                    bar.set_width(value)
+                else:
+                    bar.set_height(value)
+
+        if self.horizontal:
+            self.ax.set_yticks(positions, labels)
+        else:
+            self.ax.set_xticks(positions, labels)
+
+
+class ParetoChart(BarChart):
+    """Bars sorted largest first, with the cumulative share as a line on a 0-100% axis."""
+
+    def __init__(self, parent, title: str, xlabel: str = "", ylabel: str = "",
+                 color: str = "indianred", line_color: str = "dimgray", figsize=(5.5, 3.2)):
+        super().__init__(parent, title, xlabel, ylabel, color, figsize=figsize)
+        self.ax.tick_params(axis="x", labelrotation=30)
+        self.ax_share = self.ax.twinx()
+        self.ax_share.set_ylim(0, 105)
+        self.ax_share.set_ylabel("Cumulative %")
+        (self._line,) = self.ax_share.plot([], [], marker="o", color=line_color, linewidth=1.5)
+
+    def update(self, labels, values, cumulative) -> None:
+        self._set_bars(list(labels), list(values))
+        self._line.set_data(range(len(self._bars)), list(cumulative))
+        self._redraw()
+
+
+class LineChart(Chart):
+    """Single line with point markers over labelled, evenly spaced points."""
+
+    def __init__(self, parent, title: str, xlabel: str = "", ylabel: str = "",
+                 color: str = "mediumpurple", figsize=(5.5, 3.2)):
+        super().__init__(parent, title, xlabel, ylabel, figsize)
+        (self._line,) = self.ax.plot([], [], marker="o", color=color, linewidth=2)
+
+    def update(self, labels, values) -> None:
+        labels, values = list(labels), list(values)
+        positions = range(len(values))
+        self._line.set_data(positions, values)
+        self.ax.set_xticks(positions, labels)
+        self._redraw()
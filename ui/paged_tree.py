@@ -0,0 +1,169 @@
+# ==============================================================
+#  FILE: paged_tree.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Paged Treeview for large reports. The full result set stays
+#     in a plain Python list; only the rows scrolled into view (a
+#     page at a time) become Treeview items, kept in step with the
+#     list through a keyed TreeBinding. Scrolling inserts just the
+#     next (or previous) page, and at most MAX_PAGES pages are kept
+#     as items; pages scrolled far away are deleted and re-created
+#     when scrolled back to. Clicking a column heading sorts the
+#     list and re-materializes the first page.
+# ==============================================================
+
+from tkinter import ttk
+
+from ui.table_binding import TreeBinding
+
+# Number of rows turned into Treeview items per page.
+PAGE_SIZE = 200
+
+# Most pages kept as Treeview items at once.
+MAX_PAGES = 5
+
+# Load the next (previous) page once the view is this close to the
+# bottom (top), as a fraction of the materialized rows.
+PREFETCH_MARGIN = 0.1
+
+
+def _sort_key(value):
+    """Order numbers (including "12.5%" and "1,200") numerically, text alphabetically."""
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    text = str(value)
+    try:
+        return (0, float(text.replace(",", "").rstrip("%")), "")
+    except ValueError:
+        return (1, 0, text.lower())
+
+
+class PagedTreeview:
+    """Treeview wrapper that materializes rows in pages as the user scrolls.
+
+    Rows are (key, values, tag) triples; keys must be unique and tag
+    may be None.
+    """
+
+    def __init__(self, parent, columns, widths, height=12, page_size=PAGE_SIZE,
+                 max_pages=MAX_PAGES):
+        self.frame = ttk.Frame(parent)
+        self.columns = tuple(columns)
+        self.page_size = page_size
+        self.max_rows = page_size * max_pages
+
+        self.tree = ttk.Treeview(self.frame, columns=self.columns, show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+
+        for col, width in zip(self.columns, widths):
+            self.tree.heading(col, text=col.upper(), command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=width, anchor="center")
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._binding = TreeBinding(self.tree)
+        self._rows = []
+        self._first = 0          # self._rows[_first:_shown] are Treeview items
+        self._shown = 0
+        self._sort_column = None
+        self._sort_descending = False
+        self._loading = False
+
+    # ------------------- DATA -------------------
+    @property
+    def rows(self) -> list:
+        """Every row of the result set, in the current sort order."""
+        return self._rows
+
+    def set_rows(self, rows) -> None:
+        """Replace the result set, updating only the on-screen items that changed."""
+        self._rows = list(rows)
+        if self._sort_column is not None:
+            self._sort_rows()
+        self._shown = min(len(self._rows), max(self._shown, self._first + self.page_size))
+        self._first = max(0, min(self._first, self._shown - self.page_size))
+        self._sync()
+
+    def sort_by(self, column: str) -> None:
+        """Sort on a column; clicking the same column again reverses the order."""
+        if column == self._sort_column:
+            self._sort_descending = not self._sort_descending
+        else:
+            self._sort_column, self._sort_descending = column, False
+        self._sort_rows()
+        self._update_headings()
+        self._rematerialize()
+
+    def _sort_rows(self) -> None:
+        index = self.columns.index(self._sort_column)
+        self._rows.sort(key=lambda row: _sort_key(row[1][index]), reverse=self._sort_descending)
+
+    def _update_headings(self) -> None:
+        for col in self.columns:
+            arrow = ""
+            if col == self._sort_column:
+                arrow = " ▼" if self._sort_descending else " ▲"
+            self.tree.heading(col, text=col.upper() + arrow)
+
+    # ------------------- PAGING -------------------
+    def _window(self, start: int, stop: int):
+        return ((key, values, (tag,) if tag else ()) for key, values, tag in self._rows[start:stop])
+
+    def _sync(self) -> None:
+        self._binding.sync(self._window(self._first, self._shown))
+
+    def _rematerialize(self) -> None:
+        self._first, self._shown = 0, min(len(self._rows), self.page_size)
+        self._sync()
+        self.tree.yview_moveto(0)
+
+    def _top_index(self) -> int:
+        """Position of the first visible item among the materialized ones."""
+        return round(float(self.tree.yview()[0]) * len(self._binding))
+
+    def _scroll_to(self, index: int) -> None:
+        if len(self._binding):
+            self.tree.yview_moveto(max(0, index) / len(self._binding))
+
+    def _load_next(self) -> None:
+        """Add the page below the materialized rows, dropping pages from the top past max_rows."""
+        self._loading = False
+        stop = min(len(self._rows), self._shown + self.page_size)
+        if stop <= self._shown:
+            return
+        self._binding.insert(len(self._binding), self._window(self._shown, stop))
+        self._shown = stop
+        excess = self._shown - self._first - self.max_rows
+        if excess > 0:
+            top = self._top_index()
+            self._binding.remove(0, excess)
+            self._first += excess
+            self._scroll_to(top - excess)
+
+    def _load_previous(self) -> None:
+        """Re-create the page above the materialized rows, dropping pages from the bottom."""
+        self._loading = False
+        start = max(0, self._first - self.page_size)
+        if start >= self._first:
+            return
+        top = self._top_index()
+        added = self._binding.insert(0, self._window(start, self._first))
+        self._first = start
+        excess = self._shown - self._first - self.max_rows
+        if excess > 0:
+            self._binding.remove(len(self._binding) - excess, len(self._binding))
+            self._shown -= excess
+        self._scroll_to(top + added)
+
+    def _on_yscroll(self, first, last) -> None:
+        self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        if float(last) >= 1 - PREFETCH_MARGIN and self._shown < len(self._rows):
+            self._loading = True
+            self.tree.after_idle(self._load_next)
+        elif float(first) <= PREFETCH_MARGIN and self._first > 0:
+            self._loading = True
+            self.tree.after_idle(self._load_previous)
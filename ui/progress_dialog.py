@@ -0,0 +1,94 @@
+# ==============================================================
+#  FILE: progress_dialog.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Small progress window for long-running work (exports). The
+#     work runs on a worker thread and reports progress; the Tk
+#     thread polls it with after() and offers a Cancel button.
+# ==============================================================
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+# How often (ms) the dialog reads the worker's progress.
+POLL_INTERVAL_MS = 100
+
+
+class TaskProgressDialog:
+    """Runs work(task) on a thread while showing its progress.
+
+    The worker calls task.report(done, total) and checks task.cancelled;
+    on_done(result) or on_error(exception) run on the Tk thread once the
+    work has finished.
+    """
+
+    def __init__(self, parent, title: str, unit: str = "records"):
+        self.unit = unit
+        self._cancel = threading.Event()
+        self._progress = (0, 0)   # (done, total) written by the worker
+        self._outcome = None      # (result, error) once the worker returns
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("360x130")
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.lbl_status = ttk.Label(self.window, text="Starting…")
+        self.lbl_status.pack(pady=(14, 6))
+        self.bar = ttk.Progressbar(self.window, mode="indeterminate", length=300)
+        self.bar.pack(pady=4)
+        self.bar.start(15)
+        self.btn_cancel = ttk.Button(self.window, text="Cancel", command=self.cancel)
+        self.btn_cancel.pack(pady=8)
+
+    # ------------------- WORKER SIDE -------------------
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, done: int, total: int = 0) -> None:
+        """Record progress; safe to call from the worker thread."""
+        self._progress = (done, total)
+
+    # ------------------- TK SIDE -------------------
+    def cancel(self) -> None:
+        self._cancel.set()
+        self.btn_cancel.config(state="disabled")
+        self.lbl_status.config(text="Cancelling…")
+
+    def run(self, work: Callable[["TaskProgressDialog"], Any],
+            on_done: Callable[[Any], None],
+            on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        def target():
+            try:
+                self._outcome = (work(self), None)
+            except Exception as e:
+                self._outcome = (None, e)
+
+        threading.Thread(target=target, name="export", daemon=True).start()
+        self.window.after(POLL_INTERVAL_MS, lambda: self._poll(on_done, on_error))
+
+    def _poll(self, on_done, on_error) -> None:
+        if self._outcome is None:
+            done, total = self._progress
+            if total and str(self.bar["mode"]) != "determinate":
+                self.bar.stop()
+                self.bar.config(mode="determinate", maximum=total)
+            if total:
+                self.bar["value"] = done
+            if not self.cancelled:
+                suffix = f" of {total:,}" if total else ""
+                self.lbl_status.config(text=f"{done:,}{suffix} {self.unit}")
+            self.window.after(POLL_INTERVAL_MS, lambda: self._poll(on_done, on_error))
+            return
+
+        self.window.destroy()
+        result, error = self._outcome
+        if error is None:
+            on_done(result)
+        elif on_error:
+            on_error(error)
@@ -0,0 +1,135 @@
+# ==============================================================
+#  FILE: refresh.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Background refresh pipeline for the tabs. Loading and
+#     aggregation run on a small thread pool; results are handed
+#     back to the Tk main thread through root.after, where the
+#     widgets are updated. A newer refresh cancels a stale one.
+# ==============================================================
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from diagnostics import metrics
+
+# How often (ms) the Tk thread checks for finished refreshes.
+POLL_INTERVAL_MS = 30
+
+
+class RefreshCancelled(Exception):
+    """Raised inside a loader when its refresh has been cancelled."""
+
+
+class RefreshToken:
+    """Handle for one submitted refresh; loaders may poll it."""
+
+    __slots__ = ("key", "_event", "future")
+
+    def __init__(self, key: str):
+        self.key = key
+        self._event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self) -> None:
+        """Stop a long-running loader early once it is cancelled."""
+        if self._event.is_set():
+            raise RefreshCancelled()
+
+
+class RefreshPipeline:
+    """Runs loaders on worker threads and applies their results on the Tk thread.
+
+    load(token) runs in the pool and must not touch widgets; apply(result)
+    and on_error(exception) run on the Tk thread. on_busy(bool) is called
+    whenever the pipeline goes from idle to busy or back.
+    """
+
+    def __init__(self, root, max_workers: int = 2,
+                 on_busy: Optional[Callable[[bool], None]] = None):
+        self.root = root
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._results = queue.Queue()
+        self._active = {}        # key -> RefreshToken of the current refresh
+        self._polling = False
+
+    # ------------------- SUBMIT / CANCEL -------------------
+    def submit(self, key: str, load: Callable[[RefreshToken], Any],
+               apply: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None) -> RefreshToken:
+        """Start a refresh for key, cancelling the one already running for it."""
+        self.cancel(key)
+        token = RefreshToken(key)
+        was_idle = not self._active
+        self._active[key] = token
+        token.future = self._executor.submit(self._run, token, load, apply, on_error)
+        if was_idle and self.on_busy:
+            self.on_busy(True)
+        self._schedule_poll()
+        return token
+
+    def cancel(self, key: str) -> None:
+        token = self._active.pop(key, None)
+        if token is not None:
+            token.cancel()
+            self._notify_idle()
+
+    def cancel_all(self) -> None:
+        for key in list(self._active):
+            self.cancel(key)
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------- WORKER SIDE -------------------
+    def _run(self, token, load, apply, on_error) -> None:
+        if token.cancelled:
+            return
+        try:
+            result, error = metrics.call(f"refresh.{token.key}.load", load, (token,)), None
+        except RefreshCancelled:
+            return
+        except Exception as e:
+            result, error = None, e
+        self._results.put((token, apply, on_error, result, error))
+
+    # ------------------- TK SIDE -------------------
+    def _schedule_poll(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self) -> None:
+        self._polling = False
+        while True:
+            try:
+                token, apply, on_error, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if token.cancelled or self._active.get(token.key) is not token:
+                continue             # superseded while it was loading
+            del self._active[token.key]
+            self._notify_idle()
+            if error is None:
+                metrics.call(f"refresh.{token.key}.apply", apply, (result,))
+            elif on_error:
+                on_error(error)
+        if self._active:
+            self._schedule_poll()
+
+    def _notify_idle(self) -> None:
+        if not self._active and self.on_busy:
+            self.on_busy(False)
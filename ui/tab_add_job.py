@@ -8,9 +8,8 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from dataclasses import asdict
 from domain.models import Job, StockItem
-from storage.json_store import load_json, save_json
+from storage.backends import get_backend
 
 
 class AddJobTab:
@@ -90,9 +89,9 @@ class AddJobTab:
             messagebox.showwarning("Invalid Quantity", "Stock quantity must be a number.")
             return
 
-        jobs = load_json("data/jobs.json", default=[])
+        backend = get_backend()
 
-        if any(j["job_number"] == job_number for j in jobs):
+        if backend.get_job(job_number):
             messagebox.showwarning("Duplicate", f"Job {job_number} already exists!")
             return
 
@@ -104,8 +103,7 @@ class AddJobTab:
             stocks=[StockItem(name=stock_name, quantity=stock_quantity)],
         )
 
-        jobs.append(asdict(new_job))
-        save_json("data/jobs.json", jobs)
+        backend.add_job(new_job)
 
         messagebox.showinfo("Success", f"✅ Job {job_number} saved successfully!")
         self._clear_fields()
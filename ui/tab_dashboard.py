@@ -3,15 +3,14 @@
 #  PROJECT: UMAMCO Job Production Tracker
 #  DESCRIPTION:
 #     Handles the "Dashboard" tab that summarizes key production
-#     metrics and displays charts for jobs, staff, and weekly trends.
+#     metrics and displays charts for jobs, staff, weekly trends and
+#     the downtime reasons behind lost units.
 # ==============================================================
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from storage.json_store import load_json
+from tkinter import ttk
+from diagnostics import metrics
+from reports.dashboard import collect_dashboard, summary_stats
+from ui.charts import BarChart, LineChart, ParetoChart
 
 
 class DashboardTab:
@@ -54,111 +53,86 @@ class DashboardTab:
         self.chart_job_frame = ttk.LabelFrame(chart_frame, text="Output by Job")
         self.chart_staff_frame = ttk.LabelFrame(chart_frame, text="Output by Staff")
         self.chart_weekly_frame = ttk.LabelFrame(chart_frame, text="Weekly Output Trend")
+        self.chart_downtime_frame = ttk.LabelFrame(chart_frame, text="Downtime Pareto")
 
-        for c in (self.chart_job_frame, self.chart_staff_frame, self.chart_weekly_frame):
+        for c in (self.chart_job_frame, self.chart_staff_frame, self.chart_weekly_frame,
+                  self.chart_downtime_frame):
             c.pack(fill="both", expand=True, padx=10, pady=6)
 
-    # ------------------- HELPER: CLEAR CHART FRAMES -------------------
-    def _clear_frames(self):
-        for frame in (self.chart_job_frame, self.chart_staff_frame, self.chart_weekly_frame):
-            for widget in frame.winfo_children():
-                widget.destroy()
-
-    # ------------------- HELPER: DISPLAY MESSAGE -------------------
-    def _show_message(self, frame, text):
-        ttk.Label(frame, text=text, font=("Segoe UI", 10, "italic"), foreground="gray").pack(pady=20)
+        # One figure and canvas per chart for the life of the tab
+        self.job_chart = BarChart(self.chart_job_frame, "Total Output by Job",
+                                  xlabel="Job Number", ylabel="Output (units)", color="steelblue")
+        self.staff_chart = BarChart(self.chart_staff_frame, "Total Output by Staff",
+                                    xlabel="Output (units)", color="seagreen", horizontal=True)
+        self.weekly_chart = LineChart(self.chart_weekly_frame, "Weekly Output Trend",
+                                      xlabel="Week", ylabel="Total Output (units)",
+                                      color="mediumpurple", figsize=(6, 3.2))
+        self.downtime_chart = ParetoChart(self.chart_downtime_frame, "Lost Units by Downtime Reason",
+                                          ylabel="Lost units", figsize=(6, 3.2))
 
     # ------------------- LOAD DASHBOARD DATA -------------------
+    @metrics.timed("ui.dashboard.load_dashboard_data")
     def _load_dashboard_data(self):
         """Load production summary and update dashboard charts."""
-        data = load_json("data/shift_output.json", default=[])
-        self._clear_frames()
+        self._show_dashboard(self._collect_dashboard())
 
-        if not data:
-            self._show_message(self.chart_job_frame, "No job data available")
-            self._show_message(self.chart_staff_frame, "No staff data available")
-            self._show_message(self.chart_weekly_frame, "No trend data available")
-            for lbl in [self.lbl_total_jobs, self.lbl_total_output, self.lbl_avg_progress, self.lbl_top_performer]:
-                lbl.config(text=lbl.cget("text").split(":")[0] + ": 0")
-            return
+    def _collect_dashboard(self, token=None):
+        """Aggregate the dashboard figures; touches no widgets."""
+        return collect_dashboard()
+
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread)."""
+        return self._collect_dashboard
 
-        job_totals, staff_totals, weekly_totals = {}, {}, {}
+    def apply_refresh(self, data):
+        self._show_dashboard(data)
 
-        for rec in data:
-            try:
-                job = rec["job_number"]
-                staff = rec["staff_name"]
-                total = int(rec["total_output"])
-                shift_date = rec.get("shift_date")
-                week_num = datetime.strptime(shift_date, "%Y-%m-%d").isocalendar()[1]
-            except Exception:
-                continue
+    # ------------------- SHOW DASHBOARD -------------------
+    def _show_dashboard(self, data):
+        job_totals, staff_totals, weekly_totals, progress, downtime = data
 
-            job_totals[job] = job_totals.get(job, 0) + total
-            staff_totals[staff] = staff_totals.get(staff, 0) + total
-            weekly_totals[week_num] = weekly_totals.get(week_num, 0) + total
+        if not job_totals:
+            self.job_chart.show_message("No job data available")
+            self.staff_chart.show_message("No staff data available")
+            self.weekly_chart.show_message("No trend data available")
+            self.downtime_chart.show_message("No downtime recorded")
+            for lbl in [self.lbl_total_jobs, self.lbl_total_output, self.lbl_avg_progress, self.lbl_top_performer]:
+                lbl.config(text=lbl.cget("text").split(":")[0] + ": 0")
+            return
 
-        # --- Update summary stats ---
-        total_jobs = len(job_totals)
-        total_output = sum(job_totals.values())
-        avg_target = max(total_jobs * 20000, 1)  # Estimated base
-        avg_progress = round((total_output / avg_target) * 100, 1)
+        # --- Update summary stats (from the maintained per-job totals) ---
+        stats = summary_stats(progress, staff_totals)
 
-        self.lbl_total_jobs.config(text=f"Total Jobs: {total_jobs}")
-        self.lbl_total_output.config(text=f"Total Output: {total_output:,} units")
-        self.lbl_avg_progress.config(text=f"Average Progress: {avg_progress}%")
+        self.lbl_total_jobs.config(text=f"Total Jobs: {stats['total_jobs']}")
+        self.lbl_total_output.config(text=f"Total Output: {stats['total_output']:,} units")
+        self.lbl_avg_progress.config(text=f"Average Progress: {stats['avg_progress']}%")
 
-        if staff_totals:
-            top_name, top_value = max(staff_totals.items(), key=lambda x: x[1])
+        if stats["top_performer"]:
+            top_name, top_value = stats["top_performer"]
             self.lbl_top_performer.config(text=f"Top Performer: {top_name} ({top_value:,} units)")
         else:
             self.lbl_top_performer.config(text="Top Performer: N/A")
 
-        # --- Chart 1: Output by Job ---
-        if job_totals:
-            fig1, ax1 = plt.subplots(figsize=(5.5, 3.2))
-            ax1.bar(job_totals.keys(), job_totals.values(), color="steelblue")
-            ax1.set_title("Total Output by Job")
-            ax1.set_xlabel("Job Number")
-            ax1.set_ylabel("Output (units)")
-            ax1.grid(True, linestyle="--", alpha=0.5)
-            canvas1 = FigureCanvasTkAgg(fig1, master=self.chart_job_frame)
-            canvas1.draw()
-            canvas1.get_tk_widget().pack(fill="both", expand=True)
-            plt.close(fig1)
-        else:
-            self._show_message(self.chart_job_frame, "No job data available")
+        # --- Charts (updated in place) ---
+        self.job_chart.update(job_totals.keys(), job_totals.values())
 
-        # --- Chart 2: Output by Staff ---
         if staff_totals:
-            fig2, ax2 = plt.subplots(figsize=(5.5, 3.2))
-            ax2.barh(list(staff_totals.keys()), list(staff_totals.values()), color="seagreen")
-            ax2.set_title("Total Output by Staff")
-            ax2.set_xlabel("Output (units)")
-            ax2.grid(True, linestyle="--", alpha=0.5)
-            canvas2 = FigureCanvasTkAgg(fig2, master=self.chart_staff_frame)
-            canvas2.draw()
-            canvas2.get_tk_widget().pack(fill="both", expand=True)
-            plt.close(fig2)
+            self.staff_chart.update(staff_totals.keys(), staff_totals.values())
         else:
-            self._show_message(self.chart_staff_frame, "No staff data available")
+            self.staff_chart.show_message("No staff data available")
 
-        # --- Chart 3: Weekly Trend ---
         if weekly_totals:
-            sorted_weeks = sorted(weekly_totals.items())
-            weeks, outputs = zip(*sorted_weeks)
-            fig3, ax3 = plt.subplots(figsize=(6, 3.2))
-            ax3.plot(weeks, outputs, marker="o", color="mediumpurple", linewidth=2)
-            ax3.set_title("Weekly Output Trend")
-            ax3.set_xlabel("Week Number")
-            ax3.set_ylabel("Total Output (units)")
-            ax3.grid(True, linestyle="--", alpha=0.5)
-            canvas3 = FigureCanvasTkAgg(fig3, master=self.chart_weekly_frame)
-            canvas3.draw()
-            canvas3.get_tk_widget().pack(fill="both", expand=True)
-            plt.close(fig3)
+            weeks, outputs = zip(*sorted(weekly_totals.items()))
+            self.weekly_chart.update(weeks, outputs)
+        else:
+            self.weekly_chart.show_message("No trend data available")
+
+        if downtime:
+            reasons, lost, _hours, cumulative = zip(*downtime)
+            self.downtime_chart.update(reasons, lost, cumulative)
         else:
-            self._show_message(self.chart_weekly_frame, "No trend data available")
+            self.downtime_chart.show_message("No downtime recorded")
 
 
 
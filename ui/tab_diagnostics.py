@@ -0,0 +1,95 @@
+# ==============================================================
+#  FILE: tab_diagnostics.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Hidden "Diagnostics" tab showing the timing histograms kept by
+#     diagnostics.metrics: call counts, mean/p50/p95/max times and
+#     bytes read/written per instrumented name. Shown with
+#     Ctrl+Shift+D when instrumentation is on; can dump the figures
+#     to a file and arm a cProfile capture of the next tab refresh.
+# ==============================================================
+
+import os
+from datetime import datetime
+from tkinter import ttk, messagebox
+
+from diagnostics import metrics
+from ui.table_binding import TreeBinding
+
+COLUMNS = (
+    ("name", "Name", 260), ("count", "Calls", 60), ("total_ms", "Total ms", 80),
+    ("mean_ms", "Mean ms", 70), ("p50_ms", "p50 ms", 70), ("p95_ms", "p95 ms", 70),
+    ("max_ms", "Max ms", 70), ("bytes_read", "Read", 80), ("bytes_written", "Written", 80),
+)
+
+
+class DiagnosticsTab:
+    """Manages the Diagnostics tab UI and logic."""
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self._build_diagnostics_tab()
+
+    # ------------------- BUILD DIAGNOSTICS TAB -------------------
+    def _build_diagnostics_tab(self):
+        frame = self.frame
+        ttk.Label(frame, text="Diagnostics", font=("Segoe UI", 14, "bold")).pack(pady=10)
+
+        btns = ttk.Frame(frame)
+        btns.pack(fill="x", padx=10)
+        ttk.Button(btns, text="🔄 Refresh", command=self._refresh).pack(side="left", padx=5)
+        ttk.Button(btns, text="🧹 Reset", command=self._reset).pack(side="left", padx=5)
+        ttk.Button(btns, text="💾 Dump to File", command=self._dump).pack(side="left", padx=5)
+        ttk.Button(btns, text="⏱ Profile Next Refresh", command=self._profile_next).pack(side="left", padx=5)
+
+        self.lbl_state = ttk.Label(frame, text="", foreground="gray")
+        self.lbl_state.pack(fill="x", padx=12, pady=(6, 0))
+
+        sec = ttk.LabelFrame(frame, text="Timings")
+        sec.pack(fill="both", expand=True, padx=10, pady=10)
+        self.metrics_tree = ttk.Treeview(sec, columns=[c for c, _t, _w in COLUMNS], show="headings")
+        for col, text, width in COLUMNS:
+            self.metrics_tree.heading(col, text=text)
+            self.metrics_tree.column(col, width=width, anchor="w" if col == "name" else "e")
+        scroll = ttk.Scrollbar(sec, orient="vertical", command=self.metrics_tree.yview)
+        self.metrics_tree.configure(yscrollcommand=scroll.set)
+        self.metrics_tree.tag_configure("error", foreground="red")
+        self.metrics_tree.pack(side="left", fill="both", expand=True, padx=(6, 0), pady=6)
+        scroll.pack(side="right", fill="y", pady=6)
+        self.metrics_rows = TreeBinding(self.metrics_tree)
+
+    # ------------------- SHOW METRICS -------------------
+    def _show_metrics(self, snapshot):
+        self.metrics_rows.sync(
+            (name, [name] + [stats[col] for col, _t, _w in COLUMNS[1:]], ("error",) if stats["errors"] else None)
+            for name, stats in snapshot.items()
+        )
+        state = "Recording" if metrics.enabled() else "Instrumentation is off (set JPT_INSTRUMENT=1)"
+        if metrics.last_profile():
+            state += f" | Last profile: {metrics.last_profile()}"
+        self.lbl_state.config(text=state)
+
+    def _refresh(self):
+        self._show_metrics(metrics.snapshot())
+
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread)."""
+        return lambda token: metrics.snapshot()
+
+    def apply_refresh(self, snapshot):
+        self._show_metrics(snapshot)
+
+    # ------------------- ACTIONS -------------------
+    def _reset(self):
+        metrics.reset()
+        self._refresh()
+
+    def _dump(self):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = metrics.dump(os.path.join(metrics.PROFILE_DIR, f"metrics_{stamp}.json"))
+        messagebox.showinfo("Diagnostics", f"Timings written to:\n{os.path.abspath(path)}")
+
+    def _profile_next(self):
+        metrics.profile_next("refresh.")
+        self.lbl_state.config(text="The next tab refresh will be captured with cProfile")
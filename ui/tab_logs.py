@@ -7,20 +7,16 @@
 # ==============================================================
 
 import os
-import csv
 from datetime import date
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle,
-    Paragraph, Spacer
-)
-from reportlab.lib.styles import getSampleStyleSheet
-
-from storage.json_store import load_json
+from diagnostics import metrics
+from reports.csv_export import export_csv
+from reports.logs import LOG_COLUMNS, ExportCancelled, collect_log_report
+from storage.backends import get_backend, date_range
+from ui.paged_tree import PagedTreeview
+from ui.progress_dialog import TaskProgressDialog
 from reset_data import reset_all_data   # ✅ Import moved to the top
 
 
@@ -67,6 +63,7 @@ class LogsTab:
         ttk.Button(btn_frame, text="🔍 Load Report", command=self._load_logs_to_tree).pack(side="left", padx=3)
         ttk.Button(btn_frame, text="📄 Export CSV", command=self._export_logs_to_csv).pack(side="left", padx=3)
         ttk.Button(btn_frame, text="🧾 Export PDF", command=self._export_logs_to_pdf).pack(side="left", padx=3)
+        ttk.Button(btn_frame, text="🗂 Job Pack PDFs", command=self._export_job_pack).pack(side="left", padx=3)
 
         # Reset Button
         ttk.Button(
@@ -75,19 +72,24 @@ class LogsTab:
             command=self._trigger_data_reset
         ).pack(side="left", padx=3)
 
+        # CSV Export Options
+        opt_frame = ttk.Frame(filter_frame)
+        opt_frame.grid(row=1, column=6, padx=5, pady=(0, 4), sticky="w")
+
+        self.var_csv_detailed = tk.BooleanVar(value=False)
+        self.var_csv_gzip = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opt_frame, text="Hourly detail", variable=self.var_csv_detailed).pack(side="left", padx=3)
+        ttk.Checkbutton(opt_frame, text="Gzip", variable=self.var_csv_gzip).pack(side="left", padx=3)
+
         # ==== Report Table ====
         sec = ttk.LabelFrame(frame, text="Shift Reports")
         sec.pack(fill="both", expand=True, padx=10, pady=10)
 
-        columns = ("date", "job", "staff", "shift", "output", "target", "progress", "status")
-        self.logs_tree = ttk.Treeview(sec, columns=columns, show="headings", height=12)
-
+        # Paged: only the rows scrolled into view become Treeview items.
         column_widths = (100, 100, 140, 80, 90, 90, 100, 80)
-        for col, width in zip(columns, column_widths):
-            self.logs_tree.heading(col, text=col.upper())
-            self.logs_tree.column(col, width=width, anchor="center")
-
-        self.logs_tree.pack(fill="both", expand=True, padx=6, pady=6)
+        self.logs_table = PagedTreeview(sec, LOG_COLUMNS, column_widths, height=12)
+        self.logs_table.frame.pack(fill="both", expand=True, padx=6, pady=6)
+        self.logs_tree = self.logs_table.tree
 
         # Color tags for performance
         self.logs_tree.tag_configure("low", foreground="red")
@@ -116,114 +118,83 @@ class LogsTab:
         self.lbl_job_progress = ttk.Label(progress_frame, text="Progress: 0%")
         self.lbl_job_progress.pack(pady=(2, 4))
 
-        # Load initial dropdown values
-        self._refresh_filters()
-
     # ------------------- REFRESH FILTERS -------------------
     def _refresh_filters(self):
-        jobs = load_json("data/jobs.json", default=[])
-        staff = load_json("data/staff.json", default=[])
+        backend = get_backend()
+        self._show_filters(backend.list_jobs(), backend.list_staff())
 
-        self.cmb_log_job["values"] = [j["job_number"] for j in jobs]
-        self.cmb_log_staff["values"] = [s["name"] for s in staff if s.get("status") == "Active"]
+    def _show_filters(self, jobs, staff):
+        self.cmb_log_job["values"] = [j.job_number for j in jobs]
+        self.cmb_log_staff["values"] = [s.name for s in staff if s.active]
 
         self.cmb_log_job.set("")
         self.cmb_log_staff.set("")
 
     # ------------------- LOAD FILTERED LOGS -------------------
+    @metrics.timed("ui.logs.load_logs_to_tree")
     def _load_logs_to_tree(self):
+        report = self._collect_logs(
+            self.cmb_log_job.get().strip(),
+            self.cmb_log_staff.get().strip(),
+            self.entry_log_date.get().strip(),
+        )
+        self._show_logs(report)
 
-        # Clear table first
-        for r in self.logs_tree.get_children():
-            self.logs_tree.delete(r)
+    def _collect_logs(self, filter_job, filter_staff, filter_date, token=None):
+        """Build the report rows and job progress; touches no widgets."""
+        return collect_log_report(
+            filter_job, filter_staff, filter_date, check=token.check if token else None
+        )
 
-        all_shifts = load_json("data/shift_output.json", default=[])
-        jobs = load_json("data/jobs.json", default=[])
-        job_targets = {j["job_number"]: j["stocks"][0]["quantity"]
-                       for j in jobs if j.get("stocks")}
+    def _show_logs(self, report):
+        if report["progress"]:
+            job_target, total_job_output = report["progress"]
+            self.lbl_job_target.config(text=f"Total Target: {job_target:,} units")
+            pct = round((total_job_output / job_target) * 100, 2) if job_target else 0
 
-        filter_job = self.cmb_log_job.get().strip()
-        filter_staff = self.cmb_log_staff.get().strip()
-        filter_date = self.entry_log_date.get().strip()
+            self.progress_var.set(pct)
+            self.lbl_job_progress.config(
+                text=f"Progress: {pct}% ({total_job_output:,} / {job_target:,})"
+            )
 
-        total_output = 0
-        count = 0
-
-        # --- Progress Bar Logic ---
-        if filter_job:
-            job_entry = next((j for j in jobs if j["job_number"] == filter_job), None)
-            if job_entry and job_entry.get("stocks"):
-                job_target = job_entry["stocks"][0]["quantity"]
-                self.lbl_job_target.config(text=f"Total Target: {job_target:,} units")
-
-                job_shifts = [s for s in all_shifts if s["job_number"] == filter_job]
-                total_job_output = sum(s["total_output"] for s in job_shifts)
-                pct = round((total_job_output / job_target) * 100, 2) if job_target else 0
-
-                self.progress_var.set(pct)
-                self.lbl_job_progress.config(
-                    text=f"Progress: {pct}% ({total_job_output:,} / {job_target:,})"
-                )
-
-                style = ttk.Style()
-                if pct < 80:
-                    style.configure("Red.Horizontal.TProgressbar", background="red")
-                    self.progress_bar.config(style="Red.Horizontal.TProgressbar")
-                elif pct < 95:
-                    style.configure("Yellow.Horizontal.TProgressbar", background="orange")
-                    self.progress_bar.config(style="Yellow.Horizontal.TProgressbar")
-                else:
-                    style.configure("Green.Horizontal.TProgressbar", background="green")
-                    self.progress_bar.config(style="Green.Horizontal.TProgressbar")
+            style = ttk.Style()
+            if pct < 80:
+                style.configure("Red.Horizontal.TProgressbar", background="red")
+                self.progress_bar.config(style="Red.Horizontal.TProgressbar")
+            elif pct < 95:
+                style.configure("Yellow.Horizontal.TProgressbar", background="orange")
+                self.progress_bar.config(style="Yellow.Horizontal.TProgressbar")
             else:
-                self._reset_progress_labels()
+                style.configure("Green.Horizontal.TProgressbar", background="green")
+                self.progress_bar.config(style="Green.Horizontal.TProgressbar")
         else:
             self._reset_progress_labels()
 
-        # --- Flexible Date Filter ---
-        def match_date(shift_date: str) -> bool:
-            if not filter_date:
-                return True
-            if len(filter_date) == 4:      # YYYY
-                return shift_date.startswith(filter_date)
-            if len(filter_date) == 7:      # YYYY-MM
-                return shift_date.startswith(filter_date)
-            return shift_date == filter_date  # Full date YYYY-MM-DD
-
-        # --- Load Records into Table ---
-        for shift in all_shifts:
-
-            if filter_job and shift["job_number"] != filter_job:
-                continue
-
-            if filter_staff and shift["staff_name"] != filter_staff:
-                continue
-
-            if not match_date(shift["shift_date"]):
-                continue
-
-            job = shift["job_number"]
-            total = shift["total_output"]
-            target = job_targets.get(job, 0)
-
-            progress = round((total / target) * 100, 1) if target else 0
-            tag = "low" if progress < 90 else "mid" if progress < 100 else "ok"
-
-            self.logs_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    shift["shift_date"], job, shift["staff_name"],
-                    shift["shift_type"], total, target,
-                    f"{progress}%", "Completed" if progress >= 100 else "Ongoing"
-                ),
-                tags=(tag,)
-            )
+        self.logs_table.set_rows(report["rows"])
+
+        self.lbl_summary.config(
+            text=f"Total Shifts: {len(report['rows'])} | Total Output: {report['total_output']} units"
+        )
+
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread).
 
-            total_output += total
-            count += 1
+        Switching to the tab resets the job/staff filters, so the report is
+        loaded for the date filter alone.
+        """
+        filter_date = self.entry_log_date.get().strip()
+
+        def load(token):
+            backend = get_backend()
+            jobs, staff = backend.list_jobs(), backend.list_staff()
+            return jobs, staff, self._collect_logs("", "", filter_date, token)
+        return load
 
-        self.lbl_summary.config(text=f"Total Shifts: {count} | Total Output: {total_output} units")
+    def apply_refresh(self, data):
+        jobs, staff, report = data
+        self._show_filters(jobs, staff)
+        self._show_logs(report)
 
     # ------------------- RESET PROGRESS -------------------
     def _reset_progress_labels(self):
@@ -233,77 +204,95 @@ class LogsTab:
 
     # ------------------- EXPORT CSV -------------------
     def _export_logs_to_csv(self):
-        if not self.logs_tree.get_children():
-            messagebox.showwarning("No Data", "No logs available to export.")
-            return
-
-        try:
-            os.makedirs("exports", exist_ok=True)
-            filename = f"exports/Production_Report_{date.today()}.csv"
-
-            with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([col.upper() for col in self.logs_tree["columns"]])
+        """Stream the filtered shifts from storage to a CSV file in the background."""
+        filter_job = self.cmb_log_job.get().strip()
+        filter_staff = self.cmb_log_staff.get().strip()
+        dates = date_range(self.entry_log_date.get().strip())
+        detailed = self.var_csv_detailed.get()
+
+        name = "Production_Report_Detailed" if detailed else "Production_Report"
+        filename = f"exports/{name}_{date.today()}.csv"
+        if self.var_csv_gzip.get():
+            filename += ".gz"
+
+        def work(task):
+            backend = get_backend()
+            total = backend.count_shifts(filter_job, filter_staff, dates)
+            if not total:
+                return 0
+            shifts = backend.iter_shifts(filter_job, filter_staff, dates, with_hours=detailed)
+            return export_csv(
+                filename, shifts, backend.job_targets(), detailed=detailed,
+                progress=lambda done: task.report(done, total),
+                should_stop=lambda: task.cancelled,
+            )
 
-                for row_id in self.logs_tree.get_children():
-                    writer.writerow(self.logs_tree.item(row_id, "values"))
+        def done(count):
+            if not count:
+                messagebox.showwarning("No Data", "No logs available to export.")
+                return
+            messagebox.showinfo("Export Successful", f"{count:,} shifts exported to:\n{os.path.abspath(filename)}")
 
-            messagebox.showinfo("Export Successful", f"Report exported to:\n{os.path.abspath(filename)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"CSV export failed:\n{e}")
+        TaskProgressDialog(self.frame, "Exporting CSV", unit="shifts").run(
+            work, done, lambda e: self._export_failed("CSV export", e)
+        )
 
     # ------------------- EXPORT PDF -------------------
     def _export_logs_to_pdf(self):
-        if not self.logs_tree.get_children():
-            messagebox.showwarning("No Data", "No logs available to export.")
-            return
-
-        try:
-            os.makedirs("exports", exist_ok=True)
-            filename = f"exports/Production_Report_{date.today()}.pdf"
-
-            doc = SimpleDocTemplate(filename, pagesize=A4)
-            styles = getSampleStyleSheet()
-            elements = []
-
-            elements.append(Paragraph("📊 Production Logs Report", styles["Title"]))
-            elements.append(Spacer(1, 12))
-
-            info = Paragraph(
-                f"Generated on: {date.today()}<br/>"
-                f"Job Filter: {self.cmb_log_job.get() or 'All'} | "
-                f"Staff: {self.cmb_log_staff.get() or 'All'} | "
-                f"Date: {self.entry_log_date.get() or 'All'}",
-                styles["Normal"]
+        """Build the PDF report for the current filters in a separate process."""
+        filter_job = self.cmb_log_job.get().strip()
+        filter_staff = self.cmb_log_staff.get().strip()
+        filter_date = self.entry_log_date.get().strip()
+        filename = f"exports/Production_Report_{date.today()}.pdf"
+
+        def work(task):
+            from reports.pdf_report import export_pdf_in_process   # loads reportlab on first export
+
+            return export_pdf_in_process(
+                filename, filter_job, filter_staff, filter_date,
+                progress=task.report, should_stop=lambda: task.cancelled,
             )
-            elements.append(info)
-            elements.append(Spacer(1, 12))
-
-            headers = [col.upper() for col in self.logs_tree["columns"]]
-            data = [headers] + [
-                self.logs_tree.item(r, "values")
-                for r in self.logs_tree.get_children()
-            ]
-
-            table = Table(data)
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-            ]))
-
-            elements.append(table)
-            elements.append(Spacer(1, 12))
-            elements.append(Paragraph(self.lbl_summary.cget("text"), styles["Italic"]))
-
-            doc.build(elements)
 
+        def done(count):
+            if not count:
+                messagebox.showwarning("No Data", "No logs available to export.")
+                return
             messagebox.showinfo("Export Successful", f"PDF report saved to:\n{os.path.abspath(filename)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"PDF export failed:\n{e}")
+
+        TaskProgressDialog(self.frame, "Exporting PDF", unit="shifts").run(
+            work, done, lambda e: self._export_failed("PDF export", e)
+        )
+
+    # ------------------- EXPORT JOB PACK -------------------
+    def _export_job_pack(self):
+        """Write one PDF per job for the date filter (e.g. a month), in parallel."""
+        filter_date = self.entry_log_date.get().strip()
+        out_dir = f"exports/Job_Pack_{filter_date or 'All'}"
+
+        def work(task):
+            from reports.pdf_report import write_job_pack
+
+            jobs = [j.job_number for j in get_backend().list_jobs()]
+            return write_job_pack(
+                out_dir, jobs, filter_date,
+                progress=task.report, should_stop=lambda: task.cancelled,
+            )
+
+        def done(files):
+            if not files:
+                messagebox.showwarning("No Data", "No jobs have shifts in this period.")
+                return
+            messagebox.showinfo("Export Successful", f"{len(files)} job reports saved to:\n{os.path.abspath(out_dir)}")
+
+        TaskProgressDialog(self.frame, "Building Job Pack", unit="jobs").run(
+            work, done, lambda e: self._export_failed("Job pack export", e)
+        )
+
+    def _export_failed(self, what, error):
+        if isinstance(error, ExportCancelled):
+            messagebox.showinfo("Export Cancelled", f"The {what.lower()} was cancelled.")
+        else:
+            messagebox.showerror("Error", f"{what} failed:\n{error}")
 
     # ------------------- RESET ALL DATA -------------------
     def _trigger_data_reset(self):
@@ -6,12 +6,23 @@
 #     records, calculating performance, and saving results.
 # ==============================================================
 
+import os
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import date, datetime, timedelta
-from dataclasses import asdict
+from tkinter import ttk, messagebox, filedialog
+from datetime import date, datetime
+from diagnostics import metrics
+from domain.hours import ShiftHours, hour_slots
 from domain.models import HourlyOutput, ShiftRecord
-from storage.json_store import load_json, save_json
+from storage.backends import get_backend
+from ui.progress_dialog import TaskProgressDialog
+from ui.table_binding import TreeBinding
+
+# How often (ms) counts from the live feed are applied to the hourly table.
+LIVE_POLL_MS = 500
+
+# Seconds between saves of the shift being filled from the live feed.
+DRAFT_SAVE_INTERVAL = 5.0
 
 
 class ShiftTab:
@@ -19,7 +30,13 @@ class ShiftTab:
 
     def __init__(self, parent):
         self.frame = ttk.Frame(parent)
-        self.shift_hours = []  # in-memory list of dicts
+        self.shift_hours = ShiftHours()  # hourly rows with running totals
+        self._live_feed = None     # ingest.live.LiveFeed while following it
+        self._live_after = None
+        self._live_seen = None     # (counter version, job, date, ShiftHours) last applied
+        self._live_ticks = (0, 0.0)
+        self._live_hours = set()   # hour labels whose quantity came from the feed
+        self._draft_due = None     # perf_counter time of the next draft save, if unsaved
         self._build_shift_tab()
 
     # ------------------- SHIFT TAB UI -------------------
@@ -34,12 +51,10 @@ class ShiftTab:
         ttk.Label(hdr, text="Job Number").grid(row=0, column=0, sticky="w", padx=6, pady=4)
         self.cmb_job_number = ttk.Combobox(hdr, width=18, state="readonly")
         self.cmb_job_number.grid(row=0, column=1, padx=6, pady=4)
-        self._load_job_numbers_into_combobox()
 
         ttk.Label(hdr, text="Staff Name").grid(row=0, column=2, sticky="w", padx=6, pady=4)
         self.cmb_staff_name = ttk.Combobox(hdr, width=20, state="readonly")
         self.cmb_staff_name.grid(row=0, column=3, padx=6, pady=4)
-        self._load_active_staff_into_combobox()
 
         ttk.Label(hdr, text="Date").grid(row=1, column=0, sticky="w", padx=6, pady=4)
         self.entry_shift_date = ttk.Entry(hdr, width=18)
@@ -71,58 +86,67 @@ class ShiftTab:
     # ------------------- LOAD JOBS & STAFF -------------------
     def _load_job_numbers_into_combobox(self):
         """Load all job numbers into dropdown."""
-        jobs = load_json("data/jobs.json", default=[])
-        job_numbers = [j["job_number"] for j in jobs]
-        self.cmb_job_number["values"] = job_numbers
-        self.cmb_job_number.set(job_numbers[0] if job_numbers else "")
+        self._show_job_numbers(get_backend().list_jobs())
 
     def _load_active_staff_into_combobox(self):
         """Load only active staff into dropdown."""
-        staff_list = load_json("data/staff.json", default=[])
-        active_staff = [s["name"] for s in staff_list if s.get("status") == "Active"]
+        self._show_active_staff(get_backend().list_staff())
+
+    def _show_job_numbers(self, jobs):
+        job_numbers = [j.job_number for j in jobs]
+        self.cmb_job_number["values"] = job_numbers
+        self.cmb_job_number.set(job_numbers[0] if job_numbers else "")
+
+    def _show_active_staff(self, staff_list):
+        active_staff = [s.name for s in staff_list if s.active]
         self.cmb_staff_name["values"] = active_staff
         self.cmb_staff_name.set(active_staff[0] if active_staff else "")
 
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread)."""
+        def load(token):
+            backend = get_backend()
+            return backend.list_jobs(), backend.list_staff()
+        return load
+
+    def apply_refresh(self, data):
+        jobs, staff_list = data
+        self._show_active_staff(staff_list)
+        self._show_job_numbers(jobs)
+
     # ------------------- GENERATE HOURS -------------------
     def _generate_hours(self):
         """Auto-fill shift hours between start and end time."""
-        self.shift_hours.clear()
-
         start_str = self.entry_start_time.get().strip()
         end_str = self.entry_end_time.get().strip()
 
         try:
-            start = datetime.strptime(start_str, "%H:%M")
-            end = datetime.strptime(end_str, "%H:%M")
+            slots = hour_slots(start_str, end_str)
         except ValueError:
             messagebox.showwarning("Time Format", "Use HH:MM (24-hr) format.")
             return
 
-        base_target = 2500
-        breaks = [("09:00", 20), ("12:00", 15)]
-
-        current = start
-        while current < end:
-            nxt = current + timedelta(hours=1)
-            label = f"{current.strftime('%H:%M')}-{nxt.strftime('%H:%M')}"
-            tgt = base_target
-
-            for b_time, b_min in breaks:
-                b = datetime.strptime(b_time, "%H:%M")
-                if current <= b < nxt:
-                    tgt = round(base_target * (60 - b_min) / 60)
-                    break
-
-            self.shift_hours.append({
-                "hour_label": label,
-                "quantity": 0,
-                "target": tgt,
-                "comment": ""
-            })
-            current = nxt
-
+        self.shift_hours = ShiftHours(slots)
+        self._live_hours = set()
+        self._restore_draft()
         self._refresh_hour_tree()
 
+    def _restore_draft(self):
+        """Fill the generated hours from a saved draft of the same shift, if any."""
+        record = self._shift_record()
+        draft = get_backend().get_draft(record.shift_id, record.staff_name)
+        if draft is None:
+            return
+        shift, live_hours = draft
+        saved = {h.hour_label: h for h in shift.hourly_outputs}
+        for i, row in enumerate(self.shift_hours):
+            h = saved.get(row.hour_label)
+            if h is not None and h.quantity:
+                self.shift_hours.set_quantity(i, h.quantity, h.comment)
+                if row.hour_label in live_hours:
+                    self._live_hours.add(row.hour_label)
+
     # ------------------- HOURLY OUTPUT SECTION -------------------
     def _build_hourly_output_section(self, frame):
         """Create table and buttons for hourly output."""
@@ -135,6 +159,7 @@ class ShiftTab:
             self.hour_tree.heading(col, text=col.upper())
             self.hour_tree.column(col, width=width, anchor="center")
         self.hour_tree.pack(side="top", fill="x", padx=6, pady=6)
+        self.hour_rows = TreeBinding(self.hour_tree)
 
         self.hour_tree.tag_configure("NoData", foreground="black")
         self.hour_tree.tag_configure("Red", foreground="red")
@@ -149,21 +174,27 @@ class ShiftTab:
         btns.pack(side="top", pady=6)
         ttk.Button(btns, text="➕ Add Output", command=self._open_add_output_dialog).grid(row=0, column=0, padx=5)
         ttk.Button(btns, text="🗑️ Remove Selected", command=self._remove_selected_hour).grid(row=0, column=1, padx=5)
+        self.btn_live = ttk.Button(btns, text="📡 Live Feed", command=self._toggle_live_feed)
+        self.btn_live.grid(row=0, column=2, padx=5)
+
+        self.lbl_live = ttk.Label(sec, text="", foreground="gray")
+        self.lbl_live.pack(side="top")
 
         footer = ttk.Frame(frame)
         footer.pack(fill="x", padx=10, pady=10)
         ttk.Button(footer, text="💾 Save & Finish Shift ✅", command=self._save_shift_record).pack(side="right")
+        ttk.Button(footer, text="📥 Import Counter File", command=self._import_counter_file).pack(side="left")
 
     # ------------------- ADD OUTPUT DIALOG -------------------
     def _open_add_output_dialog(self):
         """Dialog to add output for the next available hour."""
-        pending = [h for h in self.shift_hours if h["quantity"] == 0]
-        if not pending:
+        pending = self.shift_hours.first_pending()
+        if pending is None:
             messagebox.showinfo("Done", "All hourly slots are already filled.")
             return
 
-        hour = pending[0]["hour_label"]
-        target = pending[0]["target"]
+        hour = self.shift_hours[pending].hour_label
+        target = self.shift_hours[pending].target
 
         dlg = tk.Toplevel(self.frame)
         dlg.title(f"Add Output ({hour})")
@@ -214,55 +245,66 @@ class ShiftTab:
 
             comment_val = other_entry.get().strip() if cmb_reason.get() == "Other" else cmb_reason.get()
 
-            for h in self.shift_hours:
-                if h["hour_label"] == hour and h["quantity"] == 0:
-                    h["quantity"] = qty
-                    h["comment"] = comment_val
-                    break
-
-            self._refresh_hour_tree()
+            index = self.shift_hours.index(hour)
+            if index is not None and self.shift_hours[index].quantity == 0:
+                self._live_hours.discard(hour)   # typed by hand; the feed leaves it alone
+                self._refresh_hour_tree(self.shift_hours.set_quantity(index, qty, comment_val))
             dlg.destroy()
 
         ttk.Button(dlg, text="Add", command=submit).pack(pady=12)
 
     # ------------------- REFRESH TABLE -------------------
-    def _refresh_hour_tree(self):
-        """Recalculate percentages and update the hourly table."""
-        for r in self.hour_tree.get_children():
-            self.hour_tree.delete(r)
-
-        total_qty, total_tgt = 0, 0
-
-        for item in self.shift_hours:
-            qty = item["quantity"]
-            tgt = item["target"]
-
-            total_qty += qty
-            total_tgt += tgt
-
-            ach_pct = round((qty / tgt) * 100, 1) if tgt else 0
-            expected_cum = total_tgt
-            cum_pct = round((total_qty / total_tgt) * 100, 1) if total_tgt else 0
-
-            delta = qty - tgt
-            status = "Under" if delta < 0 else ("Met" if delta == 0 else "Over")
-            target_display = f"{tgt} (100%)"
-
-            tag = (
-                "NoData" if qty == 0 else
-                "Red" if ach_pct < 80 else
-                "Yellow" if ach_pct < 90 else
-                "Green" if ach_pct <= 100 else
-                "Blue"
-            )
+    @metrics.timed("ui.shift.refresh_hour_tree")
+    def _refresh_hour_tree(self, start=0):
+        """Update the hourly table from row start on, and the totals label.
+
+        Rows before start are unchanged: their cumulative figures only
+        depend on earlier rows. start=0 redraws the whole table.
+        """
+        hours = self.shift_hours
+        rows = [self._hour_row(i) for i in range(start, len(hours))]
+        if start == 0:
+            self.hour_rows.sync(rows)
+        else:
+            self.hour_rows.update(rows)
+        self._show_hour_totals()
+
+    def _hour_row(self, index):
+        """(key, values, tags) for one hourly row, using the running totals."""
+        hours = self.shift_hours
+        item = hours[index]
+        qty = item.quantity
+        tgt = item.target
+        total_qty = hours.cum_quantity[index]
+        total_tgt = hours.cum_target[index]
+
+        ach_pct = round((qty / tgt) * 100, 1) if tgt else 0
+        expected_cum = total_tgt
+        cum_pct = round((total_qty / total_tgt) * 100, 1) if total_tgt else 0
+
+        delta = qty - tgt
+        status = "Under" if delta < 0 else ("Met" if delta == 0 else "Over")
+        target_display = f"{tgt} (100%)"
+
+        tag = (
+            "NoData" if qty == 0 else
+            "Red" if ach_pct < 80 else
+            "Yellow" if ach_pct < 90 else
+            "Green" if ach_pct <= 100 else
+            "Blue"
+        )
 
-            self.hour_tree.insert(
-                "", tk.END,
-                values=(item["hour_label"], qty, target_display, ach_pct, expected_cum, cum_pct,
-                        item.get("comment", ""), status),
-                tags=(tag,)
-            )
+        return (
+            item.hour_label,
+            (item.hour_label, qty, target_display, ach_pct, expected_cum, cum_pct,
+             item.comment, status),
+            (tag,)
+        )
 
+    def _show_hour_totals(self):
+        """Totals label, read from the maintained running totals."""
+        total_qty = self.shift_hours.total_quantity
+        total_tgt = self.shift_hours.total_target
         if total_tgt > 0:
             if total_qty >= total_tgt:
                 self.lbl_total_output.config(
@@ -283,13 +325,19 @@ class ShiftTab:
             messagebox.showwarning("No Selection", "Please select a row to remove.")
             return
         hour_to_remove = self.hour_tree.item(sel[0], "values")[0]
-        self.shift_hours = [h for h in self.shift_hours if h["hour_label"] != hour_to_remove]
-        self._refresh_hour_tree()
+        index = self.shift_hours.index(hour_to_remove)
+        if index is None:
+            return
+        self.shift_hours.remove(index)
+        self.hour_rows.delete(hour_to_remove)
+        self._refresh_hour_tree(index)
 
     # ------------------- RESET SHIFT FORM -------------------
     def _reset_shift_form(self):
         """Reset all shift entry fields to their default state."""
-        self.shift_hours = []
+        self.shift_hours = ShiftHours()
+        self._live_hours = set()
+        self._draft_due = None
         self._refresh_hour_tree()
         self._load_job_numbers_into_combobox()
         self._load_active_staff_into_combobox()
@@ -323,36 +371,170 @@ class ShiftTab:
                 messagebox.showwarning("No Hourly Entries", "Please add at least one hourly output.")
                 return
 
-            hours_dc = [
-                HourlyOutput(
-                    hour_label=h["hour_label"],
-                    quantity=h["quantity"],
-                    target=h["target"],
-                    comment=h.get("comment", "")
-                ) for h in self.shift_hours
-            ]
-
-            total = sum(h.quantity for h in hours_dc)
-            shift_id = f"{job_number}-{shift_date}-{start_time.replace(':', '')}"
-
-            record = ShiftRecord(
-                shift_id=shift_id,
-                job_number=job_number,
-                staff_name=staff_name,
-                shift_date=shift_date,
-                start_time=start_time,
-                end_time=end_time,
-                shift_type=shift_type,
-                hourly_outputs=hours_dc,
-                total_output=total
-            )
-
-            db = load_json("data/shift_output.json", default=[])
-            db.append(asdict(record))
-            save_json("data/shift_output.json", db)
+            record = self._shift_record()
+            backend = get_backend()
+            backend.add_shift(record)
+            backend.discard_draft(record.shift_id, record.staff_name)
 
-            messagebox.showinfo("Saved", f"Shift saved.\nTotal Output: {total}")
+            messagebox.showinfo("Saved", f"Shift saved.\nTotal Output: {record.total_output}")
             self._reset_shift_form()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save shift:\n{e}")
+
+    def _shift_record(self):
+        """ShiftRecord for the header fields and hourly rows as entered."""
+        job_number = self.cmb_job_number.get().strip()
+        shift_date = self.entry_shift_date.get().strip()
+        start_time = self.entry_start_time.get().strip()
+        hours_dc = [
+            HourlyOutput(
+                hour_label=h.hour_label,
+                quantity=h.quantity,
+                target=h.target,
+                comment=h.comment
+            ) for h in self.shift_hours
+        ]
+        return ShiftRecord(
+            shift_id=f"{job_number}-{shift_date}-{start_time.replace(':', '')}",
+            job_number=job_number,
+            staff_name=self.cmb_staff_name.get().title().strip(),
+            shift_date=shift_date,
+            start_time=start_time,
+            end_time=self.entry_end_time.get().strip(),
+            shift_type=self.cmb_shift_type.get().strip(),
+            hourly_outputs=hours_dc,
+            total_output=self.shift_hours.total_quantity
+        )
+
+    # ------------------- IMPORT COUNTER FILE -------------------
+    def _import_counter_file(self):
+        """Import hourly counts for many shifts from a machine counter CSV."""
+        file_path = filedialog.askopenfilename(
+            title="Import Counter File",
+            filetypes=[("Counter exports", "*.csv *.csv.gz"), ("All files", "*.*")],
+        )
+        if not file_path:
+            return
+
+        def work(task):
+            from ingest.counters import import_counter_file
+
+            return import_counter_file(file_path, progress=task.report, should_stop=lambda: task.cancelled)
+
+        def done(result):
+            message = (
+                f"Imported {result.shifts} shifts ({result.hours} hours, {result.total_output:,} units) "
+                f"from {result.rows} lines."
+            )
+            if result.duplicates:
+                message += f"\n{result.duplicates} shifts were already stored and were skipped."
+            if result.errors:
+                from ingest.counters import write_errors
+
+                errors_file = f"exports/Import_Errors_{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv"
+                write_errors(errors_file, result)
+                message += f"\n{len(result.errors)} lines were rejected; see:\n{os.path.abspath(errors_file)}"
+                messagebox.showwarning("Import Finished", message)
+            else:
+                messagebox.showinfo("Import Successful", message)
+
+        def failed(error):
+            from ingest.counters import ImportCancelled
+
+            if isinstance(error, ImportCancelled):
+                messagebox.showinfo("Import Cancelled", "Nothing was imported.")
+            else:
+                messagebox.showerror("Import Failed", f"Could not import counter file:\n{error}")
+
+        TaskProgressDialog(self.frame, "Importing Counts", unit="lines").run(work, done, failed)
+
+    # ------------------- LIVE FEED -------------------
+    def _toggle_live_feed(self):
+        """Start or stop filling the hourly quantities from the PLC count feed."""
+        if self._live_feed is not None:
+            if self._live_after is not None:
+                self.frame.after_cancel(self._live_after)
+                self._live_after = None
+            self._live_feed.stop()
+            self._live_feed = None
+            self._save_draft()
+            self.btn_live.config(text="📡 Live Feed")
+            self.lbl_live.config(text="")
+            return
+
+        from ingest.live import get_feed   # asyncio is only loaded when the feed is used
+
+        feed = get_feed()
+        try:
+            feed.start()
+        except OSError as e:
+            messagebox.showerror("Live Feed", f"Could not listen on {feed.host}:{feed.port}:\n{e}")
+            return
+        self._live_feed = feed
+        self._live_seen = None
+        self._live_ticks = (feed.counter.ticks, time.perf_counter())
+        self.btn_live.config(text="⏹ Stop Live Feed")
+        self._poll_live_feed()
+
+    def _poll_live_feed(self):
+        """Apply the feed's hourly totals for the selected job and date, if they changed.
+
+        Ticks are summed on the feed's thread; this only runs every
+        LIVE_POLL_MS, so the table is redrawn at most that often however
+        fast ticks arrive.
+        """
+        feed = self._live_feed
+        if feed is None:
+            return
+        counter = feed.counter
+        job_number = self.cmb_job_number.get().strip()
+        shift_date = self.entry_shift_date.get().strip()
+        seen = (counter.version, job_number, shift_date, self.shift_hours)
+        if seen != self._live_seen:
+            self._live_seen = seen
+            self._apply_live_counts(counter, job_number, shift_date)
+        if self._draft_due is not None and time.perf_counter() >= self._draft_due:
+            self._save_draft()
+
+        ticks, now = counter.ticks, time.perf_counter()
+        last_ticks, last_time = self._live_ticks
+        rate = (ticks - last_ticks) / (now - last_time) if now > last_time else 0
+        self._live_ticks = (ticks, now)
+        self.lbl_live.config(
+            text=f"Live feed on {feed.host}:{feed.port} | {ticks:,} ticks ({rate:,.0f}/s)"
+        )
+        self._live_after = self.frame.after(LIVE_POLL_MS, self._poll_live_feed)
+
+    def _apply_live_counts(self, counter, job_number, shift_date):
+        """Set each hour's quantity from the feed's count within its time range.
+
+        Hours whose quantity was typed by hand are left as they are.
+        """
+        hours = self.shift_hours
+        try:
+            totals = counter.range_totals(
+                job_number, shift_date, [tuple(h.hour_label.split("-")) for h in hours]
+            )
+        except ValueError:
+            return    # shift date not valid yet
+        updates = {}
+        for i, (row, units) in enumerate(zip(hours, totals)):
+            if units and (row.quantity == 0 or row.hour_label in self._live_hours):
+                updates[i] = units
+                self._live_hours.add(row.hour_label)
+        first = hours.set_quantities(updates)
+        if first is not None:
+            self._refresh_hour_tree(first)
+            if self._draft_due is None:
+                self._draft_due = time.perf_counter() + DRAFT_SAVE_INTERVAL
+
+    def _save_draft(self):
+        """Store the shift filled from the feed so far; at most every DRAFT_SAVE_INTERVAL."""
+        if self._draft_due is None:
+            return
+        self._draft_due = None
+        try:
+            get_backend().save_draft(self._shift_record(), self._live_hours)
+        except Exception as e:
+            messagebox.showerror("Live Feed", f"Could not store the shift draft:\n{e}")
@@ -11,7 +11,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date
 import re
-from storage.json_store import load_json, save_json
+from diagnostics import metrics
+from domain.models import Staff
+from storage.backends import get_backend
+from ui.table_binding import TreeBinding
 
 
 class StaffTab:
@@ -68,6 +71,7 @@ class StaffTab:
             self.staff_tree.heading(col, text=col.replace("_", " ").title())
             self.staff_tree.column(col, width=width, anchor="center")
         self.staff_tree.pack(fill="x", padx=6, pady=6)
+        self.staff_rows = TreeBinding(self.staff_tree)
 
         # ==== Buttons below table ====
         btns = ttk.Frame(sec)
@@ -77,27 +81,33 @@ class StaffTab:
         ttk.Button(btns, text="❌ Delete", command=self._delete_staff).grid(row=0, column=2, padx=5)
         ttk.Button(btns, text="🔄 Refresh", command=self._load_staff_into_tree).grid(row=0, column=3, padx=5)
 
-        self._load_staff_into_tree()
-
     # ------------------- LOAD STAFF -------------------
+    @metrics.timed("ui.staff.load_staff_into_tree")
     def _load_staff_into_tree(self):
         """Load all staff into the table."""
-        for r in self.staff_tree.get_children():
-            self.staff_tree.delete(r)
+        self._show_staff(get_backend().list_staff())
+
+    def _show_staff(self, db):
+        self.staff_rows.sync(
+            (s.staff_id, (s.staff_id, s.name, s.role, s.shift_type, s.status, s.date_joined), None)
+            for s in db
+        )
 
-        db = load_json("data/staff.json", default=[])
-        for s in db:
-            self.staff_tree.insert("", tk.END, values=(
-                s["staff_id"], s["name"], s["role"], s["shift_type"], s["status"], s["date_joined"]
-            ))
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread)."""
+        return lambda token: get_backend().list_staff()
+
+    def apply_refresh(self, db):
+        self._show_staff(db)
 
     # ------------------- VALIDATION HELPERS -------------------
     def _generate_staff_id(self):
         """Generate next staff ID like STF001."""
-        staff_list = load_json("data/staff.json", default=[])
+        staff_list = get_backend().list_staff()
         if not staff_list:
             return "STF001"
-        last_id = max(int(s["staff_id"][3:]) for s in staff_list)
+        last_id = max(int(s.staff_id[3:]) for s in staff_list)
         return f"STF{last_id + 1:03d}"
 
     def _is_valid_name(self, name):
@@ -120,18 +130,16 @@ class StaffTab:
             messagebox.showwarning("Invalid Name", "Name must contain only letters and spaces.")
             return
 
-        staff = {
-            "staff_id": self._generate_staff_id(),
-            "name": name,
-            "role": role,
-            "shift_type": shift_type,
-            "status": status,
-            "date_joined": date.today().isoformat()
-        }
+        staff = Staff(
+            staff_id=self._generate_staff_id(),
+            name=name,
+            role=role,
+            shift_type=shift_type,
+            status=status,
+            date_joined=date.today().isoformat()
+        )
 
-        db = load_json("data/staff.json", default=[])
-        db.append(staff)
-        save_json("data/staff.json", db)
+        get_backend().add_staff(staff)
 
         messagebox.showinfo("Success", f"Staff '{name}' added successfully.")
         self.entry_staff_name_new.delete(0, tk.END)
@@ -159,13 +167,7 @@ class StaffTab:
         if not staff_id:
             return
 
-        db = load_json("data/staff.json", default=[])
-        for s in db:
-            if s["staff_id"] == staff_id:
-                s["status"] = new_status
-                break
-
-        save_json("data/staff.json", db)
+        get_backend().set_staff_status(staff_id, new_status)
         self._load_staff_into_tree()
         messagebox.showinfo("Status Updated", f"Staff {staff_id} set to {new_status}.")
 
@@ -179,8 +181,6 @@ class StaffTab:
         if not confirm:
             return
 
-        db = load_json("data/staff.json", default=[])
-        db = [s for s in db if s["staff_id"] != staff_id]
-        save_json("data/staff.json", db)
+        get_backend().delete_staff(staff_id)
         self._load_staff_into_tree()
         messagebox.showinfo("Deleted", f"Staff {staff_id} removed.")
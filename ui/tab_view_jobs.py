@@ -8,7 +8,8 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from storage.json_store import load_json, save_json
+from storage.backends import get_backend
+from ui.table_binding import TreeBinding
 
 
 class ViewJobsTab:
@@ -24,14 +25,15 @@ class ViewJobsTab:
 
         ttk.Label(frame, text="All Jobs", font=("Segoe UI", 14, "bold")).pack(pady=10)
 
-        columns = ("job_number", "customer_name", "product", "status")
+        columns = ("job_number", "customer_name", "product", "status", "produced", "progress", "last_activity")
         self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=15)
 
         for col in columns:
             self.tree.heading(col, text=col.replace("_", " ").title())
-            self.tree.column(col, width=140, anchor="center")
+            self.tree.column(col, width=120, anchor="center")
 
         self.tree.pack(padx=10, pady=10, fill="x")
+        self.rows = TreeBinding(self.tree)
 
         # Buttons
         btn_frame = ttk.Frame(frame)
@@ -40,21 +42,36 @@ class ViewJobsTab:
         ttk.Button(btn_frame, text="🔄 Refresh", command=self.load_jobs_to_treeview).grid(row=0, column=0, padx=5)
         ttk.Button(btn_frame, text="❌ Delete", command=self.delete_selected_job).grid(row=0, column=1, padx=5)
 
-        self.load_jobs_to_treeview()
-
     # ------------------- LOAD JOBS -------------------
     def load_jobs_to_treeview(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        backend = get_backend()
+        self._show_jobs(backend.list_jobs(), backend.all_progress())
 
-        jobs = load_json("data/jobs.json", default=[])
+    def _show_jobs(self, jobs, progress):
+        rows = []
         for job in jobs:
-            self.tree.insert("", tk.END, values=(
-                job["job_number"],
-                job["customer_name"],
-                job["product"],
-                job.get("status", "Pending"),
-            ))
+            p = progress.get(job.job_number)
+            rows.append((job.job_number, (
+                job.job_number,
+                job.customer_name,
+                job.product,
+                job.status,
+                f"{p.produced:,}" if p else 0,
+                f"{p.percent}%" if p and p.target else "N/A",
+                p.last_activity if p else "",
+            ), None))
+        self.rows.sync(rows)
+
+    # ------------------- BACKGROUND REFRESH -------------------
+    def refresh_loader(self):
+        """Return a loader for the refresh pipeline (runs off the Tk thread)."""
+        def load(token):
+            backend = get_backend()
+            return backend.list_jobs(), backend.all_progress()
+        return load
+
+    def apply_refresh(self, data):
+        self._show_jobs(*data)
 
     # ------------------- DELETE JOB -------------------
     def delete_selected_job(self):
@@ -68,9 +85,7 @@ class ViewJobsTab:
         if not confirm:
             return
 
-        jobs = load_json("data/jobs.json", default=[])
-        jobs = [j for j in jobs if j["job_number"] != job_number]
-        save_json("data/jobs.json", jobs)
+        get_backend().delete_job(job_number)
 
         self.load_jobs_to_treeview()
         messagebox.showinfo("Deleted", f"Job {job_number} has been removed.")
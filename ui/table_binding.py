@@ -0,0 +1,129 @@
+# ==============================================================
+#  FILE: table_binding.py
+#  PROJECT: UMAMCO Job Production Tracker
+#  DESCRIPTION:
+#     Keyed binding between a ttk.Treeview and a list of rows.
+#     sync() compares the new rows with what is on screen and only
+#     inserts, updates, moves or deletes the items that changed, so
+#     selection and scroll position survive a refresh and its cost
+#     follows the number of changes rather than the table size.
+# ==============================================================
+
+from typing import Iterable
+
+
+class TreeBinding:
+    """Reconciles a Treeview with keyed rows.
+
+    Rows are (key, values, tags) triples; the key (e.g. staff_id or
+    job_number) becomes the item id and must be unique in the table.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._rows = {}      # item id -> (values, tags) currently shown
+        self._order = []     # item ids in display order
+
+    def sync(self, rows: Iterable[tuple]) -> int:
+        """Bring the Treeview in line with rows; returns the number of item changes."""
+        tree = self.tree
+        order, data = [], {}
+        for key, values, tags in rows:
+            iid = str(key)
+            if iid in data:
+                raise ValueError(f"Duplicate row key: {iid!r}")
+            order.append(iid)
+            data[iid] = (tuple(values), tuple(tags) if tags else ())
+
+        old = self._rows
+        if order == self._order and data == old:
+            return 0
+        top = tree.yview()[0] if self._order else 0.0
+
+        removed = [iid for iid in self._order if iid not in data]
+        if removed:
+            tree.delete(*removed)
+        changes = len(removed)
+
+        kept = [iid for iid in self._order if iid in data]
+        for iid in kept:
+            if old[iid] != data[iid]:
+                values, tags = data[iid]
+                tree.item(iid, values=values, tags=tags)
+                changes += 1
+
+        # Kept items already in the right relative order only need the new
+        # ones slotted in; otherwise move every item into place.
+        reordered = [iid for iid in order if iid in old] != kept
+        for index, iid in enumerate(order):
+            if iid not in old:
+                values, tags = data[iid]
+                tree.insert("", index, iid=iid, values=values, tags=tags)
+                changes += 1
+            elif reordered:
+                tree.move(iid, "", index)
+                changes += 1
+
+        self._rows, self._order = data, order
+        tree.yview_moveto(top)
+        return changes
+
+    def update(self, rows: Iterable[tuple]) -> int:
+        """Update rows that are already shown, by key; returns the number of item changes.
+
+        Only the given rows are compared, so the cost follows their number
+        rather than the table size. Order is unchanged.
+        """
+        changes = 0
+        for key, values, tags in rows:
+            iid = str(key)
+            new = (tuple(values), tuple(tags) if tags else ())
+            if self._rows[iid] != new:
+                self.tree.item(iid, values=new[0], tags=new[1])
+                self._rows[iid] = new
+                changes += 1
+        return changes
+
+    def insert(self, index: int, rows: Iterable[tuple]) -> int:
+        """Insert rows that are not shown yet at a display position; returns their number.
+
+        Shown rows are not compared, so the cost follows the number of new
+        rows rather than the table size.
+        """
+        new = []
+        for key, values, tags in rows:
+            iid = str(key)
+            if iid in self._rows:
+                raise ValueError(f"Duplicate row key: {iid!r}")
+            self._rows[iid] = (tuple(values), tuple(tags) if tags else ())
+            new.append(iid)
+        for offset, iid in enumerate(new):
+            values, tags = self._rows[iid]
+            self.tree.insert("", index + offset, iid=iid, values=values, tags=tags)
+        self._order[index:index] = new
+        return len(new)
+
+    def remove(self, start: int, stop: int) -> int:
+        """Remove the shown rows at display positions start to stop - 1; returns their number."""
+        removed = self._order[start:stop]
+        if removed:
+            self.tree.delete(*removed)
+        for iid in removed:
+            del self._rows[iid]
+        del self._order[start:stop]
+        return len(removed)
+
+    def delete(self, key) -> None:
+        """Remove one shown row."""
+        iid = str(key)
+        self.tree.delete(iid)
+        del self._rows[iid]
+        self._order.remove(iid)
+
+    def clear(self) -> None:
+        if self._order:
+            self.tree.delete(*self._order)
+        self._rows, self._order = {}, []
+
+    def __len__(self) -> int:
+        return len(self._order)